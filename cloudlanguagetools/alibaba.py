@@ -7,11 +7,11 @@ import urllib
 import hmac
 import base64
 import logging
-import tempfile
 import pprint
 from typing import List
 
 import cloudlanguagetools.service
+import cloudlanguagetools.audioresult
 import cloudlanguagetools.options
 import cloudlanguagetools.constants
 import cloudlanguagetools.languages
@@ -24,6 +24,8 @@ from cloudlanguagetools.options import AudioFormat
 
 logger = logging.getLogger(__name__)
 
+TTS_URL = "https://nls-gateway-ap-southeast-1.aliyuncs.com/stream/v1/tts"
+
 ALIBABA_VOICE_SPEED_DEFAULT = 0
 ALIBABA_VOICE_PITCH_DEFAULT = 0
 
@@ -41,14 +43,15 @@ VOICE_OPTIONS = {
 
 class AlibabaService(cloudlanguagetools.service.Service):
     def __init__(self):
-        self.access_token = None
-        
+        pass
+
     def configure(self, config):
         self.access_key_id = config['access_key_id']
         self.access_key_secret = config['access_key_secret']
         self.app_key = config['app_key']
+        self.token_manager = cloudlanguagetools.service.TokenManager(self.fetch_token)
 
-    def refresh_token(self):
+    def fetch_token(self):
         logger.info("refreshing token")
         params = {
             "AccessKeyId": self.access_key_id,
@@ -86,41 +89,34 @@ class AlibabaService(cloudlanguagetools.service.Service):
         signature = urllib.parse.quote(dig, safe='')
         params_str = f"Signature={signature}&{params_str}"
         
-        response = requests.get(f"http://nlsmeta.ap-southeast-1.aliyuncs.com/?{params_str}")
+        response = self.http_get(f"http://nlsmeta.ap-southeast-1.aliyuncs.com/?{params_str}")
         
         if response.status_code != 200:
             logger.warning(f"Token request failed: {response.text}")
             raise cloudlanguagetools.errors.RequestError("Token request failed", None, response.text)
             
         data = response.json()
-        self.access_token = data["Token"]
-        logger.info(f"Got access token: {self.access_token}")
-
-    def get_tts_audio(self, text, voice_key, options):
-        logger.debug(f'get_tts_audio, text: {text} voice_key: {voice_key}')
-        if not self.access_token or self.access_token["ExpireTime"] <= int(time.time()):
-            self.refresh_token()
+        token = data["Token"]
+        logger.info(f"Got access token, expires at {token['ExpireTime']}")
+        return token["Id"], token["ExpireTime"]
 
+    def get_tts_params(self, text, voice_key, options, token):
         speed = int(options.get('speed', ALIBABA_VOICE_SPEED_DEFAULT))
         pitch = int(options.get('pitch', ALIBABA_VOICE_PITCH_DEFAULT))
         voice = voice_key['name']
 
-        params = {
+        return {
             "format": "mp3",
             "appkey": self.app_key,
             "speech_rate": speed,
             "pitch_rate": pitch,
             "text": text,
-            "token": self.access_token["Id"],
+            "token": token,
             "voice": voice
         }
 
-        response = requests.get(
-            "https://nls-gateway-ap-southeast-1.aliyuncs.com/stream/v1/tts",
-            params=params,
-            timeout=cloudlanguagetools.constants.RequestTimeout
-        )
-
+    def process_tts_audio_response(self, response, text, voice_key):
+        voice = voice_key['name']
         logger.debug(f'response status code: {response.status_code} headers: {pprint.pformat(response.headers)} length of response: {len(response.content)}')
 
         if response.status_code != 200:
@@ -136,13 +132,29 @@ class AlibabaService(cloudlanguagetools.service.Service):
                 f'Got bad content type in response: {response.headers["Content-Type"]}'
             )
         
-        # Create a temporary file and write the audio content to it
-        output_temp_file = tempfile.NamedTemporaryFile(prefix=f'cloudlanguage_tools_{self.__class__.__name__}_audio', suffix='.mp3')
-        output_temp_filename = output_temp_file.name
-        with open(output_temp_filename, 'wb') as audio:
-            audio.write(response.content)        
-        logger.debug(f'result temporary file name: {output_temp_file.name}')
-        return output_temp_file
+        return cloudlanguagetools.audioresult.AudioResult(response.content, audio_format=cloudlanguagetools.options.AudioFormat.mp3)
+
+    def get_tts_audio(self, text, voice_key, options):
+        logger.debug(f'get_tts_audio, text: {text} voice_key: {voice_key}')
+        token = self.token_manager.get_token()
+
+        response = self.http_get(
+            TTS_URL,
+            params=self.get_tts_params(text, voice_key, options, token),
+            timeout=cloudlanguagetools.constants.RequestTimeout
+        )
+        return self.process_tts_audio_response(response, text, voice_key)
+
+    async def get_tts_audio_async(self, text, voice_key, options):
+        logger.debug(f'get_tts_audio_async, text: {text} voice_key: {voice_key}')
+        token = await self.token_manager.get_token_async()
+
+        response = await self.http_get_async(
+            TTS_URL,
+            params=self.get_tts_params(text, voice_key, options, token),
+            timeout=cloudlanguagetools.constants.RequestTimeout
+        )
+        return self.process_tts_audio_response(response, text, voice_key)
 
     def get_tts_voice_list(self):
         # returns list of TtsVoice
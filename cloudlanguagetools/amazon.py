@@ -1,6 +1,5 @@
 import json
 import requests
-import tempfile
 import os
 import boto3
 import botocore.exceptions
@@ -17,6 +16,7 @@ import cloudlanguagetools.translationlanguage
 import cloudlanguagetools.transliterationlanguage
 import cloudlanguagetools.errors
 import cloudlanguagetools.audio_processing
+import cloudlanguagetools.audioresult
 
 from cloudlanguagetools.options import AudioFormat
 
@@ -95,6 +95,9 @@ class AmazonTranslationLanguage(cloudlanguagetools.translationlanguage.Translati
         return self.language_id
 
 class AmazonService(cloudlanguagetools.service.Service):
+    # polly allows 3000 billed characters per request, SSML tags aren't billed
+    TTS_MAX_CHARACTERS = 3000
+
     def __init__(self):
         pass
 
@@ -131,9 +134,6 @@ class AmazonService(cloudlanguagetools.service.Service):
         # wav, we need to convert as described here:
         # https://aws.amazon.com/blogs/machine-learning/integrating-amazon-polly-with-legacy-ivr-systems-by-converting-output-to-wav-format/
 
-        output_temp_file = tempfile.NamedTemporaryFile()
-        output_temp_filename = output_temp_file.name
-
         pitch = options.get('pitch', DEFAULT_VOICE_PITCH)
         pitch_str = f'{pitch:+.0f}%'
         rate = options.get('rate', DEFAULT_VOICE_RATE)
@@ -176,15 +176,14 @@ class AmazonService(cloudlanguagetools.service.Service):
             # ensure the close method of the stream object will be called automatically
             # at the end of the with statement's scope.
             with contextlib.closing(response["AudioStream"]) as stream:
-                with open(output_temp_filename, 'wb') as audio:
-                    audio.write(stream.read())
+                audio = cloudlanguagetools.audioresult.AudioResult(stream.read(), audio_format=audio_format)
 
                 if audio_format == cloudlanguagetools.options.AudioFormat.wav:
-                    return cloudlanguagetools.audio_processing.wrap_pcm_data_wave(output_temp_file, 
+                    return cloudlanguagetools.audio_processing.wrap_pcm_data_wave(audio, 
                         num_channels=1, 
                         sample_width=2, 
                         framerate=16000)
-                return output_temp_file
+                return audio
 
         else:
             # The response didn't contain audio data, exit gracefully
@@ -0,0 +1,133 @@
+"""
+HTTP requests for the async API of the REST services, over httpx. requests are awaited on the event loop,
+there is no thread per in-flight request.
+the responses and exceptions mimic the requests library, so that the services handle the responses of both
+transports with the same code.
+"""
+
+import os
+import asyncio
+import logging
+import weakref
+import requests
+import requests.exceptions
+import httpx
+
+import cloudlanguagetools.constants
+
+logger = logging.getLogger(__name__)
+
+# overrides constants.AsyncHttpMaxConnections, the max number of connections open at the same time
+ASYNC_HTTP_MAX_CONNECTIONS_ENV_VAR = 'CLOUDLANGUAGETOOLS_CORE_ASYNC_HTTP_MAX_CONNECTIONS'
+
+
+class AsyncHttpResponse():
+    """the subset of requests.Response used by the services"""
+
+    def __init__(self, response: httpx.Response):
+        self.response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.content = response.content
+        self.url = str(response.url)
+        self.reason = response.reason_phrase
+
+    @property
+    def text(self):
+        return self.response.text
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def json(self, **kwargs):
+        return self.response.json(**kwargs)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            kind = 'Client' if self.status_code < 500 else 'Server'
+            raise requests.exceptions.HTTPError(f'{self.status_code} {kind} Error: {self.reason} for url: {self.url}', response=self)
+
+def convert_exception(exception: httpx.HTTPError) -> requests.exceptions.RequestException:
+    if isinstance(exception, httpx.ConnectTimeout):
+        return requests.exceptions.ConnectTimeout(str(exception))
+    if isinstance(exception, httpx.TimeoutException):
+        # read, write and pool timeouts
+        return requests.exceptions.ReadTimeout(str(exception))
+    if isinstance(exception, httpx.TransportError):
+        return requests.exceptions.ConnectionError(str(exception))
+    return requests.exceptions.RequestException(str(exception))
+
+def convert_request_arguments(kwargs):
+    """requests keyword arguments to httpx ones"""
+    timeout = kwargs.get('timeout')
+    if isinstance(timeout, tuple):
+        # requests: (connect, read)
+        connect_timeout, read_timeout = timeout
+        kwargs['timeout'] = httpx.Timeout(read_timeout, connect=connect_timeout)
+    data = kwargs.get('data')
+    if isinstance(data, (str, bytes)):
+        kwargs['content'] = kwargs.pop('data')
+    elif isinstance(data, list):
+        # repeated form fields, as a list of tuples
+        fields = {}
+        for key, value in kwargs.pop('data'):
+            fields.setdefault(key, []).append(value)
+        kwargs['data'] = fields
+    return kwargs
+
+
+class AsyncHttpTransport():
+    """an httpx.AsyncClient is bound to the event loop it was created on, one client is kept per event loop
+    (and per ssl verification setting, which httpx doesn't allow per request). httpx keeps connections
+    alive per host. every request gets a timeout, constants.RequestTimeout unless the caller specifies one."""
+
+    def __init__(self, max_connections=None, timeout=cloudlanguagetools.constants.RequestTimeout):
+        if max_connections is None:
+            max_connections = int(os.environ.get(ASYNC_HTTP_MAX_CONNECTIONS_ENV_VAR, cloudlanguagetools.constants.AsyncHttpMaxConnections))
+        self.max_connections = max_connections
+        self.timeout = timeout
+        # event loop -> {verify: client}
+        self.clients = weakref.WeakKeyDictionary()
+
+    def create_client(self, verify):
+        limits = httpx.Limits(max_connections=self.max_connections,
+            max_keepalive_connections=cloudlanguagetools.constants.HttpPoolSize)
+        # same behavior as requests: follow redirects
+        return httpx.AsyncClient(limits=limits, timeout=self.timeout, verify=verify, follow_redirects=True)
+
+    def get_client(self, verify=True) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        loop_clients = self.clients.setdefault(loop, {})
+        client = loop_clients.get(verify)
+        if client is None:
+            client = self.create_client(verify)
+            loop_clients[verify] = client
+        return client
+
+    async def request(self, method, url, **kwargs) -> AsyncHttpResponse:
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        verify = kwargs.pop('verify', True)
+        client = self.get_client(verify)
+        try:
+            response = await client.request(method, url, **convert_request_arguments(kwargs))
+        except httpx.HTTPError as exception:
+            raise convert_exception(exception) from exception
+        return AsyncHttpResponse(response)
+
+    async def get(self, url, **kwargs) -> AsyncHttpResponse:
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs) -> AsyncHttpResponse:
+        return await self.request('POST', url, **kwargs)
+
+    async def close(self):
+        """close the clients of the running event loop, to be called before the loop stops"""
+        loop_clients = self.clients.pop(asyncio.get_running_loop(), {})
+        for client in loop_clients.values():
+            await client.aclose()
+
+
+# shared by all services
+default_transport = AsyncHttpTransport()
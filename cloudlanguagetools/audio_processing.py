@@ -1,29 +1,70 @@
+import io
 import wave
-import tempfile
+import pydub
+import pydub.silence
+from typing import List
+
+import cloudlanguagetools.constants
+import cloudlanguagetools.options
+import cloudlanguagetools.audioresult
+import cloudlanguagetools.transcoding
 
 # audio utilities
 
 
 # take PCM audio and wrap it in a WAV container
-def wrap_pcm_data_wave(audio_temp_file: tempfile.NamedTemporaryFile,
+def wrap_pcm_data_wave(audio: cloudlanguagetools.audioresult.AudioResult,
         num_channels,
         sample_width,
-        framerate) -> tempfile.NamedTemporaryFile:
-    # read the audio data
-    f = open(audio_temp_file.name, 'rb')
-    data = f.read()
-    f.close()
-
-    wav_frames = []
-    wav_frames.append(data)
-
-    wav_audio_temp_file = tempfile.NamedTemporaryFile(prefix='clt_wav_audio_', suffix='.wav')
+        framerate) -> cloudlanguagetools.audioresult.AudioResult:
+    wav_buffer = io.BytesIO()
 
-    WAVEFORMAT = wave.open(wav_audio_temp_file.name,'wb')
+    WAVEFORMAT = wave.open(wav_buffer, 'wb')
     WAVEFORMAT.setnchannels(num_channels) # one channel, mono
     WAVEFORMAT.setsampwidth(sample_width) # Polly's output is a stream of 16-bits (2 bytes) samples
     WAVEFORMAT.setframerate(framerate)
-    WAVEFORMAT.writeframes(b''.join(wav_frames))
-    WAVEFORMAT.close()    
-    
-    return wav_audio_temp_file
\ No newline at end of file
+    WAVEFORMAT.writeframes(audio.bytes)
+    WAVEFORMAT.close()
+
+    return cloudlanguagetools.audioresult.AudioResult(wav_buffer.getvalue(), audio_format=cloudlanguagetools.options.AudioFormat.wav)
+
+
+# below this level (dBFS), audio at the start / end of a segment is considered silence
+SILENCE_THRESHOLD = -50.0
+
+def trim_silence(segment: pydub.AudioSegment, leading: bool, trailing: bool) -> pydub.AudioSegment:
+    start = pydub.silence.detect_leading_silence(segment, silence_threshold=SILENCE_THRESHOLD) if leading else 0
+    end = len(segment) - pydub.silence.detect_leading_silence(segment.reverse(), silence_threshold=SILENCE_THRESHOLD) if trailing else len(segment)
+    if end <= start:
+        # all silence
+        return segment
+    return segment[start:end]
+
+# concatenate audio segments generated separately (same voice and options) into a single file.
+# the silence at each junction is replaced with a gap of gap_ms, all segments are converted to
+# the sample rate / channels / sample width of the first one.
+def concatenate_audio(segments: List[cloudlanguagetools.audioresult.AudioResult],
+        audio_format: cloudlanguagetools.options.AudioFormat,
+        gap_ms=cloudlanguagetools.constants.TtsSegmentGap) -> cloudlanguagetools.audioresult.AudioResult:
+    decoded_segments = []
+    for segment in segments:
+        segment_format = segment.audio_format if segment.audio_format is not None else audio_format
+        wav_segment = cloudlanguagetools.transcoding.convert(segment, segment_format, cloudlanguagetools.options.AudioFormat.wav)
+        decoded_segments.append(pydub.AudioSegment.from_wav(wav_segment.open()))
+
+    first_segment = decoded_segments[0]
+    combined = pydub.AudioSegment.empty().set_frame_rate(first_segment.frame_rate).set_channels(first_segment.channels).set_sample_width(first_segment.sample_width)
+    gap = pydub.AudioSegment.silent(duration=gap_ms, frame_rate=first_segment.frame_rate)
+    gap = gap.set_channels(first_segment.channels).set_sample_width(first_segment.sample_width)
+    last_index = len(decoded_segments) - 1
+    for index, decoded_segment in enumerate(decoded_segments):
+        decoded_segment = decoded_segment.set_frame_rate(first_segment.frame_rate).set_channels(first_segment.channels).set_sample_width(first_segment.sample_width)
+        decoded_segment = trim_silence(decoded_segment, leading=index > 0, trailing=index < last_index)
+        if index > 0:
+            combined += gap
+        combined += decoded_segment
+
+    wav_buffer = io.BytesIO()
+    combined.export(wav_buffer, format='wav')
+    wav_audio = cloudlanguagetools.audioresult.AudioResult(wav_buffer.getvalue(), audio_format=cloudlanguagetools.options.AudioFormat.wav)
+    return cloudlanguagetools.transcoding.convert(wav_audio, cloudlanguagetools.options.AudioFormat.wav, audio_format)
@@ -0,0 +1,134 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+import collections
+
+import cloudlanguagetools.constants
+
+logger = logging.getLogger(__name__)
+
+# directory where generated audio is cached, when not set, audio is not cached
+AUDIO_CACHE_DIR_ENV_VAR = 'CLOUDLANGUAGETOOLS_CORE_AUDIO_CACHE_DIR'
+
+# after eviction, the cache is brought down to this fraction of its max size
+EVICTION_LOW_WATERMARK = 0.9
+
+def canonicalize_option_value(value):
+    # 1 and 1.0 are the same rate
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+def canonicalize_options(options, option_definitions=None):
+    """drop options which are set to the voice's declared default, so that {} and {'rate': 1.0} are equivalent.
+    option_definitions is the voice's options dict (see TtsVoice.get_options), None if unknown"""
+    result = {}
+    for option_name, value in options.items():
+        value = canonicalize_option_value(value)
+        if option_definitions is not None:
+            definition = option_definitions.get(option_name)
+            if definition is not None and 'default' in definition and canonicalize_option_value(definition['default']) == value:
+                continue
+        result[option_name] = value
+    return result
+
+def get_cache_key(service_name, voice_key, text, canonical_options):
+    key_data = json.dumps([str(service_name), voice_key, text, canonical_options], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(key_data.encode('utf-8')).hexdigest()
+
+
+class AudioCache():
+    """generated audio stored on disk, one file per entry. when the total size exceeds max_size bytes,
+    least recently used files get evicted. several processes can share the same directory."""
+
+    def __init__(self, cache_dir, max_size=cloudlanguagetools.constants.AudioCacheMaxSize):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.stats = collections.Counter()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.total_size = sum([size for mtime, size, path in self.list_entries()])
+        logger.info(f'audio cache {self.cache_dir}: {self.total_size} bytes')
+
+    def get_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def list_entries(self):
+        """returns list of (mtime, size, path)"""
+        entries = []
+        for directory, subdirectories, filenames in os.walk(self.cache_dir):
+            for filename in filenames:
+                if filename.endswith('.tmp'):
+                    continue
+                path = os.path.join(directory, filename)
+                try:
+                    stat = os.stat(path)
+                    entries.append((stat.st_mtime, stat.st_size, path))
+                except FileNotFoundError:
+                    # evicted by another process
+                    pass
+        return entries
+
+    def get(self, key):
+        """returns the cached audio bytes, or None"""
+        path = self.get_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # mark as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            data = None
+        except OSError as e:
+            logger.warning(f'could not read from audio cache {path}: {e}')
+            data = None
+        with self.lock:
+            self.stats['hits' if data is not None else 'misses'] += 1
+        return data
+
+    def put(self, key, data):
+        path = self.get_path(key)
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f'could not write to audio cache {path}: {e}')
+            return
+        with self.lock:
+            self.total_size += len(data)
+            if self.total_size > self.max_size:
+                self.evict()
+
+    def record_bypass(self):
+        with self.lock:
+            self.stats['bypass'] += 1
+
+    def evict(self):
+        entries = sorted(self.list_entries())
+        # other processes may have added entries, start from the actual size
+        self.total_size = sum([size for mtime, size, path in entries])
+        target_size = self.max_size * EVICTION_LOW_WATERMARK
+        for mtime, size, path in entries:
+            if self.total_size <= target_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.total_size -= size
+            self.stats['evictions'] += 1
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                'hits': self.stats['hits'],
+                'misses': self.stats['misses'],
+                'evictions': self.stats['evictions'],
+                'bypass': self.stats['bypass'],
+                'size': self.total_size
+            }
@@ -0,0 +1,102 @@
+import io
+import os
+import tempfile
+import logging
+from typing import Iterator, Optional
+
+import cloudlanguagetools.options
+
+logger = logging.getLogger(__name__)
+
+FILE_SUFFIXES = {
+    cloudlanguagetools.options.AudioFormat.mp3: '.mp3',
+    cloudlanguagetools.options.AudioFormat.ogg_opus: '.ogg',
+    cloudlanguagetools.options.AudioFormat.ogg_vorbis: '.ogg',
+    cloudlanguagetools.options.AudioFormat.wav: '.wav',
+}
+
+# size of the chunks returned by AudioResult.iter_chunks
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class AudioResult():
+    """generated audio, held in memory. use .bytes, or .open() for a file-like reader.
+    it can also be used like the NamedTemporaryFile previously returned by get_tts_audio:
+    read() / seek() / tell() read the audio from memory, and callers which need a path can use .name,
+    the temporary file is only written the first time .name is accessed, and it gets deleted on close()."""
+
+    def __init__(self, data: bytes, audio_format: Optional[cloudlanguagetools.options.AudioFormat] = None):
+        self.data = data
+        self.audio_format = audio_format
+        self.temp_file = None
+        # position of read() / seek(), created on first use
+        self.reader = None
+
+    @classmethod
+    def from_file(cls, path, audio_format: Optional[cloudlanguagetools.options.AudioFormat] = None):
+        with open(path, 'rb') as f:
+            return cls(f.read(), audio_format=audio_format)
+
+    @property
+    def bytes(self) -> bytes:
+        return self.data
+
+    @property
+    def suffix(self) -> str:
+        return FILE_SUFFIXES.get(self.audio_format, '')
+
+    def open(self) -> io.BytesIO:
+        """a new reader over the audio, doesn't copy the data"""
+        return io.BytesIO(self.data)
+
+    def iter_chunks(self, chunk_size=DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        view = memoryview(self.data)
+        for offset in range(0, len(view), chunk_size):
+            yield bytes(view[offset:offset + chunk_size])
+
+    @property
+    def name(self) -> str:
+        if self.temp_file is None:
+            temp_file = tempfile.NamedTemporaryFile(prefix='clt_audio_', suffix=self.suffix)
+            temp_file.write(self.data)
+            temp_file.flush()
+            self.temp_file = temp_file
+        return self.temp_file.name
+
+    # file interface
+    # ==============
+
+    def get_reader(self) -> io.BytesIO:
+        if self.reader is None:
+            self.reader = self.open()
+        return self.reader
+
+    def read(self, size=-1) -> bytes:
+        return self.get_reader().read(size)
+
+    def seek(self, offset, whence=io.SEEK_SET) -> int:
+        return self.get_reader().seek(offset, whence)
+
+    def tell(self) -> int:
+        return self.get_reader().tell()
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def close(self):
+        self.reader = None
+        if self.temp_file is not None:
+            self.temp_file.close()
+            self.temp_file = None
+
+    def __len__(self):
+        return len(self.data)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,17 +1,21 @@
 import json
+import wave
 import requests
-import tempfile
 import uuid
 import operator
 import concurrent.futures
-import pydub
 import logging
 import pprint
 import time
+import threading
+import contextlib
+import collections
 import cachetools
 from typing import List
 
 import cloudlanguagetools.service
+import cloudlanguagetools.audioresult
+import cloudlanguagetools.transcoding
 import cloudlanguagetools.constants
 import cloudlanguagetools.options
 import cloudlanguagetools.languages
@@ -68,6 +72,15 @@ DEFAULT_TOP_K = 22
 DEFAULT_CFG_SCALE = 1.4
 DEFAULT_STYLEDEGREE = 1.0
 
+# idle synthesizers kept per (region, output format)
+SYNTHESIZER_POOL_MAX_IDLE = 16
+# an idle synthesizer older than this gets discarded, the service closes idle connections
+SYNTHESIZER_MAX_IDLE_TIME = 120
+# max number of speech SDK calls running at the same time, across all requests
+SYNTHESIZER_MAX_WORKERS = 64
+# STS tokens are valid for 10 minutes, used when the expiry can't be read from the token
+STS_TOKEN_LIFETIME = 600
+
 def build_dragonhd_voice_attrs(voice_key, options):
     """Build the voice attributes string for SSML, including DragonHD parameters only if they differ from defaults."""
     voice_name = voice_key.get('name', '')
@@ -330,22 +343,133 @@ class AzureDictionaryLookup(cloudlanguagetools.dictionarylookup.DictionaryLookup
     def get_lookup_shortname(self):
         return f'{self.service.name}, {self.language.lang_name}, {self.lookup_type.name}'
 
+class PooledSynthesizer():
+    def __init__(self, synthesizer, connection):
+        self.synthesizer = synthesizer
+        self.connection = connection
+        self.connected = True
+        self.released_at = time.monotonic()
+
+    def on_disconnected(self, event):
+        self.connected = False
+
+
+class SynthesizerPool():
+    """speech synthesizers, keyed by (region, output format). a synthesizer is used by one request at a time,
+    and goes back to the pool afterwards so that the next request reuses its connection.
+    new synthesizers open their connection right away, broken or long idle synthesizers get discarded."""
+
+    def __init__(self, key, region, max_idle=SYNTHESIZER_POOL_MAX_IDLE, max_idle_time=SYNTHESIZER_MAX_IDLE_TIME):
+        self.key = key
+        self.region = region
+        self.max_idle = max_idle
+        self.max_idle_time = max_idle_time
+        self.idle = collections.defaultdict(list)
+        self.lock = threading.Lock()
+        self.stats = collections.Counter()
+
+    def create(self, output_format) -> PooledSynthesizer:
+        speech_config = azure.cognitiveservices.speech.SpeechConfig(subscription=self.key, region=self.region)
+        speech_config.set_speech_synthesis_output_format(azure.cognitiveservices.speech.SpeechSynthesisOutputFormat[output_format])
+        # no audio_config, the audio is kept in memory
+        synthesizer = azure.cognitiveservices.speech.SpeechSynthesizer(speech_config=speech_config, audio_config=None)
+        connection = None
+        try:
+            connection = azure.cognitiveservices.speech.Connection.from_speech_synthesizer(synthesizer)
+            connection.open(True)
+        except Exception as e:
+            # the synthesizer connects on first use anyway
+            logger.warning(f'could not pre-open Azure speech connection: {e}')
+        pooled_synthesizer = PooledSynthesizer(synthesizer, connection)
+        if connection is not None:
+            connection.disconnected.connect(pooled_synthesizer.on_disconnected)
+        with self.lock:
+            self.stats['created'] += 1
+        return pooled_synthesizer
+
+    def is_healthy(self, pooled_synthesizer):
+        return pooled_synthesizer.connected and time.monotonic() - pooled_synthesizer.released_at < self.max_idle_time
+
+    def acquire(self, output_format) -> PooledSynthesizer:
+        with self.lock:
+            idle_synthesizers = self.idle[(self.region, output_format)]
+            while len(idle_synthesizers) > 0:
+                pooled_synthesizer = idle_synthesizers.pop()
+                if self.is_healthy(pooled_synthesizer):
+                    self.stats['reused'] += 1
+                    return pooled_synthesizer
+                self.stats['discarded'] += 1
+        return self.create(output_format)
+
+    def release(self, output_format, pooled_synthesizer, healthy):
+        """healthy=False when the request failed or didn't complete, the synthesizer gets discarded"""
+        with self.lock:
+            idle_synthesizers = self.idle[(self.region, output_format)]
+            if healthy and pooled_synthesizer.connected and len(idle_synthesizers) < self.max_idle:
+                pooled_synthesizer.released_at = time.monotonic()
+                idle_synthesizers.append(pooled_synthesizer)
+            else:
+                self.stats['discarded'] += 1
+
+    @contextlib.contextmanager
+    def synthesizer(self, output_format):
+        """yields a PooledSynthesizer, which goes back to the pool if the block completes without an exception"""
+        pooled_synthesizer = self.acquire(output_format)
+        healthy = False
+        try:
+            yield pooled_synthesizer
+            healthy = True
+        finally:
+            self.release(output_format, pooled_synthesizer, healthy)
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                'created': self.stats['created'],
+                'reused': self.stats['reused'],
+                'discarded': self.stats['discarded'],
+                'idle': sum([len(x) for x in self.idle.values()])
+            }
+
+
+# speech SDK calls are run here, so that a timeout can be enforced
+synthesizer_executor = concurrent.futures.ThreadPoolExecutor(max_workers=SYNTHESIZER_MAX_WORKERS, thread_name_prefix='azure_tts')
+
+
 class AzureService(cloudlanguagetools.service.Service):
+    # translator v3 limits: 1000 array elements, 50,000 characters for the whole request
+    TRANSLATION_BATCH_MAX_ITEMS = 1000
+    TRANSLATION_BATCH_MAX_CHARACTERS = 50000
+    # transliterate limits: 10 array elements, 5,000 characters for the whole request
+    TRANSLITERATION_BATCH_MAX_ITEMS = 10
+    TRANSLITERATION_BATCH_MAX_CHARACTERS = 5000
+    # a request is limited to 10 minutes of audio, this stays well below
+    TTS_MAX_CHARACTERS = 5000
+
     def __init__(self):
         self.url_translator_base = 'https://api.cognitive.microsofttranslator.com'
 
     def configure(self, config):
         self.key = config['key']
         self.region = config['region']
+        self.synthesizer_pool = SynthesizerPool(self.key, self.region)
+        self.token_manager = cloudlanguagetools.service.TokenManager(self.fetch_token)
 
     def get_token(self):
+        return self.token_manager.get_token()
+
+    def fetch_token(self):
         fetch_token_url = f"https://{self.region}.api.cognitive.microsoft.com/sts/v1.0/issueToken"
         headers = {
             'Ocp-Apim-Subscription-Key': self.key
         }
-        response = requests.post(fetch_token_url, headers=headers, timeout=cloudlanguagetools.constants.RequestTimeout)
+        response = self.http_post(fetch_token_url, headers=headers, timeout=cloudlanguagetools.constants.RequestTimeout)
+        response.raise_for_status()
         access_token = str(response.text)
-        return access_token
+        expires_at = cloudlanguagetools.service.get_jwt_expiration(access_token)
+        if expires_at is None:
+            expires_at = time.time() + STS_TOKEN_LIFETIME
+        return access_token, expires_at
 
     def get_translator_headers(self):
         headers = {
@@ -356,21 +480,16 @@ class AzureService(cloudlanguagetools.service.Service):
         }
         return headers        
 
-    def get_tts_audio(self, text, voice_key, options):
+    def get_tts_audio_format(self, options):
         # https://learn.microsoft.com/en-us/azure/ai-services/speech-service/rest-text-to-speech?tabs=streaming#audio-outputs
         # https://learn.microsoft.com/en-us/python/api/azure-cognitiveservices-speech/azure.cognitiveservices.speech.speechsynthesisoutputformat?view=azure-python
-        response_format_parameter, audio_format = self.get_request_audio_format({
+        return self.get_request_audio_format({
             AudioFormat.mp3: 'Audio24Khz96KBitRateMonoMp3',
             AudioFormat.ogg_opus: 'Ogg48Khz16BitMonoOpus',
             AudioFormat.wav: 'Riff48Khz16BitMonoPcm'
         }, options, AudioFormat.mp3)
 
-        output_temp_file = tempfile.NamedTemporaryFile(prefix=f'cloudlanguage_tools_{self.__class__.__name__}_audio', suffix=f'.{audio_format.name}')
-        output_temp_filename = output_temp_file.name
-        speech_config = azure.cognitiveservices.speech.SpeechConfig(subscription=self.key, region=self.region)
-        speech_config.set_speech_synthesis_output_format(azure.cognitiveservices.speech.SpeechSynthesisOutputFormat[response_format_parameter])
-        synthesizer = azure.cognitiveservices.speech.SpeechSynthesizer(speech_config=speech_config, audio_config=None)
-
+    def build_ssml(self, text, voice_key, options):
         default_pitch = 0
         default_rate = 1.0
 
@@ -418,20 +537,21 @@ class AzureService(cloudlanguagetools.service.Service):
 
         # print(f'[{ssml_str}] len: {len(ssml_str)}')
         logger.debug(f'sending SSML string: [{ssml_str}]')
+        return ssml_str
 
+    def run_synthesizer_call(self, function, *args):
+        """the speech SDK calls don't take a timeout, enforce one. on timeout, the call keeps running
+        in the background, the caller must discard the synthesizer"""
         timeout_seconds = cloudlanguagetools.constants.RequestTimeout
-        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        future = synthesizer_executor.submit(function, *args)
         try:
-            future = executor.submit(synthesizer.speak_ssml, ssml_str)
-            try:
-                result = future.result(timeout=timeout_seconds)
-            except concurrent.futures.TimeoutError as exception:
-                raise cloudlanguagetools.errors.TimeoutError(
-                    f'Azure TTS timed out after {timeout_seconds} seconds') from exception
-        finally:
-            executor.shutdown(wait=False)
+            return future.result(timeout=timeout_seconds)
+        except concurrent.futures.TimeoutError as exception:
+            raise cloudlanguagetools.errors.TimeoutError(
+                f'Azure TTS timed out after {timeout_seconds} seconds') from exception
 
-        if result.reason != azure.cognitiveservices.speech.ResultReason.SynthesizingAudioCompleted:
+    def check_synthesis_result(self, result, expected_reason):
+        if result.reason != expected_reason:
             error_details = result.cancellation_details.error_details
             logger.warning(f'Azure TTS synthesis failed: reason={result.cancellation_details.reason}, error_details={error_details}')
             # special case errors:
@@ -443,10 +563,41 @@ class AzureService(cloudlanguagetools.service.Service):
                 error_message = f'Could not generate audio: {result.cancellation_details.reason} {error_details}'
             raise cloudlanguagetools.errors.RequestError(error_message)
 
-        stream = azure.cognitiveservices.speech.AudioDataStream(result)
-        stream.save_to_wav_file(output_temp_filename)
-
-        return output_temp_file
+    def get_tts_audio(self, text, voice_key, options):
+        response_format_parameter, audio_format = self.get_tts_audio_format(options)
+        ssml_str = self.build_ssml(text, voice_key, options)
+
+        with self.synthesizer_pool.synthesizer(response_format_parameter) as pooled_synthesizer:
+            result = self.run_synthesizer_call(pooled_synthesizer.synthesizer.speak_ssml, ssml_str)
+            self.check_synthesis_result(result, azure.cognitiveservices.speech.ResultReason.SynthesizingAudioCompleted)
+
+        return cloudlanguagetools.audioresult.AudioResult(result.audio_data, audio_format=audio_format)
+
+    def stream_tts_audio(self, text, voice_key, options):
+        response_format_parameter, audio_format = self.get_tts_audio_format(options)
+        if audio_format == cloudlanguagetools.options.AudioFormat.wav:
+            # the wav header needs the total length, which isn't known until the end
+            yield from super().stream_tts_audio(text, voice_key, options)
+            return
+        ssml_str = self.build_ssml(text, voice_key, options)
+
+        # the synthesizer is busy until the whole stream has been read
+        with self.synthesizer_pool.synthesizer(response_format_parameter) as pooled_synthesizer:
+            synthesizer = pooled_synthesizer.synthesizer
+            # returns as soon as the first audio chunk is available
+            result = self.run_synthesizer_call(lambda: synthesizer.start_speaking_ssml_async(ssml_str).get())
+            self.check_synthesis_result(result, azure.cognitiveservices.speech.ResultReason.SynthesizingAudioStarted)
+
+            stream = azure.cognitiveservices.speech.AudioDataStream(result)
+            buffer = bytes(cloudlanguagetools.constants.AudioStreamChunkSize)
+            while True:
+                filled_size = stream.read_data(buffer)
+                if filled_size == 0:
+                    break
+                yield buffer[:filled_size]
+            if stream.status == azure.cognitiveservices.speech.StreamStatus.Canceled:
+                cancellation_details = stream.cancellation_details
+                raise cloudlanguagetools.errors.RequestError(f'Could not generate audio: {cancellation_details.reason} {cancellation_details.error_details}')
 
     def get_tts_voice_list(self):
         # returns list of TtSVoice
@@ -459,7 +610,7 @@ class AzureService(cloudlanguagetools.service.Service):
         headers = {
             'Authorization': 'Bearer ' + token,
         }        
-        response = requests.get(constructed_url, headers=headers, 
+        response = self.http_get(constructed_url, headers=headers, 
             timeout=cloudlanguagetools.constants.RequestTimeout)
         response.raise_for_status()
         voice_list = json.loads(response.content)
@@ -483,7 +634,7 @@ class AzureService(cloudlanguagetools.service.Service):
         headers = {
             'Authorization': 'Bearer ' + token,
         }        
-        response = requests.get(constructed_url, headers=headers, 
+        response = self.http_get(constructed_url, headers=headers, 
             timeout=cloudlanguagetools.constants.RequestTimeout)
         response.raise_for_status()
         voice_list = json.loads(response.content)
@@ -496,27 +647,69 @@ class AzureService(cloudlanguagetools.service.Service):
                 logger.exception(f'could not process voice for {voice_data}')
         return result            
 
-    def get_translation(self, text, from_language_key, to_language_key):
+    def get_translation_url(self, from_language_key, to_language_key):
         base_url = f'{self.url_translator_base}/translate?api-version=3.0'
         params = f'&to={to_language_key}&from={from_language_key}'
-        url = base_url + params
+        return base_url + params
 
+    def get_translator_error(self, response, error_message):
+        """translator error codes start with the http status, 400xxx / 413xxx: the texts were rejected"""
+        error = response['error']
+        error_code = str(error.get('code', '')) if isinstance(error, dict) else ''
+        if error_code.startswith(('400', '413')):
+            return cloudlanguagetools.errors.InputError(error_message)
+        return cloudlanguagetools.errors.RequestError(error_message)
+
+    def process_translation_response(self, response, text, from_language_key, to_language_key):
+        if 'error' in response:
+            error_message = f'Azure: could not translate text [{text}] from {from_language_key} to {to_language_key} ({response})'
+            raise self.get_translator_error(response, error_message)
+
+        return response[0]['translations'][0]['text']
+
+    def get_translation(self, text, from_language_key, to_language_key):
         # You can pass more than one object in body.
         body = [{
             'text': text
         }]
-        request = requests.post(url, headers=self.get_translator_headers(), json=body, timeout=cloudlanguagetools.constants.RequestTimeout)
-        response = request.json()
+        request = self.http_post(self.get_translation_url(from_language_key, to_language_key), headers=self.get_translator_headers(), json=body, timeout=cloudlanguagetools.constants.RequestTimeout)
+        return self.process_translation_response(request.json(), text, from_language_key, to_language_key)
+
+    async def get_translation_async(self, text, from_language_key, to_language_key):
+        body = [{
+            'text': text
+        }]
+        request = await self.http_post_async(self.get_translation_url(from_language_key, to_language_key), headers=self.get_translator_headers(), json=body, timeout=cloudlanguagetools.constants.RequestTimeout)
+        return self.process_translation_response(request.json(), text, from_language_key, to_language_key)
 
+    def process_translation_batch_response(self, response, texts, from_language_key, to_language_key):
         if 'error' in response:
-            error_message = f'Azure: could not translate text [{text}] from {from_language_key} to {to_language_key} ({response})'
-            raise cloudlanguagetools.errors.RequestError(error_message)
+            error_message = f'Azure: could not translate {len(texts)} texts from {from_language_key} to {to_language_key} ({response})'
+            raise self.get_translator_error(response, error_message)
 
-        return response[0]['translations'][0]['text']
+        return [entry['translations'][0]['text'] for entry in response]
+
+    def get_translation_batch(self, texts, from_language_key, to_language_key):
+        body = [{'text': text} for text in texts]
+        request = self.http_post(self.get_translation_url(from_language_key, to_language_key), headers=self.get_translator_headers(), json=body, timeout=cloudlanguagetools.constants.RequestTimeout)
+        return self.process_translation_batch_response(request.json(), texts, from_language_key, to_language_key)
+
+    async def get_translation_batch_async(self, texts, from_language_key, to_language_key):
+        body = [{'text': text} for text in texts]
+        request = await self.http_post_async(self.get_translation_url(from_language_key, to_language_key), headers=self.get_translator_headers(), json=body, timeout=cloudlanguagetools.constants.RequestTimeout)
+        return self.process_translation_batch_response(request.json(), texts, from_language_key, to_language_key)
 
     def get_transliteration(self, text, transliteration_key):
         return self.transliteration(text, transliteration_key['language_id'], transliteration_key['from_script'], transliteration_key['to_script'])
 
+    async def get_transliteration_async(self, text, transliteration_key):
+        url = self.get_transliteration_url(transliteration_key['language_id'], transliteration_key['from_script'], transliteration_key['to_script'])
+        body = [{
+            'text': text
+        }]
+        request = await self.http_post_async(url, headers=self.get_translator_headers(), json=body, timeout=cloudlanguagetools.constants.RequestTimeout)
+        return self.process_transliteration_response(request.json())
+
     def get_translation_language_list(self):
         azure_data = self.get_supported_languages()
         result = []
@@ -571,7 +764,7 @@ class AzureService(cloudlanguagetools.service.Service):
 
         for attempt in range(max_retries):
             try:
-                request = requests.get(url, headers=headers, 
+                request = self.http_get(url, headers=headers, 
                     timeout=cloudlanguagetools.constants.RequestTimeoutLong)
                 request.raise_for_status()
                 response = request.json()
@@ -591,7 +784,7 @@ class AzureService(cloudlanguagetools.service.Service):
         url = f'{self.url_translator_base}/detect?api-version=3.0'
         body = [{'text': text} for text in text_list]
 
-        request = requests.post(url, headers=self.get_translator_headers(), json=body, timeout=cloudlanguagetools.constants.RequestTimeout)
+        request = self.http_post(url, headers=self.get_translator_headers(), json=body, timeout=cloudlanguagetools.constants.RequestTimeout)
         response = request.json()
 
         language_score = {}
@@ -605,34 +798,59 @@ class AzureService(cloudlanguagetools.service.Service):
         highest_language = max(language_score.items(), key=operator.itemgetter(1))[0]
         return get_translation_language_enum(highest_language)
 
-    def transliteration(self, text, language_key, from_script, to_script):
+    def get_transliteration_url(self, language_key, from_script, to_script):
         url = f'{self.url_translator_base}/transliterate?api-version=3.0'
         params = f'&language={language_key}&fromScript={from_script}&toScript={to_script}'
-        constructed_url = url + params
+        return url + params
 
+    def process_transliteration_response(self, response):
+        assert(len(response) == 1)
+        return response[0]['text']
+
+    def transliteration(self, text, language_key, from_script, to_script):
         body = [{
             'text': text
         }]
-        request = requests.post(constructed_url, headers=self.get_translator_headers(), json=body, timeout=cloudlanguagetools.constants.RequestTimeout)
-        response = request.json()
+        request = self.http_post(self.get_transliteration_url(language_key, from_script, to_script), headers=self.get_translator_headers(), json=body, timeout=cloudlanguagetools.constants.RequestTimeout)
+        return self.process_transliteration_response(request.json())
 
-        assert(len(response) == 1)
-        return response[0]['text']
+    def get_transliteration_batch(self, texts, transliteration_key):
+        return self.transliteration_batch(texts, transliteration_key['language_id'], transliteration_key['from_script'], transliteration_key['to_script'])
+
+    async def get_transliteration_batch_async(self, texts, transliteration_key):
+        language_key, from_script, to_script = transliteration_key['language_id'], transliteration_key['from_script'], transliteration_key['to_script']
+        body = [{'text': text} for text in texts]
+        request = await self.http_post_async(self.get_transliteration_url(language_key, from_script, to_script), headers=self.get_translator_headers(), json=body, timeout=cloudlanguagetools.constants.RequestTimeout)
+        return self.process_transliteration_batch_response(request.json(), texts, language_key, from_script, to_script)
+
+    def transliteration_batch(self, texts, language_key, from_script, to_script):
+        body = [{'text': text} for text in texts]
+        request = self.http_post(self.get_transliteration_url(language_key, from_script, to_script), headers=self.get_translator_headers(), json=body, timeout=cloudlanguagetools.constants.RequestTimeout)
+        return self.process_transliteration_batch_response(request.json(), texts, language_key, from_script, to_script)
+
+    def process_transliteration_batch_response(self, response, texts, language_key, from_script, to_script):
+        if 'error' in response:
+            error_message = f'Azure: could not transliterate {len(texts)} texts, language {language_key} from {from_script} to {to_script} ({response})'
+            raise self.get_translator_error(response, error_message)
+
+        return [entry['text'] for entry in response]
 
     # supported languages: https://docs.microsoft.com/en-us/azure/cognitive-services/speech-service/language-support#speech-to-text
     def speech_to_text(self, mp3_filepath, audio_format, language=None):
         speech_config = azure.cognitiveservices.speech.SpeechConfig(subscription=self.key, region=self.region)
 
-        if audio_format == cloudlanguagetools.options.AudioFormat.mp3:
-            sound = pydub.AudioSegment.from_mp3(mp3_filepath)
-        elif audio_format in [cloudlanguagetools.options.AudioFormat.ogg_opus, cloudlanguagetools.options.AudioFormat.ogg_vorbis]:
-            sound = pydub.AudioSegment.from_ogg(mp3_filepath)
-        elif audio_format == cloudlanguagetools.options.AudioFormat.wav:
-            sound = pydub.AudioSegment.from_wav(mp3_filepath)
-        wav_filepath = tempfile.NamedTemporaryFile(suffix='.wav').name
-        sound.export(wav_filepath, format="wav")
+        audio = cloudlanguagetools.audioresult.AudioResult.from_file(mp3_filepath, audio_format=audio_format)
+        # the default format of push streams: 16khz, 16 bit, mono PCM
+        wav_audio = cloudlanguagetools.transcoding.convert(audio, audio_format, cloudlanguagetools.options.AudioFormat.wav,
+            sample_rate=16000, channels=1)
+        with wave.open(wav_audio.open(), 'rb') as wav_reader:
+            pcm_data = wav_reader.readframes(wav_reader.getnframes())
 
-        audio_input = azure.cognitiveservices.speech.audio.AudioConfig(filename=wav_filepath)
+        # the audio is pushed from memory, nothing gets written to disk
+        audio_stream = azure.cognitiveservices.speech.audio.PushAudioInputStream()
+        audio_stream.write(pcm_data)
+        audio_stream.close()
+        audio_input = azure.cognitiveservices.speech.audio.AudioConfig(stream=audio_stream)
 
         # Creates a recognizer with the given settings
         if language != None:
@@ -697,7 +915,7 @@ class AzureService(cloudlanguagetools.service.Service):
         body = [{
             'text': text
         }]
-        request = requests.post(url, headers=self.get_translator_headers(), json=body, timeout=cloudlanguagetools.constants.RequestTimeout)
+        request = self.http_post(url, headers=self.get_translator_headers(), json=body, timeout=cloudlanguagetools.constants.RequestTimeout)
         response = request.json()
         if len(response) > 1:
             raise Exception(f'more than one response entries, {url}, {text}')
@@ -767,7 +985,7 @@ class AzureService(cloudlanguagetools.service.Service):
         body = [{
             'text': input_text
         }]
-        request = requests.post(url, headers=self.get_translator_headers(), json=body, timeout=cloudlanguagetools.constants.RequestTimeout)
+        request = self.http_post(url, headers=self.get_translator_headers(), json=body, timeout=cloudlanguagetools.constants.RequestTimeout)
         response = request.json()
 
         pprint.pprint(response)
@@ -794,7 +1012,7 @@ class AzureService(cloudlanguagetools.service.Service):
             'text': input_text,
             'translation': translation
         }]
-        request = requests.post(url, headers=self.get_translator_headers(), json=body, timeout=cloudlanguagetools.constants.RequestTimeout)
+        request = self.http_post(url, headers=self.get_translator_headers(), json=body, timeout=cloudlanguagetools.constants.RequestTimeout)
         response = request.json()
 
         print(json.dumps(response, sort_keys=True, indent=4, ensure_ascii=False, separators=(',', ': ')))
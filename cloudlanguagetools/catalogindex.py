@@ -0,0 +1,95 @@
+"""
+indexes over the catalogs (translation languages, transliterations, dictionary lookups), built once
+every time a catalog gets refreshed, so that selecting an option for a given service / language
+doesn't require scanning the whole catalog.
+"""
+
+import logging
+import timeit
+import collections
+
+import cloudlanguagetools.constants
+
+logger = logging.getLogger(__name__)
+
+def group_by(entries, key_function):
+    result = collections.defaultdict(list)
+    for entry in entries:
+        result[key_function(entry)].append(entry)
+    return dict(result)
+
+class CatalogIndex():
+    """entries grouped by language and by (service, language). lists preserve the catalog order."""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.by_language = group_by(entries, lambda x: x.language)
+        self.by_service_language = group_by(entries, lambda x: (x.service, x.language))
+        self.services_by_language = {language: set([x.service for x in language_entries])
+            for language, language_entries in self.by_language.items()}
+
+    def get_entries(self, language, service=None):
+        if service is None:
+            return self.by_language.get(language, [])
+        return self.by_service_language.get((service, language), [])
+
+    def get_services(self, language):
+        return self.services_by_language.get(language, set())
+
+
+class TranslationIndex(CatalogIndex):
+    """also holds the language pair matrix: (source language, target language) -> services which can translate"""
+
+    def __init__(self, entries):
+        super().__init__(entries)
+        languages_by_service = collections.defaultdict(set)
+        for entry in entries:
+            languages_by_service[entry.service].add(entry.language)
+        language_pair_matrix = collections.defaultdict(set)
+        for service, languages in languages_by_service.items():
+            for source_language in languages:
+                for target_language in languages:
+                    language_pair_matrix[(source_language, target_language)].add(service)
+        self.language_pair_matrix = {language_pair: frozenset(services) for language_pair, services in language_pair_matrix.items()}
+
+    def get_language_pair_services(self, source_language, target_language):
+        """services which can translate from source_language to target_language"""
+        return self.language_pair_matrix.get((source_language, target_language), frozenset())
+
+    def get_language_pair(self, service, source_language, target_language):
+        """returns (source TranslationLanguage, target TranslationLanguage) for this service, or None"""
+        if service not in self.get_language_pair_services(source_language, target_language):
+            return None
+        return self.by_service_language[(service, source_language)][0], self.by_service_language[(service, target_language)][0]
+
+
+class DictionaryLookupIndex(CatalogIndex):
+    """also groups entries by (source language, target language)"""
+
+    def __init__(self, entries):
+        super().__init__(entries)
+        self.by_language_pair = group_by(entries, lambda x: (x.language, x.target_language))
+        self.by_service_language_pair = group_by(entries, lambda x: (x.service, x.language, x.target_language))
+
+    def get_language_pair_entries(self, source_language, target_language, service=None):
+        if service is None:
+            return self.by_language_pair.get((source_language, target_language), [])
+        return self.by_service_language_pair.get((service, source_language, target_language), [])
+
+    def get_language_pair_services(self, source_language, target_language):
+        return set([x.service for x in self.get_language_pair_entries(source_language, target_language)])
+
+
+INDEX_CLASSES = {
+    cloudlanguagetools.constants.Catalog.translation_language_list: TranslationIndex,
+    cloudlanguagetools.constants.Catalog.transliteration_language_list: CatalogIndex,
+    cloudlanguagetools.constants.Catalog.dictionary_lookup_options: DictionaryLookupIndex,
+}
+
+def build_index(catalog: cloudlanguagetools.constants.Catalog, entries) -> CatalogIndex:
+    if catalog not in INDEX_CLASSES:
+        raise ValueError(f'no index available for {catalog.name}')
+    start_time = timeit.default_timer()
+    index = INDEX_CLASSES[catalog](entries)
+    logger.info(f'built index for {catalog.name} ({len(entries)} entries) in {timeit.default_timer() - start_time:.3f}s')
+    return index
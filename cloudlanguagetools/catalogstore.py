@@ -0,0 +1,183 @@
+import os
+import time
+import pickle
+import logging
+import threading
+import dataclasses
+import collections
+import concurrent.futures
+from typing import Callable, Dict, Optional
+
+import cloudlanguagetools.constants
+import cloudlanguagetools.concurrency
+
+logger = logging.getLogger(__name__)
+
+# path of the catalog snapshot file, when not set, catalogs are only kept in memory
+CATALOG_SNAPSHOT_ENV_VAR = 'CLOUDLANGUAGETOOLS_CORE_CATALOG_SNAPSHOT'
+
+SNAPSHOT_VERSION = 1
+
+
+@dataclasses.dataclass
+class CatalogEntry:
+    """the catalog of a single service"""
+    # None if the service never returned its catalog successfully
+    entries: Optional[list]
+    # time of the last successful retrieval
+    retrieved_at: Optional[float]
+    # after this time, the entry is stale and needs to be refreshed
+    expires_at: float
+    # outcome of the last retrieval attempt
+    task_result: cloudlanguagetools.concurrency.TaskResult
+
+
+class CatalogStore():
+    """catalogs (voice list, translation languages, etc), stored per (catalog, service).
+    each service has its own expiration time, a stale entry keeps being served while it gets refreshed
+    in the background. entries are persisted to a snapshot file so that a restarted process doesn't start cold.
+    the snapshot keeps each entry pickled separately, it only gets unpickled when first requested,
+    so that reading the snapshot doesn't import every service module."""
+
+    def __init__(self, snapshot_path=None, ttl=cloudlanguagetools.constants.TTLCacheTimeout, service_ttl: Dict = None):
+        self.snapshot_path = snapshot_path
+        self.ttl = ttl
+        self.service_ttl = service_ttl or {}
+        # (Catalog, Service) -> CatalogEntry
+        self.entries = {}
+        # (Catalog, Service) -> dict, loaded from the snapshot but not unpickled yet
+        self.snapshot_entries = {}
+        # incremented every time a catalog gets updated
+        self.generations = collections.Counter()
+        self.lock = threading.RLock()
+        self.snapshot_lock = threading.Lock()
+        self.refreshing = set()
+        self.refresh_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix='catalog_refresh')
+        if self.snapshot_path is not None:
+            self.load_snapshot()
+
+    def get_ttl(self, service):
+        return self.service_ttl.get(service, self.ttl)
+
+    def generation(self, catalog):
+        return self.generations[catalog]
+
+    def get(self, catalog, service) -> Optional[CatalogEntry]:
+        key = (catalog, service)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None and key in self.snapshot_entries:
+                entry = self.unpickle_snapshot_entry(key, self.snapshot_entries.pop(key))
+                if entry is not None:
+                    self.entries[key] = entry
+            return entry
+
+    def is_stale(self, entry: CatalogEntry):
+        return time.time() >= entry.expires_at
+
+    def put(self, catalog, service, task_result: cloudlanguagetools.concurrency.TaskResult):
+        """record the outcome of a retrieval. when it failed, entries from a previous
+        successful retrieval are kept, and another attempt is made after TTLCachePartialTimeout"""
+        now = time.time()
+        key = (catalog, service)
+        with self.lock:
+            previous_entry = self.get(catalog, service)
+            if task_result.status == cloudlanguagetools.concurrency.TaskStatus.ok:
+                entry = CatalogEntry(entries=task_result.result, retrieved_at=now,
+                    expires_at=now + self.get_ttl(service), task_result=dataclasses.replace(task_result, result=None))
+            else:
+                entry = CatalogEntry(
+                    entries=previous_entry.entries if previous_entry is not None else None,
+                    retrieved_at=previous_entry.retrieved_at if previous_entry is not None else None,
+                    expires_at=now + cloudlanguagetools.constants.TTLCachePartialTimeout,
+                    task_result=task_result)
+            self.entries[key] = entry
+            self.generations[catalog] += 1
+            return entry
+
+    def refresh_in_background(self, catalog, service, fetch_function: Callable):
+        """refresh a stale entry, at most one refresh per entry is in flight"""
+        key = (catalog, service)
+        with self.lock:
+            if key in self.refreshing:
+                return
+            self.refreshing.add(key)
+        logger.info(f'refreshing stale {catalog.name} for {service.name} in the background')
+        self.refresh_executor.submit(self.refresh, catalog, service, fetch_function)
+
+    def refresh(self, catalog, service, fetch_function: Callable):
+        try:
+            task_result = cloudlanguagetools.concurrency.run_timed(fetch_function)
+            if task_result.status != cloudlanguagetools.concurrency.TaskStatus.ok:
+                logger.warning(f'could not refresh {catalog.name} for {service.name}: {task_result.exception}')
+            self.put(catalog, service, task_result)
+            self.save_snapshot()
+        finally:
+            with self.lock:
+                self.refreshing.discard((catalog, service))
+
+    # snapshot
+    # ========
+
+    def unpickle_snapshot_entry(self, key, snapshot_entry):
+        catalog, service = key
+        try:
+            entries = pickle.loads(snapshot_entry['data'])
+        except Exception as e:
+            logger.warning(f'could not load {catalog.name} for {service.name} from snapshot: {e}')
+            return None
+        return CatalogEntry(entries=entries, retrieved_at=snapshot_entry['retrieved_at'],
+            expires_at=snapshot_entry['expires_at'],
+            task_result=cloudlanguagetools.concurrency.TaskResult(status=cloudlanguagetools.concurrency.TaskStatus.ok))
+
+    def load_snapshot(self):
+        if not os.path.exists(self.snapshot_path):
+            logger.info(f'catalog snapshot {self.snapshot_path} not found, starting with empty catalogs')
+            return
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                snapshot = pickle.load(f)
+            if snapshot.get('version') != SNAPSHOT_VERSION:
+                logger.warning(f'ignoring catalog snapshot {self.snapshot_path} with version {snapshot.get("version")}')
+                return
+            snapshot_entries = {}
+            for (catalog_name, service_name), snapshot_entry in snapshot['entries'].items():
+                if catalog_name in cloudlanguagetools.constants.Catalog.__members__ and service_name in cloudlanguagetools.constants.Service.__members__:
+                    snapshot_entries[(cloudlanguagetools.constants.Catalog[catalog_name], cloudlanguagetools.constants.Service[service_name])] = snapshot_entry
+        except Exception as e:
+            logger.warning(f'could not load catalog snapshot {self.snapshot_path}: {e}')
+            return
+        with self.lock:
+            self.snapshot_entries.update(snapshot_entries)
+        logger.info(f'loaded {len(snapshot_entries)} entries from catalog snapshot {self.snapshot_path}')
+
+    def save_snapshot(self):
+        if self.snapshot_path is None:
+            return
+        with self.lock:
+            snapshot_entries = {(catalog.name, service.name): snapshot_entry for (catalog, service), snapshot_entry in self.snapshot_entries.items()}
+            entries = [(key, entry) for key, entry in self.entries.items() if entry.entries is not None]
+        for (catalog, service), entry in entries:
+            try:
+                data = pickle.dumps(entry.entries)
+            except Exception as e:
+                logger.warning(f'could not save {catalog.name} for {service.name} to snapshot: {e}')
+                continue
+            snapshot_entries[(catalog.name, service.name)] = {
+                'retrieved_at': entry.retrieved_at,
+                'expires_at': entry.expires_at,
+                'data': data
+            }
+        snapshot = {
+            'version': SNAPSHOT_VERSION,
+            'entries': snapshot_entries
+        }
+        # write to a temporary file and rename, so that a reader never sees a partial snapshot
+        with self.snapshot_lock:
+            temp_path = f'{self.snapshot_path}.{os.getpid()}.tmp'
+            try:
+                with open(temp_path, 'wb') as f:
+                    pickle.dump(snapshot, f)
+                os.replace(temp_path, self.snapshot_path)
+            except Exception as e:
+                logger.warning(f'could not save catalog snapshot {self.snapshot_path}: {e}')
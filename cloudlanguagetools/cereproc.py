@@ -4,6 +4,7 @@ import tempfile
 import logging
 import os
 import base64
+import time
 
 import cloudlanguagetools.service
 import cloudlanguagetools.constants
@@ -12,7 +13,10 @@ import cloudlanguagetools.ttsvoice
 import cloudlanguagetools.translationlanguage
 import cloudlanguagetools.transliterationlanguage
 import cloudlanguagetools.errors
+import cloudlanguagetools.options
 
+# used when the expiry can't be read from the access token
+ACCESS_TOKEN_LIFETIME = 300
 
 def get_audio_language_enum(language_iso, country_iso):
     cereproc_audio_id_map = {
@@ -55,32 +59,42 @@ class CereProcService(cloudlanguagetools.service.Service):
     def configure(self, config):
         self.username = config['username']
         self.password = config['password']
-    
+        self.token_manager = cloudlanguagetools.service.TokenManager(self.fetch_access_token)
+
 
     def get_access_token(self):
+        return self.token_manager.get_token()
+
+    def fetch_access_token(self):
         combined = f'{self.username}:{self.password}'
         auth_string = base64.b64encode(combined.encode('utf-8')).decode('utf-8')
         headers = {'authorization': f'Basic {auth_string}'}
 
         auth_url = 'https://api.cerevoice.com/v2/auth'
-        response = requests.get(auth_url, headers=headers, 
+        response = self.http_get(auth_url, headers=headers, 
             timeout=cloudlanguagetools.constants.RequestTimeout)
         response.raise_for_status()
 
-        access_token = response.json()['access_token']        
-        return access_token
+        access_token = response.json()['access_token']
+        expires_at = cloudlanguagetools.service.get_jwt_expiration(access_token)
+        if expires_at is None:
+            expires_at = time.time() + ACCESS_TOKEN_LIFETIME
+        return access_token, expires_at
     
     def get_auth_headers(self):
         headers={'Authorization': f'Bearer {self.get_access_token()}'}
         return headers
 
+    async def get_auth_headers_async(self):
+        return {'Authorization': f'Bearer {await self.token_manager.get_token_async()}'}
+
     def get_translation_language_list(self):
         return []
 
     def list_voices(self):
         list_voices_url = 'https://api.cerevoice.com/v2/voices'
         
-        response = requests.get(list_voices_url, headers=self.get_auth_headers(), 
+        response = self.http_get(list_voices_url, headers=self.get_auth_headers(), 
             timeout=(cloudlanguagetools.constants.ReadTimeout, cloudlanguagetools.constants.RequestTimeout))
         data = response.json()
         return data['voices']
@@ -97,14 +111,24 @@ class CereProcService(cloudlanguagetools.service.Service):
 
         return result
 
-    def get_tts_audio(self, text, voice_key, options):
+    def get_tts_request(self, text, voice_key):
+        """returns (url, data)"""
         voice_name = voice_key['name']
         url = f'https://api.cerevoice.com/v2/speak?voice={voice_name}&audio_format=mp3'
 
         ssml_text = f"""<?xml version="1.0" encoding="UTF-8"?>
 <speak xmlns="http://www.w3.org/2001/10/synthesis">{text}</speak>""".encode(encoding='utf-8')
+        return url, ssml_text
 
-        return self.get_tts_audio_base_post_request(url, data=ssml_text, headers=self.get_auth_headers())
+    def get_tts_audio(self, text, voice_key, options):
+        url, ssml_text = self.get_tts_request(text, voice_key)
+        return self.get_tts_audio_base_post_request(url, audio_format=cloudlanguagetools.options.AudioFormat.mp3,
+            data=ssml_text, headers=self.get_auth_headers())
+
+    async def get_tts_audio_async(self, text, voice_key, options):
+        url, ssml_text = self.get_tts_request(text, voice_key)
+        return await self.get_tts_audio_base_post_request_async(url, audio_format=cloudlanguagetools.options.AudioFormat.mp3,
+            data=ssml_text, headers=await self.get_auth_headers_async())
 
 
     def get_transliteration_language_list(self):
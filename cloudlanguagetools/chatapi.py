@@ -1,12 +1,13 @@
 import pydantic
 import logging
 import pprint
-import pydub
 import tempfile
 from pydantic import Field
 from typing import Optional
 import cloudlanguagetools.servicemanager
 import cloudlanguagetools.options
+import cloudlanguagetools.audioresult
+import cloudlanguagetools.transcoding
 import cloudlanguagetools.languages
 
 logger = logging.getLogger(__name__)
@@ -70,14 +71,8 @@ class ChatAPI():
             cloudlanguagetools.constants.Service.Watson            
         ], preferred_service)
 
-        # get list of translation options
-        translation_language_list = self.manager.get_translation_language_list()
-        source_translation_language_list = [x for x in translation_language_list if x.language == source_language]
-        target_translation_language_list = [x for x in translation_language_list if x.language == target_language]
-        # get the list of services in common between source_translation_language_list and target_translation_language_list
-        source_service_list = set([x.service for x in source_translation_language_list])
-        target_service_list = set([x.service for x in target_translation_language_list])
-        common_service_list = source_service_list.intersection(target_service_list)
+        translation_index = self.manager.get_translation_index()
+        common_service_list = translation_index.get_language_pair_services(source_language, target_language)
 
         while service_preference[0] not in common_service_list:
             service_preference.pop(0)
@@ -85,8 +80,9 @@ class ChatAPI():
                 raise NoDataFoundException(f'No service found for translation from {source_language} to {target_language}')
 
         service = service_preference[0]
-        source_language_id = [x for x in source_translation_language_list if x.service == service][0].get_language_id()
-        target_language_id = [x for x in target_translation_language_list if x.service == service][0].get_language_id()
+        source_entry, target_entry = translation_index.get_language_pair(service, source_language, target_language)
+        source_language_id = source_entry.get_language_id()
+        target_language_id = target_entry.get_language_id()
 
         translation_option = {
             'service': service,
@@ -97,13 +93,11 @@ class ChatAPI():
 
     def select_transliteration_option(self, preferred_service: cloudlanguagetools.constants.Service,
             language: cloudlanguagetools.languages.Language):
-        transliteration_option_list = self.manager.get_transliteration_language_list()
-        candidates = [x for x in transliteration_option_list if x.language == language]
-        if len(candidates) == 0:
+        transliteration_index = self.manager.get_transliteration_index()
+        service_list = transliteration_index.get_services(language)
+        if len(service_list) == 0:
             raise NoDataFoundException(f'No transliteration service found for language {language.lang_name}')
 
-        service_list = set([x.service for x in candidates])
-
         service_preference = self.get_service_preference([
             cloudlanguagetools.constants.Service.MandarinCantonese, # in case input text is chinese
             cloudlanguagetools.constants.Service.EasyPronunciation,
@@ -117,12 +111,12 @@ class ChatAPI():
                 raise NoDataFoundException(f'No service found for transliteration of {language.lang_name}')
             
         service = service_preference[0]
-        final_candidates = [x for x in candidates if x.service == service]
+        final_candidates = transliteration_index.get_entries(language, service=service)
 
         if service == cloudlanguagetools.constants.Service.MandarinCantonese:
-            final_candidates = [x for x in candidates if 
-                                x.service == service and x.get_transliteration_key()['tone_numbers'] == False and
-                                x.service == service and x.get_transliteration_key()['spaces'] == False]
+            final_candidates = [x for x in final_candidates if 
+                                x.get_transliteration_key()['tone_numbers'] == False and
+                                x.get_transliteration_key()['spaces'] == False]
         transliteration_option = final_candidates[0]
 
         return transliteration_option
@@ -170,13 +164,11 @@ class ChatAPI():
         logger.info(f'dictionary lookup {query}')
         source_language = cloudlanguagetools.languages.Language[query.source_language.name]
         target_language = cloudlanguagetools.languages.Language[query.target_language.name]
-        dictionary_option_list = self.manager.get_dictionary_lookup_options()
-        candidates = [x for x in dictionary_option_list if x.language == source_language and x.target_language == target_language]
-        if len(candidates) == 0:
+        dictionary_lookup_index = self.manager.get_dictionary_lookup_index()
+        service_list = dictionary_lookup_index.get_language_pair_services(source_language, target_language)
+        if len(service_list) == 0:
             raise NoDataFoundException(f'No dictionary service found for source language {query.source_language.lang_name} / target language: {query.target_language.lang_name}')
 
-        service_list = set([x.service for x in candidates])
-
         preferred_service = query.service
         # for Chinese, always enforce Wenlin
         if source_language in [
@@ -198,7 +190,7 @@ class ChatAPI():
                 raise NoDataFoundException(f'No service found for dictionary lookup of {query.source_language.lang_name}')
             
         service = service_preference[0]
-        final_candidates = [x for x in candidates if x.service == service]
+        final_candidates = dictionary_lookup_index.get_language_pair_entries(source_language, target_language, service=service)
 
         dictionary_option = final_candidates[0]
         logger.debug(f'Using dictionary option {pprint.pformat(dictionary_option.json_obj())}')
@@ -212,7 +204,7 @@ class ChatAPI():
         return result
         
 
-    def audio(self, query: AudioQuery, format: cloudlanguagetools.options.AudioFormat) -> tempfile.NamedTemporaryFile:
+    def audio(self, query: AudioQuery, format: cloudlanguagetools.options.AudioFormat) -> cloudlanguagetools.audioresult.AudioResult:
         logger.info(f'processing audio query: {query}')
         language = cloudlanguagetools.languages.Language[query.language.name]
         # get full voice list, filter down to correct language
@@ -287,7 +279,7 @@ class ChatAPI():
 
         # generate audio
         logger.debug(f'generating audio with voice {pprint.pformat(voice.json_obj())} options {pprint.pformat(options)}')
-        audio_temp_file = self.manager.get_tts_audio(
+        audio_result = self.manager.get_tts_audio(
             query.input_text,
             service,
             voice.get_voice_key(),
@@ -296,12 +288,9 @@ class ChatAPI():
 
         if convert_mp3_to_ogg:
             logger.debug(f'need to convert from mp3 to ogg_opus')
-            audio = pydub.AudioSegment.from_mp3(audio_temp_file.name)
-            ogg_audio_temp_file = tempfile.NamedTemporaryFile(prefix='cloudlanguagetools_chatapi', suffix='.ogg')
-            audio.export(ogg_audio_temp_file.name, format="ogg", codec="libopus")
-            audio_temp_file = ogg_audio_temp_file
+            audio_result = cloudlanguagetools.transcoding.convert(audio_result, cloudlanguagetools.options.AudioFormat.mp3, format)
 
-        return audio_temp_file
+        return audio_result
 
     def recognize_audio(self, sound_temp_file: tempfile.NamedTemporaryFile, audio_format: cloudlanguagetools.options.AudioFormat):
         # logger.debug(f'processing audio query: {query}')
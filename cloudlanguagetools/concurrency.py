@@ -0,0 +1,169 @@
+import os
+import enum
+import asyncio
+import logging
+import timeit
+import dataclasses
+import functools
+import concurrent.futures
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import cloudlanguagetools.constants
+
+logger = logging.getLogger(__name__)
+
+# see constants.AsyncMaxWorkers
+ASYNC_MAX_WORKERS_ENV_VAR = 'CLOUDLANGUAGETOOLS_CORE_ASYNC_MAX_WORKERS'
+
+# runs the blocking service calls (vendor SDKs) of the async API, threads are only started when needed.
+# when all workers are busy, further calls wait in the executor's queue
+blocking_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=int(os.environ.get(ASYNC_MAX_WORKERS_ENV_VAR, cloudlanguagetools.constants.AsyncMaxWorkers)),
+    thread_name_prefix='clt_async')
+
+
+class TaskStatus(enum.Enum):
+    ok = enum.auto()
+    error = enum.auto()
+    timeout = enum.auto()
+
+@dataclasses.dataclass
+class TaskResult:
+    status: TaskStatus
+    result: Any = None
+    exception: Optional[BaseException] = None
+    elapsed: float = 0.0
+
+    def get_value(self):
+        """the result, or the exception if the task failed"""
+        if self.status == TaskStatus.ok:
+            return self.result
+        return self.exception
+
+    def json_obj(self):
+        data = {
+            'status': self.status.name,
+            'elapsed': round(self.elapsed, 3)
+        }
+        if self.exception is not None:
+            data['error'] = str(self.exception)
+        return data
+
+def run_timed(function: Callable) -> TaskResult:
+    """call function, capturing the result or the exception along with the elapsed time"""
+    start_time = timeit.default_timer()
+    try:
+        result = function()
+        return TaskResult(status=TaskStatus.ok, result=result, elapsed=timeit.default_timer() - start_time)
+    except Exception as e:
+        return TaskResult(status=TaskStatus.error, exception=e, elapsed=timeit.default_timer() - start_time)
+
+def iterate_concurrently(tasks: Dict[Any, Callable], timeout: float, thread_name_prefix='clt') -> Iterator[Tuple[Any, TaskResult]]:
+    """run each callable of the tasks dict in its own thread, yield (key, TaskResult) as each task completes.
+    timeout is an overall deadline counted from the start: when it is reached, every task still running
+    is yielded with status timeout. a task which timed out keeps running in the background, its result is discarded."""
+    if len(tasks) == 0:
+        return
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix=thread_name_prefix)
+    try:
+        pending = {executor.submit(run_timed, function): key for key, function in tasks.items()}
+        try:
+            for future in concurrent.futures.as_completed(list(pending.keys()), timeout=timeout):
+                key = pending.pop(future)
+                yield key, future.result()
+        except concurrent.futures.TimeoutError:
+            for key in pending.values():
+                logger.warning(f'task {key} did not complete within {timeout}s')
+                yield key, TaskResult(status=TaskStatus.timeout,
+                    exception=concurrent.futures.TimeoutError(f'{key} did not complete within {timeout}s'),
+                    elapsed=timeout)
+    finally:
+        # don't wait for tasks which timed out
+        executor.shutdown(wait=False)
+
+def run_concurrently(tasks: Dict[Any, Callable], timeout: float, thread_name_prefix='clt') -> Dict[Any, TaskResult]:
+    """run each callable of the tasks dict in its own thread, and wait at most timeout seconds.
+    all tasks start at the same time, so the timeout is effectively a per-task deadline.
+    returns a dict with the same keys, in the same order, every task gets a TaskResult:
+    status ok / error if it completed, timeout if it was still running at the deadline."""
+    results = dict(iterate_concurrently(tasks, timeout, thread_name_prefix=thread_name_prefix))
+    return {key: results[key] for key in tasks.keys()}
+
+def map_concurrently(function: Callable, items: Iterable, max_workers: int, thread_name_prefix='clt') -> List[TaskResult]:
+    """call function on each item, with at most max_workers threads.
+    returns a TaskResult for each item, in the same order as items"""
+    items = list(items)
+    if len(items) == 0:
+        return []
+    if len(items) == 1:
+        # no need for a thread
+        return [run_timed(functools.partial(function, items[0]))]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(items)), thread_name_prefix=thread_name_prefix) as executor:
+        return list(executor.map(lambda item: run_timed(functools.partial(function, item)), items))
+
+async def run_blocking(function: Callable, *args, **kwargs):
+    """await function(*args, **kwargs) running on blocking_executor.
+    if the awaiting task gets cancelled, the call still completes in the background"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(blocking_executor, functools.partial(function, *args, **kwargs))
+
+async def run_timed_async(awaitable: Awaitable) -> TaskResult:
+    start_time = timeit.default_timer()
+    try:
+        result = await awaitable
+        return TaskResult(status=TaskStatus.ok, result=result, elapsed=timeit.default_timer() - start_time)
+    except Exception as e:
+        return TaskResult(status=TaskStatus.error, exception=e, elapsed=timeit.default_timer() - start_time)
+
+async def map_concurrently_async(function: Callable[[Any], Awaitable], items: Iterable, max_concurrency: int) -> List[TaskResult]:
+    """await function(item) for each item, with at most max_concurrency in flight.
+    returns a TaskResult for each item, in the same order as items"""
+    semaphore = asyncio.Semaphore(max_concurrency)
+    async def run(item):
+        async with semaphore:
+            return await run_timed_async(function(item))
+    return list(await asyncio.gather(*[run(item) for item in items]))
+
+async def iterate_concurrently_async(tasks: Dict[Any, Callable[[], Awaitable]], timeout: float) -> AsyncIterator[Tuple[Any, TaskResult]]:
+    """async version of iterate_concurrently, each coroutine function of the tasks dict runs as an asyncio task.
+    tasks still running at the deadline are yielded with status timeout, and cancelled."""
+    if len(tasks) == 0:
+        return
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    pending = {asyncio.ensure_future(run_timed_async(function())): key for key, function in tasks.items()}
+    try:
+        while len(pending) > 0:
+            done, _ = await asyncio.wait(list(pending.keys()), timeout=max(deadline - loop.time(), 0),
+                return_when=asyncio.FIRST_COMPLETED)
+            if len(done) == 0:
+                break
+            for future in done:
+                yield pending.pop(future), future.result()
+        for key in list(pending.values()):
+            logger.warning(f'task {key} did not complete within {timeout}s')
+            yield key, TaskResult(status=TaskStatus.timeout,
+                exception=asyncio.TimeoutError(f'{key} did not complete within {timeout}s'),
+                elapsed=timeout)
+    finally:
+        for future in pending.keys():
+            future.cancel()
+
+def chunk_texts(texts: List[str], max_items: int, max_characters: int) -> List[List[str]]:
+    """split texts into consecutive chunks of at most max_items texts and max_characters characters.
+    a text longer than max_characters gets its own chunk."""
+    chunks = []
+    current_chunk = []
+    current_characters = 0
+    for text in texts:
+        if len(current_chunk) > 0 and (len(current_chunk) >= max_items or current_characters + len(text) > max_characters):
+            chunks.append(current_chunk)
+            current_chunk = []
+            current_characters = 0
+        current_chunk.append(text)
+        current_characters += len(text)
+    if len(current_chunk) > 0:
+        chunks.append(current_chunk)
+    return chunks
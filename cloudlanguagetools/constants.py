@@ -59,6 +59,42 @@ RequestTimeoutLong = 20 # 10 seconds max
 ReadTimeout = 3 # 3 seconds read timeout
 
 TTLCacheTimeout = 86400 # 24 hours
+TranslationCacheTimeout = 30 * 86400 # 30 days
+AudioCacheMaxSize = 1024 * 1024 * 1024 # 1GB
+# when some services failed to return their catalog, retry sooner
+TTLCachePartialTimeout = 300 # 5 minutes
+# max time a single service is given to return its catalog (voice list, language lists, etc)
+CatalogServiceTimeout = 30
+# overall deadline when requesting a translation from all services
+AllTranslationsTimeout = 15
+# max number of requests sent concurrently to a single service, for a single call
+MaxConcurrentRequests = 8
+# max number of blocking service calls (vendor SDKs: Azure Speech, Google gRPC, boto3, ...) running at the same time
+# on behalf of the async API. REST services are called over async HTTP, without threads, they are bounded by
+# AsyncHttpMaxConnections instead. can be overridden with CLOUDLANGUAGETOOLS_CORE_ASYNC_MAX_WORKERS
+AsyncMaxWorkers = 512
+# max number of connections open at the same time by the async HTTP transport, requests beyond that wait for a connection
+AsyncHttpMaxConnections = 1024
+# max number of keep-alive connections kept open to a single host
+HttpPoolSize = 64
+# size of the chunks yielded when streaming audio
+AudioStreamChunkSize = 4096
+# silence inserted between the segments of texts too long for a single TTS request, in milliseconds
+TtsSegmentGap = 150
+# max number of audio conversions (ffmpeg processes) running at the same time
+TranscodingMaxWorkers = 8
+TranscodingTimeout = 30
+
+# catalogs aggregated across all services, value is the name of the per-service method
+class Catalog(enum.Enum):
+    def __init__(self, service_method):
+        self.service_method = service_method
+    tts_voice_list = ("get_tts_voice_list")
+    tts_voice_list_v3 = ("get_tts_voice_list_v3")
+    translation_language_list = ("get_translation_language_list")
+    transliteration_language_list = ("get_transliteration_language_list")
+    tokenization_options = ("get_tokenization_options")
+    dictionary_lookup_options = ("get_dictionary_lookup_list")
 
 class Service(enum.StrEnum):
     Azure = 'Azure'
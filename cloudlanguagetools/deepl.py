@@ -14,6 +14,9 @@ import cloudlanguagetools.errors
 
 logger = logging.getLogger(__name__)
 
+# bad request / request too large: the texts were rejected
+INPUT_ERROR_STATUS_CODES = (400, 413)
+
 class DeepLTranslationLanguage(cloudlanguagetools.translationlanguage.TranslationLanguage):
     def __init__(self, language, language_id):
         self.service = cloudlanguagetools.constants.Service.DeepL
@@ -26,6 +29,10 @@ class DeepLTranslationLanguage(cloudlanguagetools.translationlanguage.Translatio
 
 
 class DeepLService(cloudlanguagetools.service.Service):
+    # up to 50 texts per request, request body limited to 128KiB, leave room for multi-byte characters
+    TRANSLATION_BATCH_MAX_ITEMS = 50
+    TRANSLATION_BATCH_MAX_CHARACTERS = 30000
+
     def __init__(self):
         self.base_url = 'https://api.deepl.com/v2/translate'
 
@@ -59,7 +66,7 @@ class DeepLService(cloudlanguagetools.service.Service):
     def get_translation_language_list(self):
         language = cloudlanguagetools.languages.Language
         url = 'https://api.deepl.com/v2/languages'
-        response = requests.get(url, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout)
+        response = self.http_get(url, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout)
         response.raise_for_status()
         # pprint.pprint(response.json())
         results = []
@@ -84,26 +91,64 @@ class DeepLService(cloudlanguagetools.service.Service):
     def get_transliteration_language_list(self):
         return []
 
-    def get_translation(self, text, from_language_key, to_language_key):
-
+    def get_source_language_key(self, from_language_key):
         override_source_language_map = {
             'PT-PT': 'PT',
             'PT-BR': 'PT'
         }
-        from_language_key = override_source_language_map.get(from_language_key, from_language_key)
-
+        return override_source_language_map.get(from_language_key, from_language_key)
 
-        params = {
+    def get_translation_params(self, text, from_language_key, to_language_key):
+        return {
             'text': text,
-            'source_lang': from_language_key,
+            'source_lang': self.get_source_language_key(from_language_key),
             'target_lang': to_language_key
         }
-        response = requests.post(self.base_url, data=params, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout)
 
+    def process_translation_response(self, response, text, from_language_key, to_language_key):
         if response.status_code == 200:
             # {'translations': [{'translation': 'Le coût est très bas.'}], 'word_count': 2, 'character_count': 4}
             data = response.json()
             return data['translations'][0]['text']
 
-        error_message = error_message = f'DeepL: could not translate text [{text}] from {from_language_key} to {to_language_key} (status_code: {response.status_code} {response.content})'
-        raise cloudlanguagetools.errors.RequestError(error_message)
\ No newline at end of file
+        error_message = f'DeepL: could not translate text [{text}] from {self.get_source_language_key(from_language_key)} to {to_language_key} (status_code: {response.status_code} {response.content})'
+        if response.status_code in INPUT_ERROR_STATUS_CODES:
+            raise cloudlanguagetools.errors.InputError(error_message)
+        raise cloudlanguagetools.errors.RequestError(error_message)
+
+    def get_translation(self, text, from_language_key, to_language_key):
+        params = self.get_translation_params(text, from_language_key, to_language_key)
+        response = self.http_post(self.base_url, data=params, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout)
+        return self.process_translation_response(response, text, from_language_key, to_language_key)
+
+    async def get_translation_async(self, text, from_language_key, to_language_key):
+        params = self.get_translation_params(text, from_language_key, to_language_key)
+        response = await self.http_post_async(self.base_url, data=params, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout)
+        return self.process_translation_response(response, text, from_language_key, to_language_key)
+
+    def get_translation_batch_params(self, texts, from_language_key, to_language_key):
+        # the text parameter is repeated once per text
+        return [('text', text) for text in texts] + [
+            ('source_lang', self.get_source_language_key(from_language_key)),
+            ('target_lang', to_language_key)
+        ]
+
+    def process_translation_batch_response(self, response, texts, from_language_key, to_language_key):
+        if response.status_code == 200:
+            data = response.json()
+            return [translation['text'] for translation in data['translations']]
+
+        error_message = f'DeepL: could not translate {len(texts)} texts from {self.get_source_language_key(from_language_key)} to {to_language_key} (status_code: {response.status_code} {response.content})'
+        if response.status_code in INPUT_ERROR_STATUS_CODES:
+            raise cloudlanguagetools.errors.InputError(error_message)
+        raise cloudlanguagetools.errors.RequestError(error_message)
+
+    def get_translation_batch(self, texts, from_language_key, to_language_key):
+        params = self.get_translation_batch_params(texts, from_language_key, to_language_key)
+        response = self.http_post(self.base_url, data=params, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout)
+        return self.process_translation_batch_response(response, texts, from_language_key, to_language_key)
+
+    async def get_translation_batch_async(self, texts, from_language_key, to_language_key):
+        params = self.get_translation_batch_params(texts, from_language_key, to_language_key)
+        response = await self.http_post_async(self.base_url, data=params, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout)
+        return self.process_translation_batch_response(response, texts, from_language_key, to_language_key)
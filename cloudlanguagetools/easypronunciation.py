@@ -3,11 +3,13 @@ import requests
 import urllib.parse
 import json
 import logging
+import contextlib
 
 import cloudlanguagetools.service
 import cloudlanguagetools.constants
 import cloudlanguagetools.languages
 import cloudlanguagetools.transliterationlanguage
+import cloudlanguagetools.errors
 import cloudlanguagetools.constants
 
 VARIANT_JAPANESE_ROMAJI = 'Romaji'
@@ -203,7 +205,7 @@ class EasyPronunciationService(cloudlanguagetools.service.Service):
         ]
         return result
 
-    def get_transliteration(self, text, transliteration_key):
+    def get_transliteration_url(self, text, transliteration_key):
         api_url = self.url_base + transliteration_key['url_path']
         parameters = {
             'access_token': self.api_key,
@@ -211,44 +213,56 @@ class EasyPronunciationService(cloudlanguagetools.service.Service):
         }
         parameters.update(transliteration_key['api_params'])
         encoded_parameters = urllib.parse.urlencode(parameters)
-        full_url = f'{api_url}?{encoded_parameters}'
+        return f'{api_url}?{encoded_parameters}'
 
-        # print(full_url)
+    def process_transliteration_response(self, response, transliteration_key):
+        response.raise_for_status()
         try:
-            response = requests.get(full_url, timeout=cloudlanguagetools.constants.RequestTimeout)
-            response.raise_for_status()
             result = response.json()
+        except json.decoder.JSONDecodeError:
+            logger.error(f'could not decode json response from EasyPronounciation: {response.content}')
+            raise
 
-            # print(request)
-            # print(result)
-
-            if 'phonetic_transcription' in result:
-                phonetic_transcription = result['phonetic_transcription']
-                result_components = []
-                for entry in phonetic_transcription:
-                    result_components.append(entry['transcriptions'][0])
+        if 'phonetic_transcription' in result:
+            phonetic_transcription = result['phonetic_transcription']
+            result_components = []
+            for entry in phonetic_transcription:
+                result_components.append(entry['transcriptions'][0])
 
-                if 'variant' in transliteration_key:
-                    if transliteration_key['variant'] == VARIANT_JAPANESE_ROMAJI:
-                        result_components = [x['romaji'] for x in result_components]
-                    if transliteration_key['variant'] == VARIANT_JAPANESE_KANA:
-                        result_components = [x['kana'] for x in result_components]
+            if 'variant' in transliteration_key:
+                if transliteration_key['variant'] == VARIANT_JAPANESE_ROMAJI:
+                    result_components = [x['romaji'] for x in result_components]
+                if transliteration_key['variant'] == VARIANT_JAPANESE_KANA:
+                    result_components = [x['kana'] for x in result_components]
 
-                # print(result_components)
-                return ' '.join(result_components)
+            # print(result_components)
+            return ' '.join(result_components)
 
-            # an error occured
-            error_message = f'EasyPronunciation: could not perform conversion: {str(result)}'
-            raise cloudlanguagetools.errors.RequestError(error_message)
+        # an error occured
+        error_message = f'EasyPronunciation: could not perform conversion: {str(result)}'
+        raise cloudlanguagetools.errors.RequestError(error_message)
 
+    @contextlib.contextmanager
+    def transliteration_errors(self):
+        try:
+            yield
         except requests.exceptions.ReadTimeout as exception:
             raise cloudlanguagetools.errors.TimeoutError(f'timeout while retrieving EasyPronouncation transliteration')
         # handle json decode error
         except json.decoder.JSONDecodeError as exception:
-            logger.error(f'could not decode json response from EasyPronounciation: {response.content}')
             raise cloudlanguagetools.errors.RequestError('Unable to retrieve transliteration from EasyPronounciation')
         except Exception as exception:
             # make sure not to leak url and key
             msg = 'could not retrieve EasyPronouncation transliteration'
             logger.exception(msg)
             raise cloudlanguagetools.errors.RequestError(msg)
+
+    def get_transliteration(self, text, transliteration_key):
+        with self.transliteration_errors():
+            response = self.http_get(self.get_transliteration_url(text, transliteration_key), timeout=cloudlanguagetools.constants.RequestTimeout)
+            return self.process_transliteration_response(response, transliteration_key)
+
+    async def get_transliteration_async(self, text, transliteration_key):
+        with self.transliteration_errors():
+            response = await self.http_get_async(self.get_transliteration_url(text, transliteration_key), timeout=cloudlanguagetools.constants.RequestTimeout)
+            return self.process_transliteration_response(response, transliteration_key)
@@ -1,7 +1,6 @@
 import json
 import pprint
 import requests
-import tempfile
 import os
 import contextlib
 import logging
@@ -16,6 +15,7 @@ import cloudlanguagetools.ttsvoice
 import cloudlanguagetools.translationlanguage
 import cloudlanguagetools.transliterationlanguage
 import cloudlanguagetools.errors
+import cloudlanguagetools.audio_processing
 from cloudlanguagetools.options import AudioFormat
 
 logger = logging.getLogger(__name__)
@@ -104,6 +104,9 @@ class ElevenLabsVoice(cloudlanguagetools.ttsvoice.TtsVoice):
         return VOICE_OPTIONS
 
 class ElevenLabsService(cloudlanguagetools.service.Service):
+    # the lowest per-request character limit across models
+    TTS_MAX_CHARACTERS = 5000
+
     def __init__(self):
         self.service = cloudlanguagetools.constants.Service.ElevenLabs
 
@@ -116,9 +119,10 @@ class ElevenLabsService(cloudlanguagetools.service.Service):
             "xi-api-key": self.api_key
         }
 
-    def get_tts_audio(self, text, voice_key, options):
+    def get_tts_request(self, text, voice_key, options, url_suffix=''):
+        """returns (url, data, headers, audio_format)"""
         voice_id = voice_key['voice_id']
-        url = f'https://api.elevenlabs.io/v1/text-to-speech/{voice_id}'
+        url = f'https://api.elevenlabs.io/v1/text-to-speech/{voice_id}{url_suffix}'
 
         response_format_parameter, audio_format = self.get_request_audio_format({
             AudioFormat.mp3: 'mp3_44100_128',
@@ -155,14 +159,35 @@ class ElevenLabsService(cloudlanguagetools.service.Service):
             'output_format': response_format_parameter
         }
         full_url = f'{url}?{urllib.parse.urlencode(query_params)}'
+        return full_url, data, headers, audio_format
 
+    def process_tts_audio(self, audio, audio_format):
         if audio_format == cloudlanguagetools.options.AudioFormat.wav:
-            return cloudlanguagetools.audio_processing.wrap_pcm_data_wave(self.get_tts_audio_base_post_request(full_url, json=data, headers=headers),
+            return cloudlanguagetools.audio_processing.wrap_pcm_data_wave(audio,
                 num_channels=1,
                 sample_width=2,
                 framerate=44100) # pcm_44100 - PCM format (S16LE) with 44.1kHz sample rate.
         # mp3 and ogg_opus are returned directly by the API
-        return self.get_tts_audio_base_post_request(full_url, json=data, headers=headers)
+        return audio
+
+    def get_tts_audio(self, text, voice_key, options):
+        full_url, data, headers, audio_format = self.get_tts_request(text, voice_key, options)
+        audio = self.get_tts_audio_base_post_request(full_url, audio_format=audio_format, json=data, headers=headers)
+        return self.process_tts_audio(audio, audio_format)
+
+    async def get_tts_audio_async(self, text, voice_key, options):
+        full_url, data, headers, audio_format = self.get_tts_request(text, voice_key, options)
+        audio = await self.get_tts_audio_base_post_request_async(full_url, audio_format=audio_format, json=data, headers=headers)
+        return self.process_tts_audio(audio, audio_format)
+
+    def stream_tts_audio(self, text, voice_key, options):
+        # https://elevenlabs.io/docs/api-reference/text-to-speech/stream
+        full_url, data, headers, audio_format = self.get_tts_request(text, voice_key, options, url_suffix='/stream')
+        if audio_format == cloudlanguagetools.options.AudioFormat.wav:
+            # the wav header needs the total length, which isn't known until the end
+            yield from super().stream_tts_audio(text, voice_key, options)
+            return
+        yield from self.stream_tts_audio_base_post_request(full_url, json=data, headers=headers)
 
 
 
@@ -170,7 +195,7 @@ class ElevenLabsService(cloudlanguagetools.service.Service):
         """Common function to retrieve models and filtered voices data."""
         # first, get all models to get list of languages
         url = "https://api.elevenlabs.io/v1/models"
-        response = requests.get(url, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout)
+        response = self.http_get(url, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout)
         response.raise_for_status()
         model_data = response.json()
 
@@ -182,7 +207,7 @@ class ElevenLabsService(cloudlanguagetools.service.Service):
         # Note: The category=premade filter doesn't work on the API side, so we filter client-side
         url = "https://api.elevenlabs.io/v1/voices?category=premade"
 
-        response = requests.get(url, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout)
+        response = self.http_get(url, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout)
         response.raise_for_status()
 
         data = response.json()
@@ -36,7 +36,7 @@ class EpitranService(cloudlanguagetools.service.Service):
 
     def post_request(self, text, language_code, endpoint):
         query_url = self.base_url + endpoint
-        response = requests.post(query_url, 
+        response = self.http_post(query_url, 
             json={'text': text, 'language_code': language_code}, 
             timeout=cloudlanguagetools.constants.RequestTimeout)
         response.raise_for_status()
@@ -44,6 +44,14 @@ class EpitranService(cloudlanguagetools.service.Service):
         response_data = response.json()        
         return response_data
 
+    async def post_request_async(self, text, language_code, endpoint):
+        query_url = self.base_url + endpoint
+        response = await self.http_post_async(query_url, 
+            json={'text': text, 'language_code': language_code}, 
+            timeout=cloudlanguagetools.constants.RequestTimeout)
+        response.raise_for_status()
+        return response.json()
+
     def get_tts_voice_list(self):
         return []
 
@@ -115,3 +123,7 @@ class EpitranService(cloudlanguagetools.service.Service):
         language_code = transliteration_key['language_code']
         result = self.post_request(text, language_code, '/epitran/v1/transliterate')
         return result
+
+    async def get_transliteration_async(self, text, transliteration_key):
+        language_code = transliteration_key['language_code']
+        return await self.post_request_async(text, language_code, '/epitran/v1/transliterate')
@@ -2,18 +2,20 @@ import json
 import requests
 import urllib
 import urllib3
-import tempfile
 import logging
 import os
 import pprint
+import contextlib
 
 import cloudlanguagetools.service
+import cloudlanguagetools.audioresult
 import cloudlanguagetools.constants
 import cloudlanguagetools.languages
 import cloudlanguagetools.ttsvoice
 import cloudlanguagetools.translationlanguage
 import cloudlanguagetools.transliterationlanguage
 import cloudlanguagetools.errors
+import cloudlanguagetools.options
 
 GENDER_MAP = {
     cloudlanguagetools.constants.Gender.Male: 'm',
@@ -70,8 +72,7 @@ class ForvoService(cloudlanguagetools.service.Service):
         # forvo uses cloudflare or something equivalent
         return {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:85.0) Gecko/20100101 Firefox/85.0'}
 
-    def get_tts_audio(self, text, voice_key, options):
-
+    def get_pronunciations_url(self, text, voice_key):
         language = voice_key['language_code']
 
         sex_param = ''
@@ -89,48 +90,54 @@ class ForvoService(cloudlanguagetools.service.Service):
 
         encoded_text = urllib.parse.quote(text)
 
-        url = f'{self.url_base}/key/{self.key}/format/json/action/word-pronunciations/word/{encoded_text}/language/{language}{sex_param}{username_param}/order/rate-desc/limit/1{country_code}'
+        return f'{self.url_base}/key/{self.key}/format/json/action/word-pronunciations/word/{encoded_text}/language/{language}{sex_param}{username_param}/order/rate-desc/limit/1{country_code}'
 
-        try:
-            response = requests.get(url, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout,
-                                    verify=self.verify_ssl)
-            logger.info(f'forvo response status={response.status_code} url={response.url} content={response.content}')
-            if response.url == 'https://forvo.com/404':
-                error_message = f"Pronunciation not found in Forvo for word [{text}], language={language}, country={voice_key['country_code']}"
-                raise cloudlanguagetools.errors.NotFoundError(error_message)
-            if response.status_code == 414:
-                raise cloudlanguagetools.errors.InputError(f'Forvo: text too long')
-            response.raise_for_status()
+    def process_pronunciations_response(self, response, text, voice_key):
+        """returns the url of the audio file"""
+        language = voice_key['language_code']
+        logger.info(f'forvo response status={response.status_code} url={response.url} content={response.content}')
+        if response.url == 'https://forvo.com/404':
+            error_message = f"Pronunciation not found in Forvo for word [{text}], language={language}, country={voice_key['country_code']}"
+            raise cloudlanguagetools.errors.NotFoundError(error_message)
+        if response.status_code == 414:
+            raise cloudlanguagetools.errors.InputError(f'Forvo: text too long')
+        response.raise_for_status()
 
+        try:
             data = response.json()
-            # forvo sometimes returns an unexpected json shape (e.g. a bare bool or list)
-            # instead of the documented {"items": [...]} object. log it so we can identify
-            # the root cause instead of failing with an opaque TypeError.
-            if not isinstance(data, dict) or 'items' not in data:
-                logger.error(f'unexpected forvo response shape for word [{text}], language={language}, '
-                             f'country={voice_key["country_code"]}: status={response.status_code} '
-                             f'url={response.url} type={type(data).__name__} data={data!r} '
-                             f'raw_content={response.content!r}')
-                raise cloudlanguagetools.errors.RequestError('Unable to retrieve audio from Forvo')
-            items = data['items']
-            if len(items) == 0:
-                error_message = f"Pronunciation not found in Forvo for word [{text}], language={language}, country={voice_key['country_code']}"
-                raise cloudlanguagetools.errors.NotFoundError(error_message)
-            audio_url = items[0]['pathmp3']
-            output_temp_file = tempfile.NamedTemporaryFile()
-            output_temp_filename = output_temp_file.name
-            audio_request = requests.get(audio_url, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout,
-                                         verify=self.verify_ssl)
-            audio_request.raise_for_status()
-
-            # Check content type to ensure we received audio
-            content_type = audio_request.headers.get('Content-Type', '')
-            if content_type != 'audio/mpeg':
-                logger.error(f'unexpected content type from forvo audio request: {content_type!r}, content: {audio_request.content!r}')
-                raise cloudlanguagetools.errors.RequestError(f'Unexpected content type from Forvo: {content_type}')
-
-            open(output_temp_filename, 'wb').write(audio_request.content)
-            return output_temp_file
+        except json.decoder.JSONDecodeError as exception:
+            logger.warning(f'could not decode json response from forvo: {response.content}')
+            raise cloudlanguagetools.errors.RequestError('Unable to retrieve audio from Forvo') from exception
+        # forvo sometimes returns an unexpected json shape (e.g. a bare bool or list)
+        # instead of the documented {"items": [...]} object. log it so we can identify
+        # the root cause instead of failing with an opaque TypeError.
+        if not isinstance(data, dict) or 'items' not in data:
+            logger.error(f'unexpected forvo response shape for word [{text}], language={language}, '
+                         f'country={voice_key["country_code"]}: status={response.status_code} '
+                         f'url={response.url} type={type(data).__name__} data={data!r} '
+                         f'raw_content={response.content!r}')
+            raise cloudlanguagetools.errors.RequestError('Unable to retrieve audio from Forvo')
+        items = data['items']
+        if len(items) == 0:
+            error_message = f"Pronunciation not found in Forvo for word [{text}], language={language}, country={voice_key['country_code']}"
+            raise cloudlanguagetools.errors.NotFoundError(error_message)
+        return items[0]['pathmp3']
+
+    def process_audio_response(self, audio_request):
+        audio_request.raise_for_status()
+
+        # Check content type to ensure we received audio
+        content_type = audio_request.headers.get('Content-Type', '')
+        if content_type != 'audio/mpeg':
+            logger.error(f'unexpected content type from forvo audio request: {content_type!r}, content: {audio_request.content!r}')
+            raise cloudlanguagetools.errors.RequestError(f'Unexpected content type from Forvo: {content_type}')
+
+        return cloudlanguagetools.audioresult.AudioResult(audio_request.content, audio_format=cloudlanguagetools.options.AudioFormat.mp3)
+
+    @contextlib.contextmanager
+    def tts_audio_errors(self):
+        try:
+            yield
         except requests.exceptions.Timeout as exception:
             raise cloudlanguagetools.errors.TimeoutError(f'timeout while retrieving forvo audio') from exception
         except requests.exceptions.ConnectionError as exception:
@@ -145,15 +152,29 @@ class ForvoService(cloudlanguagetools.service.Service):
         except cloudlanguagetools.errors.RequestError as exception:
             # already logged with full context above, don't re-wrap and lose the message
             raise
-        # handle json decode error
-        except json.decoder.JSONDecodeError as exception:
-            logger.warning(f'could not decode json response from forvo: {response.content}')
-            raise cloudlanguagetools.errors.RequestError('Unable to retrieve audio from Forvo') from exception
         except Exception as exception:
             # make sure not to leak url and key
             logger.warning(f'could not retrieve forvo audio: {str(exception)}')
             raise cloudlanguagetools.errors.RequestError('Unable to retrieve audio from Forvo') from exception
 
+    def get_tts_audio(self, text, voice_key, options):
+        with self.tts_audio_errors():
+            response = self.http_get(self.get_pronunciations_url(text, voice_key), headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout,
+                                     verify=self.verify_ssl)
+            audio_url = self.process_pronunciations_response(response, text, voice_key)
+            audio_request = self.http_get(audio_url, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout,
+                                          verify=self.verify_ssl)
+            return self.process_audio_response(audio_request)
+
+    async def get_tts_audio_async(self, text, voice_key, options):
+        with self.tts_audio_errors():
+            response = await self.http_get_async(self.get_pronunciations_url(text, voice_key), headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout,
+                                                 verify=self.verify_ssl)
+            audio_url = self.process_pronunciations_response(response, text, voice_key)
+            audio_request = await self.http_get_async(audio_url, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout,
+                                                      verify=self.verify_ssl)
+            return self.process_audio_response(audio_request)
+
 
     def get_language_enum(self, language_id):
         forvo_language_id_map = {
@@ -332,8 +353,8 @@ class ForvoService(cloudlanguagetools.service.Service):
 
         # https://api.forvo.com/documentation/word-pronunciations/
         url = f'{self.url_base}/key/{self.key}/format/json/action/language-list/min-pronunciations/5000'
-        response = requests.get(url, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout,
-                                    verify=self.verify_ssl)
+        response = self.http_get(url, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout,
+                                 verify=self.verify_ssl)
         if response.status_code == 200:
             data = response.json()
             languages = data['items']
@@ -1,13 +1,12 @@
 import json
 import requests
-import tempfile
 import logging
 import time
-import os
-
-from pydub import AudioSegment
 
 import cloudlanguagetools.service
+import cloudlanguagetools.audioresult
+import cloudlanguagetools.transcoding
+import cloudlanguagetools.concurrency
 import cloudlanguagetools.constants
 import cloudlanguagetools.options
 import cloudlanguagetools.languages
@@ -70,14 +69,8 @@ class FptAiService(cloudlanguagetools.service.Service):
         raise cloudlanguagetools.errors.RequestError('not supported')
 
 
-    def get_tts_audio(self, text, voice_key, options):
-        # Get the requested audio format from options
-        audio_format = options.get('audio_format', 'mp3')
-        
-        # Create temporary WAV file to store the initial response
-        wav_temp_file = tempfile.NamedTemporaryFile(prefix='cloudlanguagetools_fptai_', suffix='.wav', delete=False)
-        wav_temp_filename = wav_temp_file.name
-
+    def get_tts_request(self, text, voice_key, options):
+        """returns (url, headers, data)"""
         api_url = "https://mkp-api.fptcloud.com/v1/audio/speech"
         
         headers = {
@@ -95,55 +88,46 @@ class FptAiService(cloudlanguagetools.service.Service):
         speed = options.get('speed', FPTAI_VOICE_SPEED_DEFAULT)
         if speed != FPTAI_VOICE_SPEED_DEFAULT:
             data['speed'] = speed
-            
-        response = requests.post(api_url, headers=headers, json=data, 
-            timeout=cloudlanguagetools.constants.RequestTimeout)
+        return api_url, headers, data
+
+    def process_tts_audio_response(self, response, options):
+        """returns the audio and the format to convert it to, None if it doesn't need to be converted"""
+        # Get the requested audio format from options
+        audio_format = options.get('audio_format', 'mp3')
 
         if response.status_code == 200:
             # The API returns WAV audio directly
-            with open(wav_temp_filename, 'wb') as audio:
-                audio.write(response.content)
-            
+            audio = cloudlanguagetools.audioresult.AudioResult(response.content, audio_format=AudioFormat.wav)
             # If WAV format is requested, return as-is
             if audio_format == 'wav':
-                output_temp_file = tempfile.NamedTemporaryFile(prefix='cloudlanguagetools_fptai_', suffix='.wav')
-                with open(wav_temp_filename, 'rb') as src:
-                    output_temp_file.write(src.read())
-                output_temp_file.seek(0)
-                os.unlink(wav_temp_filename)
-                return output_temp_file
-            
-            # For other formats, convert using pydub
-            audio_segment = AudioSegment.from_wav(wav_temp_filename)
-            
-            if audio_format == 'ogg_opus':
-                # Convert to OGG Opus
-                output_temp_file = tempfile.NamedTemporaryFile(prefix='cloudlanguagetools_fptai_', suffix='.ogg', delete=False)
-                audio_segment.export(output_temp_file.name, format="ogg", codec="libopus")
-                suffix = '.ogg'
-            else:  # Default to MP3
-                # Convert to MP3
-                output_temp_file = tempfile.NamedTemporaryFile(prefix='cloudlanguagetools_fptai_', suffix='.mp3', delete=False)
-                audio_segment.export(output_temp_file.name, format="mp3")
-                suffix = '.mp3'
-            
-            # Clean up the intermediate WAV file
-            os.unlink(wav_temp_filename)
-            
-            # Reopen as NamedTemporaryFile for compatibility with existing code
-            final_temp_file = tempfile.NamedTemporaryFile(prefix='cloudlanguagetools_fptai_', suffix=suffix)
-            with open(output_temp_file.name, 'rb') as src:
-                final_temp_file.write(src.read())
-            final_temp_file.seek(0)
-            
-            # Clean up the intermediate output file
-            os.unlink(output_temp_file.name)
-            
-            return final_temp_file
+                return audio, None
+
+            # Convert to OGG Opus, default to MP3
+            target_format = AudioFormat.ogg_opus if audio_format == 'ogg_opus' else AudioFormat.mp3
+            return audio, target_format
 
         error_message = f'could not retrieve FPT.AI audio: {response.content}'
         raise cloudlanguagetools.errors.RequestError(error_message)
 
+    def get_tts_audio(self, text, voice_key, options):
+        api_url, headers, data = self.get_tts_request(text, voice_key, options)
+        response = self.http_post(api_url, headers=headers, json=data, 
+            timeout=cloudlanguagetools.constants.RequestTimeout)
+        audio, target_format = self.process_tts_audio_response(response, options)
+        if target_format is None:
+            return audio
+        return cloudlanguagetools.transcoding.convert(audio, AudioFormat.wav, target_format)
+
+    async def get_tts_audio_async(self, text, voice_key, options):
+        api_url, headers, data = self.get_tts_request(text, voice_key, options)
+        response = await self.http_post_async(api_url, headers=headers, json=data, 
+            timeout=cloudlanguagetools.constants.RequestTimeout)
+        audio, target_format = self.process_tts_audio_response(response, options)
+        if target_format is None:
+            return audio
+        # transcoding runs ffmpeg
+        return await cloudlanguagetools.concurrency.run_blocking(cloudlanguagetools.transcoding.convert, audio, AudioFormat.wav, target_format)
+
 
     def get_tts_voice_list(self):
         # returns list of TtSVoice
@@ -1,4 +1,3 @@
-import tempfile
 import logging
 import pprint
 from typing import List
@@ -8,11 +7,13 @@ import google.cloud.texttospeech
 import google.api_core.exceptions
 
 import cloudlanguagetools.service
+import cloudlanguagetools.audioresult
 import cloudlanguagetools.constants
 import cloudlanguagetools.options
 import cloudlanguagetools.languages
 import cloudlanguagetools.ttsvoice
 import cloudlanguagetools.errors
+import cloudlanguagetools.googleclient
 from cloudlanguagetools.languages import AudioLanguage
 
 logger = logging.getLogger(__name__)
@@ -196,16 +197,22 @@ def build_tts_voice_v3(voice_name, description, gender):
 class GeminiService(cloudlanguagetools.service.Service):
     def __init__(self):
         self.service = cloudlanguagetools.constants.Service.Gemini
+        self.tts_clients = cloudlanguagetools.googleclient.ClientPool(self.create_client,
+            size=cloudlanguagetools.googleclient.GRPC_CLIENT_POOL_SIZE)
 
     def configure(self, config):
-        # we rely on os.environ['GOOGLE_APPLICATION_CREDENTIALS'] from the Google service
-        pass
+        # configured with the Google service account key, see serviceregistry.SHARED_CONFIG
+        # note: temp file needs to be a member so it doesn't get collected
+        self.google_key_temp_file = cloudlanguagetools.googleclient.write_credentials(config)
 
-    def get_client(self):
+    def create_client(self):
         return google.cloud.texttospeech.TextToSpeechClient(
             client_options=ClientOptions(api_endpoint='texttospeech.googleapis.com')
         )
 
+    def get_client(self):
+        return self.tts_clients.get()
+
     def get_tts_voice_list(self):
         return get_tts_voice_list()
 
@@ -234,9 +241,8 @@ class GeminiService(cloudlanguagetools.service.Service):
             cloudlanguagetools.options.AudioFormat.wav: google.cloud.texttospeech.AudioEncoding.LINEAR16,
         }
 
+        client = self.get_client()
         try:
-            client = self.get_client()
-
             voice = google.cloud.texttospeech.VoiceSelectionParams(
                 language_code=language_code,
                 name=voice_name,
@@ -260,11 +266,7 @@ class GeminiService(cloudlanguagetools.service.Service):
                 timeout=cloudlanguagetools.constants.RequestTimeoutLong
             )
 
-            output_temp_file = tempfile.NamedTemporaryFile()
-            with open(output_temp_file.name, "wb") as out:
-                out.write(response.audio_content)
-
-            return output_temp_file
+            return cloudlanguagetools.audioresult.AudioResult(response.audio_content, audio_format=audio_format)
 
         except google.api_core.exceptions.DeadlineExceeded as deadline_exceeded_exception:
             logger.warning(f'Gemini TTS deadline exceeded: {deadline_exceeded_exception}')
@@ -284,5 +286,6 @@ class GeminiService(cloudlanguagetools.service.Service):
             logger.warning(f'Gemini TTS invalid argument: {e}, code: {e.code}')
             raise cloudlanguagetools.errors.InputError(f'Gemini TTS error: {str(e)}') from e
         except google.api_core.exceptions.GoogleAPICallError as e:
+            self.tts_clients.discard(client, e)
             logger.warning(f'Gemini TTS error: {e}, code: {e.code}')
             raise cloudlanguagetools.errors.RequestError(f'Gemini TTS error: {str(e)}') from e
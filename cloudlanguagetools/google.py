@@ -1,17 +1,17 @@
-import os
-import tempfile
 import html
-import base64
 import logging
 import pprint
 import google.cloud.texttospeech
-import google.cloud.translate_v2
 import google.api_core.exceptions
 import cloudlanguagetools.service
+import cloudlanguagetools.audioresult
 import cloudlanguagetools.constants
 import cloudlanguagetools.options
 import cloudlanguagetools.languages
+import cloudlanguagetools.ttsvoice
+import cloudlanguagetools.translationlanguage
 import cloudlanguagetools.errors
+import cloudlanguagetools.googleclient
 
 logger = logging.getLogger(__name__)
 
@@ -132,28 +132,26 @@ class GoogleTranslationLanguage(cloudlanguagetools.translationlanguage.Translati
 
 
 class GoogleService(cloudlanguagetools.service.Service):
+    # translate v2 limits: 128 text segments, 30,000 codepoints per request
+    TRANSLATION_BATCH_MAX_ITEMS = 128
+    TRANSLATION_BATCH_MAX_CHARACTERS = 30000
+    # 5000 bytes of input per request, up to 3 bytes per character in CJK languages
+    TTS_MAX_CHARACTERS = 1500
+
     def __init__(self):
-        pass
+        self.tts_clients = cloudlanguagetools.googleclient.ClientPool(google.cloud.texttospeech.TextToSpeechClient,
+            size=cloudlanguagetools.googleclient.GRPC_CLIENT_POOL_SIZE)
+        self.translation_clients = cloudlanguagetools.googleclient.ClientPool(cloudlanguagetools.googleclient.create_translation_client)
 
     def configure(self, config):
-        data_bytes = base64.b64decode(config['key'])
-        data_str = data_bytes.decode('utf-8')    
-        # write to file
         # note: temp file needs to be a member so it doesn't get collected
-        self.google_key_temp_file = tempfile.NamedTemporaryFile()  
-        google_key_filename = self.google_key_temp_file.name
-        with open(google_key_filename, 'w') as f:
-            f.write(data_str)    
-            f.close()
-        os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = google_key_filename
+        self.google_key_temp_file = cloudlanguagetools.googleclient.write_credentials(config)
 
     def get_client(self):
-        client = google.cloud.texttospeech.TextToSpeechClient()
-        return client
+        return self.tts_clients.get()
 
     def get_translation_client(self):
-        translate_client = google.cloud.translate_v2.Client()
-        return translate_client
+        return self.translation_clients.get()
 
     def get_tts_audio(self, text, voice_key, options):
         audio_format_str = options.get(cloudlanguagetools.options.AUDIO_FORMAT_PARAMETER, cloudlanguagetools.options.AudioFormat.mp3.name)
@@ -165,10 +163,8 @@ class GoogleService(cloudlanguagetools.service.Service):
             cloudlanguagetools.options.AudioFormat.wav: google.cloud.texttospeech.AudioEncoding.LINEAR16
         }
 
+        client = self.get_client()
         try:
-            client = self.get_client()
-
-
             # Note: the voice can also be specified by name.
             # Names of voices can be retrieved with client.list_voices().
             voice = google.cloud.texttospeech.VoiceSelectionParams(
@@ -212,12 +208,7 @@ class GoogleService(cloudlanguagetools.service.Service):
             )
 
             # The response's audio_content is binary.
-            output_temp_file = tempfile.NamedTemporaryFile()
-            output_temp_filename = output_temp_file.name
-            with open(output_temp_filename, "wb") as out:
-                out.write(response.audio_content)
-
-            return output_temp_file
+            return cloudlanguagetools.audioresult.AudioResult(response.audio_content, audio_format=audio_format)
         except google.api_core.exceptions.DeadlineExceeded as deadline_exceeded_exception:
             logger.warning(f'Google Cloud TTS deadline exceeded: {deadline_exceeded_exception}')
             error_message = f'Google Cloud TTS timed out: {str(deadline_exceeded_exception)}'
@@ -239,6 +230,7 @@ class GoogleService(cloudlanguagetools.service.Service):
             error_message = f'Google Cloud TTS error: {str(invalid_argument_error)}'
             raise cloudlanguagetools.errors.InputError(error_message) from invalid_argument_error
         except google.api_core.exceptions.GoogleAPICallError as api_error:
+            self.tts_clients.discard(client, api_error)
             logger.warning(f'Google Cloud TTS error: {api_error}, code: {api_error.code}, details: {api_error.details}, errors: {api_error.errors}')
             error_message = f'Google Cloud TTS error: {str(api_error)}'
             raise cloudlanguagetools.errors.RequestError(error_message) from api_error
@@ -288,15 +280,31 @@ class GoogleService(cloudlanguagetools.service.Service):
         return []
 
     def get_translation(self, text, from_language_key, to_language_key):
+        client = self.get_translation_client()
         try:
-            client = self.get_translation_client()
             result = client.translate(text, source_language=from_language_key, target_language=to_language_key)
             return html.unescape(result["translatedText"])
         except google.api_core.exceptions.BadRequest as error:
-            raise cloudlanguagetools.errors.RequestError(str(error)) from error
+            # the texts were rejected
+            raise cloudlanguagetools.errors.InputError(str(error)) from error
+        except google.api_core.exceptions.GoogleAPICallError as error:
+            self.translation_clients.discard(client, error)
+            raise
+
+    def get_translation_batch(self, texts, from_language_key, to_language_key):
+        client = self.get_translation_client()
+        try:
+            results = client.translate(texts, source_language=from_language_key, target_language=to_language_key)
+            return [html.unescape(result["translatedText"]) for result in results]
+        except google.api_core.exceptions.BadRequest as error:
+            # the texts were rejected
+            raise cloudlanguagetools.errors.InputError(str(error)) from error
+        except google.api_core.exceptions.GoogleAPICallError as error:
+            self.translation_clients.discard(client, error)
+            raise
 
     def get_translation_languages(self):
-        translate_client = google.cloud.translate_v2.Client()
+        translate_client = self.get_translation_client()
 
         results = translate_client.get_languages()
 
@@ -0,0 +1,88 @@
+import os
+import base64
+import logging
+import tempfile
+import threading
+import itertools
+import requests
+import google.auth
+import google.auth.transport.requests
+import google.api_core.exceptions
+import google.cloud.translate_v2
+
+import cloudlanguagetools.constants
+
+logger = logging.getLogger(__name__)
+
+# number of gRPC clients (each with its own channel) requests are spread over,
+# a single HTTP/2 connection caps the number of concurrent streams
+GRPC_CLIENT_POOL_SIZE = 4
+
+# errors after which the channel or the credentials can't be trusted anymore
+CLIENT_FAILURE_EXCEPTIONS = (
+    google.api_core.exceptions.ServiceUnavailable,
+    google.api_core.exceptions.Unauthenticated,
+    google.api_core.exceptions.Unauthorized,
+)
+
+def write_credentials(config):
+    """write the base64 encoded service account key from config to a temp file, and point the application
+    default credentials at it. the caller must keep a reference to the returned file, it gets deleted when collected"""
+    data_str = base64.b64decode(config['key']).decode('utf-8')
+    key_file = tempfile.NamedTemporaryFile()
+    with open(key_file.name, 'w') as f:
+        f.write(data_str)
+    os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = key_file.name
+    return key_file
+
+def get_credentials_key():
+    """identifies the current application default credentials, changes when configure writes a new key file"""
+    path = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')
+    if path is None:
+        return None
+    try:
+        return path, os.stat(path).st_mtime
+    except OSError:
+        return path, None
+
+def create_translation_client():
+    """translate_v2 client over an authorized session whose connection pool is sized for concurrent use"""
+    credentials, project = google.auth.default(scopes=google.cloud.translate_v2.Client.SCOPE)
+    session = google.auth.transport.requests.AuthorizedSession(credentials)
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=cloudlanguagetools.constants.HttpPoolSize)
+    session.mount('https://', adapter)
+    return google.cloud.translate_v2.Client(_http=session)
+
+
+class ClientPool():
+    """long-lived google clients, shared across threads (the clients are thread-safe), handed out round-robin.
+    the clients are created on first use, and created again when the credentials change, or when a call failed
+    with one of CLIENT_FAILURE_EXCEPTIONS (see discard)."""
+
+    def __init__(self, factory, size=1):
+        self.factory = factory
+        self.size = size
+        self.lock = threading.Lock()
+        self.clients = None
+        self.credentials_key = None
+        self.cycle = None
+
+    def get(self):
+        credentials_key = get_credentials_key()
+        with self.lock:
+            if self.clients is None or credentials_key != self.credentials_key:
+                if self.clients is not None:
+                    logger.info('credentials changed, creating new clients')
+                self.clients = [self.factory() for i in range(self.size)]
+                self.credentials_key = credentials_key
+                self.cycle = itertools.cycle(self.clients)
+            return next(self.cycle)
+
+    def discard(self, client, exception):
+        """drop the clients after a failure which may have broken the channel, the next call creates new ones"""
+        if not isinstance(exception, CLIENT_FAILURE_EXCEPTIONS):
+            return
+        with self.lock:
+            if self.clients is not None and any(client is x for x in self.clients):
+                logger.warning(f'discarding clients after error: {exception}')
+                self.clients = None
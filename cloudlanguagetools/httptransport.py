@@ -0,0 +1,70 @@
+import os
+import logging
+import threading
+import urllib.parse
+import http.cookiejar
+import requests
+import requests.adapters
+
+import cloudlanguagetools.constants
+
+logger = logging.getLogger(__name__)
+
+# max number of keep-alive connections kept open to a single host
+HTTP_POOL_SIZE_ENV_VAR = 'CLOUDLANGUAGETOOLS_CORE_HTTP_POOL_SIZE'
+
+
+class HttpTransport():
+    """HTTP requests for all the REST services. keeps one requests.Session per host (scheme + host + port),
+    so that connections are reused across requests instead of paying for TCP / TLS setup every time.
+    every request gets a timeout, constants.RequestTimeout unless the caller specifies one."""
+
+    def __init__(self, pool_size=None, timeout=cloudlanguagetools.constants.RequestTimeout):
+        if pool_size is None:
+            pool_size = int(os.environ.get(HTTP_POOL_SIZE_ENV_VAR, cloudlanguagetools.constants.HttpPoolSize))
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def create_session(self):
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        # sessions are shared by all callers, don't carry cookies from one request to the next
+        session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        return session
+
+    def get_session(self, url) -> requests.Session:
+        url_parts = urllib.parse.urlsplit(url)
+        host = (url_parts.scheme, url_parts.netloc)
+        with self.lock:
+            session = self.sessions.get(host)
+            if session is None:
+                logger.debug(f'opening http session for {url_parts.scheme}://{url_parts.netloc}')
+                session = self.create_session()
+                self.sessions[host] = session
+            return session
+
+    def request(self, method, url, **kwargs) -> requests.Response:
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return self.get_session(url).request(method, url, **kwargs)
+
+    def get(self, url, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def close(self):
+        with self.lock:
+            sessions = list(self.sessions.values())
+            self.sessions = {}
+        for session in sessions:
+            session.close()
+
+
+# shared by all services
+default_transport = HttpTransport()
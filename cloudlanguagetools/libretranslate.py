@@ -55,7 +55,7 @@ class LibreTranslateService(cloudlanguagetools.service.Service):
             'target': to_language_key
         }
         logger.debug(f'translating using parameters: {data}')
-        response = requests.post(self.BASE_URL + '/translate', data=data, timeout=cloudlanguagetools.constants.RequestTimeout)
+        response = self.http_post(self.BASE_URL + '/translate', data=data, timeout=cloudlanguagetools.constants.RequestTimeout)
         response_data = response.json()        
 
         if response.status_code == 200:
@@ -70,7 +70,7 @@ class LibreTranslateService(cloudlanguagetools.service.Service):
     def get_translation_language_list(self):
         result = []
 
-        response = requests.get(self.BASE_URL + '/languages', timeout=cloudlanguagetools.constants.RequestTimeout)
+        response = self.http_get(self.BASE_URL + '/languages', timeout=cloudlanguagetools.constants.RequestTimeout)
         language_list = response.json()
         for language in language_list:
             try:
@@ -1,7 +1,9 @@
 import json
 import requests
 import cloudlanguagetools.constants
+import cloudlanguagetools.service
 import cloudlanguagetools.languages
+import cloudlanguagetools.transliterationlanguage
 import pinyin_jyutping
 
 
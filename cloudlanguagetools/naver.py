@@ -1,12 +1,12 @@
 import json
 import requests
-import tempfile
 import logging
 import uuid
 import operator
 import pydub
 
 import cloudlanguagetools.service
+import cloudlanguagetools.audioresult
 import cloudlanguagetools.constants
 import cloudlanguagetools.languages
 import cloudlanguagetools.ttsvoice
@@ -80,7 +80,8 @@ class NaverService(cloudlanguagetools.service.Service):
         self.papago_translation_client_id = config['papago_translation_client_id']
         self.papago_translation_client_secret = config['papago_translation_client_secret']
 
-    def get_translation(self, text, from_language_key, to_language_key):
+    def get_translation_request(self, text, from_language_key, to_language_key):
+        """returns (url, data, headers)"""
         url = 'https://papago.apigw.ntruss.com/nmt/v1/translation'
         headers = {
             'X-NCP-APIGW-API-KEY-ID': self.papago_translation_client_id,
@@ -92,9 +93,9 @@ class NaverService(cloudlanguagetools.service.Service):
             'source': from_language_key,
             'target': to_language_key
         }
+        return url, data, headers
 
-        # alternate_data = 'speaker=clara&text=vehicle&volume=0&speed=0&pitch=0&format=mp3'
-        response = requests.post(url, json=data, headers=headers, timeout=cloudlanguagetools.constants.RequestTimeout)
+    def process_translation_response(self, response):
         if response.status_code == 200:
             response_data = response.json()
             return response_data['message']['result']['translatedText']
@@ -102,8 +103,19 @@ class NaverService(cloudlanguagetools.service.Service):
         error_message = f'Status code: {response.status_code}: {response.content}'
         raise cloudlanguagetools.errors.RequestError(error_message)
 
+    def get_translation(self, text, from_language_key, to_language_key):
+        url, data, headers = self.get_translation_request(text, from_language_key, to_language_key)
+        # alternate_data = 'speaker=clara&text=vehicle&volume=0&speed=0&pitch=0&format=mp3'
+        response = self.http_post(url, json=data, headers=headers, timeout=cloudlanguagetools.constants.RequestTimeout)
+        return self.process_translation_response(response)
+
+    async def get_translation_async(self, text, from_language_key, to_language_key):
+        url, data, headers = self.get_translation_request(text, from_language_key, to_language_key)
+        response = await self.http_post_async(url, json=data, headers=headers, timeout=cloudlanguagetools.constants.RequestTimeout)
+        return self.process_translation_response(response)
 
-    def get_tts_audio(self, text, voice_key, options):
+    def get_tts_request(self, text, voice_key, options):
+        """returns (url, data, headers, audio_format)"""
         response_format_parameter, audio_format = self.get_request_audio_format({
             AudioFormat.mp3: 'mp3',
             AudioFormat.wav: 'wav'
@@ -125,13 +137,11 @@ class NaverService(cloudlanguagetools.service.Service):
         }
         if audio_format == cloudlanguagetools.options.AudioFormat.wav:
             data['sampling-rate'] = 48000
+        return url, data, headers, audio_format
 
-        response = self.post_request(url, data=data, headers=headers)
+    def process_tts_audio_response(self, response, audio_format):
         if response.status_code == 200:
-            output_temp_file = tempfile.NamedTemporaryFile(prefix='clt_audio_')
-            with open(output_temp_file.name, 'wb') as audio:
-                audio.write(response.content)
-            return output_temp_file
+            return cloudlanguagetools.audioresult.AudioResult(response.content, audio_format=audio_format)
 
         # parse Naver-specific error response
         try:
@@ -145,6 +155,16 @@ class NaverService(cloudlanguagetools.service.Service):
             raise cloudlanguagetools.errors.RequestError(
                 f'Naver audio request failed with status code {response.status_code}: {response.content}')
 
+    def get_tts_audio(self, text, voice_key, options):
+        url, data, headers, audio_format = self.get_tts_request(text, voice_key, options)
+        response = self.post_request(url, data=data, headers=headers)
+        return self.process_tts_audio_response(response, audio_format)
+
+    async def get_tts_audio_async(self, text, voice_key, options):
+        url, data, headers, audio_format = self.get_tts_request(text, voice_key, options)
+        response = await self.post_request_async(url, data=data, headers=headers)
+        return self.process_tts_audio_response(response, audio_format)
+
     def get_tts_voice_list(self):
         # returns list of TtSVoice
         # https://api.ncloud-docs.com/docs/en/ai-naver-clovavoice-ttspremium#%EC%9D%8C%EC%84%B1%ED%95%A9%EC%84%B1%EB%AA%A9%EC%86%8C%EB%A6%AC%EB%AA%A9%EB%A1%9D
@@ -2,16 +2,17 @@ from openai import OpenAI
 
 import copy
 import logging
-import tempfile
-import pydub
 import pprint
 from typing import List
 
 import cloudlanguagetools.constants
 import cloudlanguagetools.service
+import cloudlanguagetools.audioresult
+import cloudlanguagetools.transcoding
 import cloudlanguagetools.constants
 import cloudlanguagetools.languages
 import cloudlanguagetools.options
+import cloudlanguagetools.ttsvoice
 
 from cloudlanguagetools.languages import AudioLanguage
 from cloudlanguagetools.options import AudioFormat
@@ -161,6 +162,9 @@ class OpenAIVoice(cloudlanguagetools.ttsvoice.TtsVoice):
         return VOICE_OPTIONS
 
 class OpenAIService(cloudlanguagetools.service.Service):
+    # speech API input limit
+    TTS_MAX_CHARACTERS = 4096
+
     def __init__(self):
         self.chatbot_model = "gpt-3.5-turbo"
 
@@ -198,16 +202,12 @@ class OpenAIService(cloudlanguagetools.service.Service):
 
     def speech_to_text(self, filepath, audio_format: cloudlanguagetools.options.AudioFormat):
 
+        audio = cloudlanguagetools.audioresult.AudioResult.from_file(filepath, audio_format=audio_format)
         if audio_format in [cloudlanguagetools.options.AudioFormat.ogg_opus, cloudlanguagetools.options.AudioFormat.ogg_vorbis]:
             # need to convert to wav first
-            sound = pydub.AudioSegment.from_ogg(filepath)
-            wav_tempfile = tempfile.NamedTemporaryFile(prefix='cloudlanguagetools_OpenAI_speech_to_text', suffix='.wav')
-            sound.export(wav_tempfile.name, format="wav")
-            filepath = wav_tempfile.name
-
-        logger.debug(f'opening file {filepath}')
-        audio_file= open(filepath, "rb")
-        transcript = self.client.audio.transcriptions.create(model="whisper-1", file=audio_file)
+            audio = cloudlanguagetools.transcoding.convert(audio, audio_format, cloudlanguagetools.options.AudioFormat.wav)
+
+        transcript = self.client.audio.transcriptions.create(model="whisper-1", file=(f'audio{audio.suffix}', audio.bytes))
         return transcript.text
     
     def get_default_model(self, voice_name):
@@ -253,11 +253,10 @@ class OpenAIService(cloudlanguagetools.service.Service):
         ]
         return result
 
-    def get_tts_audio(self, text, voice_key, options):
+    def get_tts_audio_parameters(self, text, voice_key, options):
+        """returns (parameters for audio.speech.create, audio_format)"""
         # https://platform.openai.com/docs/guides/text-to-speech
         # https://platform.openai.com/docs/api-reference/audio/createSpeech?lang=python
-        
-        output_temp_file = tempfile.NamedTemporaryFile()
 
         voice_name = voice_key['name']
         speed = options.get('speed', DEFAULT_TTS_SPEED)
@@ -282,11 +281,23 @@ class OpenAIService(cloudlanguagetools.service.Service):
             audio_parameters['instructions'] = instructions
 
         logger.debug(f'audio_parameters: {pprint.pformat(audio_parameters)}')
+        return audio_parameters, audio_format
+
+    def get_tts_audio(self, text, voice_key, options):
+        audio_parameters, audio_format = self.get_tts_audio_parameters(text, voice_key, options)
 
         response = self.client.audio.speech.create(
             **audio_parameters,
             timeout=cloudlanguagetools.constants.RequestTimeout
         )
-        response.write_to_file(output_temp_file.name)
 
-        return output_temp_file
+        return cloudlanguagetools.audioresult.AudioResult(response.content, audio_format=audio_format)
+
+    def stream_tts_audio(self, text, voice_key, options):
+        audio_parameters, audio_format = self.get_tts_audio_parameters(text, voice_key, options)
+
+        with self.client.audio.speech.with_streaming_response.create(
+            **audio_parameters,
+            timeout=cloudlanguagetools.constants.RequestTimeout
+        ) as response:
+            yield from response.iter_bytes(chunk_size=cloudlanguagetools.constants.AudioStreamChunkSize)
@@ -7,6 +7,8 @@ import cloudlanguagetools.service
 import cloudlanguagetools.constants
 import cloudlanguagetools.languages
 import cloudlanguagetools.tokenization
+import cloudlanguagetools.transliterationlanguage
+import cloudlanguagetools.errors
 
 class PyThaiNLPTransliterationMode(enum.Enum):
     Romanization = enum.auto()
@@ -59,12 +61,27 @@ class PyThaiNLPService(cloudlanguagetools.service.Service):
 
     def post_request(self, text, endpoint):
         query_url = self.base_url + endpoint
-        response = requests.post(query_url, json={'text': text}, timeout=cloudlanguagetools.constants.RequestTimeout)
+        response = self.http_post(query_url, json={'text': text}, timeout=cloudlanguagetools.constants.RequestTimeout)
         response.raise_for_status()
 
         response_data = response.json()        
         return response_data
 
+    async def post_request_async(self, text, endpoint):
+        query_url = self.base_url + endpoint
+        response = await self.http_post_async(query_url, json={'text': text}, timeout=cloudlanguagetools.constants.RequestTimeout)
+        response.raise_for_status()
+        return response.json()
+
+    def get_transliteration_endpoint(self, transliteration_key):
+        # todo: support IPA
+        mode = PyThaiNLPTransliterationMode[transliteration_key['mode']]
+
+        if mode ==  PyThaiNLPTransliterationMode.Romanization:
+            return '/pythainlp/v1/romanize'
+        elif mode == PyThaiNLPTransliterationMode.IPA:
+            return '/pythainlp/v1/transliterate'
+
     def get_transliteration_language_list(self):
         result = [
             PyThaiNLPTransliterationLanguage(PyThaiNLPTransliterationMode.Romanization),
@@ -73,26 +90,33 @@ class PyThaiNLPService(cloudlanguagetools.service.Service):
         return result
 
     def get_transliteration(self, text, transliteration_key):
-        # todo: support IPA
-        mode = PyThaiNLPTransliterationMode[transliteration_key['mode']]
+        endpoint = self.get_transliteration_endpoint(transliteration_key)
+        if endpoint is not None:
+            return self.post_request(text, endpoint)
 
-        if mode ==  PyThaiNLPTransliterationMode.Romanization:
-            return self.post_request(text, '/pythainlp/v1/romanize')
-        elif mode == PyThaiNLPTransliterationMode.IPA:
-            return self.post_request(text, '/pythainlp/v1/transliterate')
+    async def get_transliteration_async(self, text, transliteration_key):
+        endpoint = self.get_transliteration_endpoint(transliteration_key)
+        if endpoint is not None:
+            return await self.post_request_async(text, endpoint)
 
-    def get_tokenization(self, text, tokenization_key):
+    def check_tokenization_mode(self, tokenization_key):
         mode = PyThaiNLPTokenizationMode[tokenization_key['mode']]
-        
-        if mode == PyThaiNLPTokenizationMode.Default:
-            tokens = self.post_request(text, '/pythainlp/v1/word_tokenize')
-            tokens = [token for token in tokens if not token.isspace()]
-            tokens = [token for token in tokens if not token in string.punctuation]
-            token_entries = [{'token': token, 'lemma': token, 'can_translate': True, 'can_transliterate': True} for token in tokens]
-            return token_entries
-
-        # raise exception
-        raise cloudlanguagetools.errors.RequestError(f'unsupported tokenization mode: {mode.name}')
+        if mode != PyThaiNLPTokenizationMode.Default:
+            raise cloudlanguagetools.errors.RequestError(f'unsupported tokenization mode: {mode.name}')
+
+    def process_tokens(self, tokens):
+        tokens = [token for token in tokens if not token.isspace()]
+        tokens = [token for token in tokens if not token in string.punctuation]
+        token_entries = [{'token': token, 'lemma': token, 'can_translate': True, 'can_transliterate': True} for token in tokens]
+        return token_entries
+
+    def get_tokenization(self, text, tokenization_key):
+        self.check_tokenization_mode(tokenization_key)
+        return self.process_tokens(self.post_request(text, '/pythainlp/v1/word_tokenize'))
+
+    async def get_tokenization_async(self, text, tokenization_key):
+        self.check_tokenization_mode(tokenization_key)
+        return self.process_tokens(await self.post_request_async(text, '/pythainlp/v1/word_tokenize'))
 
 
     def get_tokenization_options(self):
@@ -1,26 +1,148 @@
 import requests
-import tempfile
+import urllib3
 import logging
 import pprint
 import json
-from typing import List, Dict
+import time
+import base64
+import threading
+import contextlib
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 
 import cloudlanguagetools.constants
 import cloudlanguagetools.ttsvoice
 import cloudlanguagetools.options
+import cloudlanguagetools.errors
+import cloudlanguagetools.httptransport
+import cloudlanguagetools.asynchttptransport
+import cloudlanguagetools.concurrency
+import cloudlanguagetools.audioresult
 
 logger = logging.getLogger(__name__)
 
+# a cached token is not used when it expires within this many seconds
+TOKEN_EXPIRY_MARGIN = 30
+# a cached token gets refreshed in the background when it expires within this many seconds
+TOKEN_REFRESH_MARGIN = 120
+
+def get_jwt_expiration(token: str) -> Optional[float]:
+    """returns the exp claim of a JWT, None if the token is not a JWT"""
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))['exp'])
+    except (IndexError, ValueError, KeyError, TypeError):
+        return None
+
+
+class TokenManager():
+    """caches an auth token until shortly before it expires. fetch_function returns (token, expires_at),
+    expires_at being a unix timestamp. once a token gets close to its expiry, it is refreshed in the background
+    while callers keep using it. only one refresh runs at a time."""
+
+    def __init__(self, fetch_function: Callable[[], Tuple[str, float]],
+                 expiry_margin=TOKEN_EXPIRY_MARGIN, refresh_margin=TOKEN_REFRESH_MARGIN):
+        self.fetch_function = fetch_function
+        self.expiry_margin = expiry_margin
+        self.refresh_margin = refresh_margin
+        self.lock = threading.Lock()
+        self.refresh_lock = threading.Lock()
+        self.token = None
+        self.expires_at = 0
+        self.background_refresh = False
+
+    def get_token(self) -> str:
+        now = time.time()
+        with self.lock:
+            if self.token is not None and now < self.expires_at - self.expiry_margin:
+                if now >= self.expires_at - self.refresh_margin and not self.background_refresh:
+                    self.background_refresh = True
+                    threading.Thread(target=self.run_background_refresh, name='clt_token_refresh', daemon=True).start()
+                return self.token
+        # no usable token, callers wait for a single refresh
+        with self.refresh_lock:
+            with self.lock:
+                if self.token is not None and time.time() < self.expires_at - self.expiry_margin:
+                    # refreshed by another caller while we were waiting
+                    return self.token
+            return self.refresh()
+
+    async def get_token_async(self) -> str:
+        """get_token for the async API, only waits on a thread when a token has to be fetched"""
+        with self.lock:
+            usable = self.token is not None and time.time() < self.expires_at - self.expiry_margin
+        if usable:
+            return self.get_token()
+        return await cloudlanguagetools.concurrency.run_blocking(self.get_token)
+
+    def refresh(self) -> str:
+        token, expires_at = self.fetch_function()
+        with self.lock:
+            self.token = token
+            self.expires_at = expires_at
+        logger.debug(f'refreshed token, expires in {expires_at - time.time():.0f}s')
+        return token
+
+    def run_background_refresh(self):
+        try:
+            with self.refresh_lock:
+                with self.lock:
+                    if time.time() < self.expires_at - self.refresh_margin:
+                        # already refreshed
+                        return
+                self.refresh()
+        except Exception as e:
+            # the current token remains usable, an expired token gets refreshed by the next caller
+            logger.warning(f'could not refresh token in the background: {e}')
+        finally:
+            with self.lock:
+                self.background_refresh = False
+
+
 class Service():
+    # services which can translate several texts in a single request set these limits,
+    # and implement get_translation_batch
+    TRANSLATION_BATCH_MAX_ITEMS = None
+    TRANSLATION_BATCH_MAX_CHARACTERS = None
+    # same for transliteration, with get_transliteration_batch
+    TRANSLITERATION_BATCH_MAX_ITEMS = None
+    TRANSLITERATION_BATCH_MAX_CHARACTERS = None
+    # same for dictionary lookups, with get_dictionary_lookup_batch
+    DICTIONARY_LOOKUP_BATCH_MAX_ITEMS = None
+    DICTIONARY_LOOKUP_BATCH_MAX_CHARACTERS = None
+    # services which limit the length of the text in a TTS request set this, texts which are longer than
+    # this get synthesized in segments, see ServiceManager.get_tts_audio
+    TTS_MAX_CHARACTERS = None
+    # all HTTP requests go through this transport, which reuses connections
+    http_transport = cloudlanguagetools.httptransport.default_transport
+    # same for the async API
+    async_http_transport = cloudlanguagetools.asynchttptransport.default_transport
+
     def __init__(self):
         pass
 
     def get_service_name(self):
         return self.service.name
 
+    def http_get(self, url, **kwargs) -> requests.Response:
+        return self.http_transport.get(url, **kwargs)
+
+    def http_post(self, url, **kwargs) -> requests.Response:
+        return self.http_transport.post(url, **kwargs)
+
     def post_request(self, url, **kwargs):
         kwargs['timeout'] = cloudlanguagetools.constants.RequestTimeout
-        return requests.post(url, **kwargs)
+        return self.http_post(url, **kwargs)
+
+    async def http_get_async(self, url, **kwargs) -> cloudlanguagetools.asynchttptransport.AsyncHttpResponse:
+        return await self.async_http_transport.get(url, **kwargs)
+
+    async def http_post_async(self, url, **kwargs) -> cloudlanguagetools.asynchttptransport.AsyncHttpResponse:
+        return await self.async_http_transport.post(url, **kwargs)
+
+    async def post_request_async(self, url, **kwargs):
+        kwargs['timeout'] = cloudlanguagetools.constants.RequestTimeout
+        return await self.http_post_async(url, **kwargs)
 
     def _extract_error_message(self, data):
         """Try common error keys, fall back to full dump."""
@@ -40,25 +162,38 @@ class Service():
         except (ValueError, TypeError):
             return response.text
 
-    def get_tts_audio_base_post_request(self, url, **kwargs):
-        try:
-            kwargs['timeout'] = cloudlanguagetools.constants.RequestTimeout
+    def check_tts_audio_response(self, response):
+        if response.status_code == 429:
+            msg = self._get_response_error_message(response)
+            logger.warning(f'{self.get_service_name()} rate limited (429): {msg} | full response: {response.text}')
+            raise cloudlanguagetools.errors.RateLimitError(f'{self.get_service_name()}: {msg}')
+        if response.status_code >= 400:
+            msg = self._get_response_error_message(response)
+            logger.warning(f'{self.get_service_name()} audio request failed with status code {response.status_code}: {msg} | full response: {response.text}')
+            raise cloudlanguagetools.errors.RequestError(f'{self.get_service_name()}: {msg}')
+        response.raise_for_status()
+
+    def get_tts_audio_base_post_request(self, url, audio_format=None, **kwargs):
+        """post the request, and return the response body as an audioresult.AudioResult"""
+        with self.tts_audio_request_errors():
             logger.debug(f'{self.get_service_name()} TTS request - URL: {url}, kwargs: {pprint.pformat(kwargs)}')
             response = self.post_request(url, **kwargs)
-            if response.status_code == 429:
-                msg = self._get_response_error_message(response)
-                logger.warning(f'{self.get_service_name()} rate limited (429): {msg} | full response: {response.text}')
-                raise cloudlanguagetools.errors.RateLimitError(f'{self.get_service_name()}: {msg}')
-            if response.status_code >= 400:
-                msg = self._get_response_error_message(response)
-                logger.warning(f'{self.get_service_name()} audio request failed with status code {response.status_code}: {msg} | full response: {response.text}')
-                raise cloudlanguagetools.errors.RequestError(f'{self.get_service_name()}: {msg}')
-            response.raise_for_status()
-            output_temp_file = tempfile.NamedTemporaryFile(prefix='clt_audio_')
-            output_temp_filename = output_temp_file.name            
-            with open(output_temp_filename, 'wb') as audio:
-                audio.write(response.content)
-            return output_temp_file            
+            self.check_tts_audio_response(response)
+            return cloudlanguagetools.audioresult.AudioResult(response.content, audio_format=audio_format)
+
+    async def get_tts_audio_base_post_request_async(self, url, audio_format=None, **kwargs):
+        """async version of get_tts_audio_base_post_request"""
+        with self.tts_audio_request_errors():
+            logger.debug(f'{self.get_service_name()} TTS request - URL: {url}, kwargs: {pprint.pformat(kwargs)}')
+            response = await self.post_request_async(url, **kwargs)
+            self.check_tts_audio_response(response)
+            return cloudlanguagetools.audioresult.AudioResult(response.content, audio_format=audio_format)
+
+    @contextlib.contextmanager
+    def tts_audio_request_errors(self):
+        """map the exceptions raised while retrieving audio to errors.TransientError / errors.PermanentError"""
+        try:
+            yield
         except requests.exceptions.ReadTimeout as exception:
             raise cloudlanguagetools.errors.TimeoutError(f'timeout while retrieving {self.get_service_name()} audio') from exception
         except cloudlanguagetools.errors.TransientError:
@@ -69,6 +204,32 @@ class Service():
             error_message = f'could not retrieve audio from {self.get_service_name()}: {str(exception)}'
             raise cloudlanguagetools.errors.RequestError(error_message) from exception
 
+    def stream_tts_audio_base_post_request(self, url, **kwargs) -> Iterator[bytes]:
+        """post the request, and yield the response body in chunks as it arrives"""
+        try:
+            kwargs['timeout'] = cloudlanguagetools.constants.RequestTimeout
+            logger.debug(f'{self.get_service_name()} TTS streaming request - URL: {url}, kwargs: {pprint.pformat(kwargs)}')
+            with self.post_request(url, stream=True, **kwargs) as response:
+                self.check_tts_audio_response(response)
+                for chunk in response.iter_content(chunk_size=cloudlanguagetools.constants.AudioStreamChunkSize):
+                    if len(chunk) > 0:
+                        yield chunk
+        except requests.exceptions.Timeout as exception:
+            raise cloudlanguagetools.errors.TimeoutError(f'timeout while streaming {self.get_service_name()} audio') from exception
+        except requests.exceptions.ConnectionError as exception:
+            # requests wraps urllib3.exceptions.ReadTimeoutError in ConnectionError
+            # when the timeout happens while reading the response body
+            if exception.args and isinstance(exception.args[0], urllib3.exceptions.TimeoutError):
+                raise cloudlanguagetools.errors.TimeoutError(f'timeout while streaming {self.get_service_name()} audio') from exception
+            raise cloudlanguagetools.errors.RequestError(f'could not stream audio from {self.get_service_name()}: {str(exception)}') from exception
+        except cloudlanguagetools.errors.TransientError:
+            raise
+        except cloudlanguagetools.errors.PermanentError:
+            raise
+        except Exception as exception:
+            error_message = f'could not stream audio from {self.get_service_name()}: {str(exception)}'
+            raise cloudlanguagetools.errors.RequestError(error_message) from exception
+
     def get_request_audio_format(self, format_map: Dict, options: Dict, default_format: cloudlanguagetools.options.AudioFormat):
         response_format_str = options.get(cloudlanguagetools.options.AUDIO_FORMAT_PARAMETER, 
             default_format.name)
@@ -80,6 +241,40 @@ class Service():
     def load_data(self):
         pass
 
+    # async API
+    # =========
+    # by default, the blocking method runs on concurrency.blocking_executor. services built on a REST API
+    # override these with an implementation over async_http_transport, which doesn't need a thread.
+
+    async def get_tts_audio_async(self, text, voice_key, options) -> cloudlanguagetools.audioresult.AudioResult:
+        return await cloudlanguagetools.concurrency.run_blocking(self.get_tts_audio, text, voice_key, options)
+
+    async def get_translation_async(self, text, from_language_key, to_language_key):
+        return await cloudlanguagetools.concurrency.run_blocking(self.get_translation, text, from_language_key, to_language_key)
+
+    async def get_translation_batch_async(self, texts: List[str], from_language_key, to_language_key) -> List[str]:
+        return await cloudlanguagetools.concurrency.run_blocking(self.get_translation_batch, texts, from_language_key, to_language_key)
+
+    async def get_transliteration_async(self, text, transliteration_key):
+        return await cloudlanguagetools.concurrency.run_blocking(self.get_transliteration, text, transliteration_key)
+
+    async def get_transliteration_batch_async(self, texts: List[str], transliteration_key) -> List[str]:
+        return await cloudlanguagetools.concurrency.run_blocking(self.get_transliteration_batch, texts, transliteration_key)
+
+    async def get_tokenization_async(self, text, tokenization_key):
+        return await cloudlanguagetools.concurrency.run_blocking(self.get_tokenization, text, tokenization_key)
+
+    async def get_dictionary_lookup_async(self, text, lookup_key):
+        return await cloudlanguagetools.concurrency.run_blocking(self.get_dictionary_lookup, text, lookup_key)
+
+    async def get_dictionary_lookup_batch_async(self, texts: List[str], lookup_key) -> List:
+        return await cloudlanguagetools.concurrency.run_blocking(self.get_dictionary_lookup_batch, texts, lookup_key)
+
+    def stream_tts_audio(self, text, voice_key, options) -> Iterator[bytes]:
+        """yield the audio in chunks as it gets generated. services which support streaming override this,
+        by default the whole audio is yielded as a single chunk once generated."""
+        yield self.get_tts_audio(text, voice_key, options).bytes
+
     def get_tts_voice_list(self):
         return []
 
@@ -100,11 +295,35 @@ class Service():
     def get_translation_language_list(self):
         return []
 
+    def get_translation_batch(self, texts: List[str], from_language_key, to_language_key) -> List[str]:
+        """translate all texts in a single request, returns the translations in the same order.
+        texts are within TRANSLATION_BATCH_MAX_ITEMS / TRANSLATION_BATCH_MAX_CHARACTERS.
+        services without a batch API translate the texts one by one"""
+        return [self.get_translation(text, from_language_key, to_language_key) for text in texts]
+
     def get_transliteration_language_list(self):
         return []
 
+    def get_transliteration_batch(self, texts: List[str], transliteration_key) -> List[str]:
+        """transliterate all texts in a single request, returns the transliterations in the same order.
+        texts are within TRANSLITERATION_BATCH_MAX_ITEMS / TRANSLITERATION_BATCH_MAX_CHARACTERS.
+        services without a batch API transliterate the texts one by one"""
+        return [self.get_transliteration(text, transliteration_key) for text in texts]
+
     def get_tokenization_options(self):
         return []
 
     def get_dictionary_lookup_list(self):
-        return []
\ No newline at end of file
+        return []
+
+    def get_dictionary_lookup_batch(self, texts: List[str], lookup_key) -> List:
+        """look up all texts at once, returns the results in the same order, NotFoundError for texts without results.
+        texts are within DICTIONARY_LOOKUP_BATCH_MAX_ITEMS / DICTIONARY_LOOKUP_BATCH_MAX_CHARACTERS.
+        services without a batch lookup look the texts up one by one"""
+        result = []
+        for text in texts:
+            try:
+                result.append(self.get_dictionary_lookup(text, lookup_key))
+            except cloudlanguagetools.errors.NotFoundError as e:
+                result.append(e)
+        return result
\ No newline at end of file
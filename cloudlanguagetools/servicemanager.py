@@ -1,73 +1,108 @@
 import os
+import json
 import base64
-import tempfile
 import logging
 import timeit
-import cachetools
-from typing import List
+import threading
+import functools
+import contextlib
+import dataclasses
+from typing import Iterator, List, Dict
 import requests.exceptions
 import cloudlanguagetools.constants
 import cloudlanguagetools.languages
 import cloudlanguagetools.errors
-import cloudlanguagetools.azure
-import cloudlanguagetools.google
-import cloudlanguagetools.watson
-import cloudlanguagetools.naver
-import cloudlanguagetools.amazon
-import cloudlanguagetools.forvo
-import cloudlanguagetools.cereproc
-import cloudlanguagetools.vocalware
-import cloudlanguagetools.fptai
-import cloudlanguagetools.voicen
-import cloudlanguagetools.elevenlabs
-import cloudlanguagetools.deepl
-import cloudlanguagetools.epitran
-import cloudlanguagetools.mandarincantonese
-import cloudlanguagetools.easypronunciation
-import cloudlanguagetools.pythainlp
-import cloudlanguagetools.spacy
-import cloudlanguagetools.wenlin
-import cloudlanguagetools.libretranslate
-import cloudlanguagetools.openai
-import cloudlanguagetools.alibaba
-import cloudlanguagetools.gemini
 import cloudlanguagetools.encryption
 import cloudlanguagetools.translationlanguage
+import cloudlanguagetools.ttsvoice
+import cloudlanguagetools.serviceregistry
+import cloudlanguagetools.concurrency
+import cloudlanguagetools.catalogstore
+import cloudlanguagetools.catalogindex
+import cloudlanguagetools.translationcache
+import cloudlanguagetools.audiocache
+import cloudlanguagetools.audioresult
+import cloudlanguagetools.options
+import cloudlanguagetools.singleflight
+import cloudlanguagetools.textsegmentation
 
 LOAD_TEST_SERVICES_ONLY = os.environ.get('CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES', 'no') == 'yes'
 
-if LOAD_TEST_SERVICES_ONLY:
-    import cloudlanguagetools.test_services
+# a failed batch is retried text by text only when the error was caused by one of the texts.
+# any other error (authentication, quota, rate limit, timeout, service error) applies to the whole batch,
+# retrying each text would only multiply paid or doomed requests
+BATCH_RETRY_INDIVIDUALLY_EXCEPTIONS = (
+    cloudlanguagetools.errors.InputError,
+    cloudlanguagetools.errors.NotFoundError,
+)
 
 
-class ServiceManager():
-    def  __init__(self):
-        self.services = {}
+@dataclasses.dataclass
+class CatalogResult:
+    """a catalog aggregated across services, along with the outcome of the last request to each service"""
+    catalog: cloudlanguagetools.constants.Catalog
+    entries: list
+    service_status: Dict[cloudlanguagetools.constants.Service, cloudlanguagetools.concurrency.TaskResult]
+    # catalog store generation this result was built from
+    generation: int = 0
+
+    @property
+    def complete(self):
+        return all(task_result.status == cloudlanguagetools.concurrency.TaskStatus.ok for task_result in self.service_status.values())
+
+    def failed_services(self):
+        return [service for service, task_result in self.service_status.items() 
+            if task_result.status != cloudlanguagetools.concurrency.TaskStatus.ok]
+
+    def status_json(self):
+        return {service.name: task_result.json_obj() for service, task_result in self.service_status.items()}
+
+    @functools.cached_property
+    def index(self) -> cloudlanguagetools.catalogindex.CatalogIndex:
+        # built at most once per catalog generation, since a new CatalogResult is created on every refresh
+        return cloudlanguagetools.catalogindex.build_index(self.catalog, self.entries)
 
+
+class ServiceManager():
+    def  __init__(self, enabled_services=None, catalog_store=None, translation_cache=None, audio_cache=None):
+        """enabled_services: optional list of service names (or constants.Service) to restrict this manager to,
+        defaults to the CLOUDLANGUAGETOOLS_CORE_ENABLED_SERVICES environment variable, or all services.
+        services are imported and instantiated lazily, the first time they are used.
+        catalog_store: optional catalogstore.CatalogStore, by default the snapshot path is taken
+        from the CLOUDLANGUAGETOOLS_CORE_CATALOG_SNAPSHOT environment variable.
+        translation_cache: optional translationcache.TranslationCache, by default translations are cached in memory,
+        and on disk if the CLOUDLANGUAGETOOLS_CORE_TRANSLATION_CACHE_PATH environment variable is set.
+        audio_cache: optional audiocache.AudioCache, by default audio is cached if the
+        CLOUDLANGUAGETOOLS_CORE_AUDIO_CACHE_DIR environment variable is set."""
         if LOAD_TEST_SERVICES_ONLY:
-            self.services[cloudlanguagetools.constants.Service.TestServiceA] = cloudlanguagetools.test_services.TestServiceA()
-            self.services[cloudlanguagetools.constants.Service.TestServiceB] = cloudlanguagetools.test_services.TestServiceB()
+            service_modules = cloudlanguagetools.serviceregistry.TEST_SERVICE_MODULES
         else:
-            self.services[cloudlanguagetools.constants.Service.Azure] = cloudlanguagetools.azure.AzureService()
-            self.services[cloudlanguagetools.constants.Service.Google] = cloudlanguagetools.google.GoogleService()
-            self.services[cloudlanguagetools.constants.Service.Watson] = cloudlanguagetools.watson.WatsonService()
-            self.services[cloudlanguagetools.constants.Service.Naver] = cloudlanguagetools.naver.NaverService()
-            self.services[cloudlanguagetools.constants.Service.Amazon] = cloudlanguagetools.amazon.AmazonService()
-            self.services[cloudlanguagetools.constants.Service.Forvo] = cloudlanguagetools.forvo.ForvoService()
-            self.services[cloudlanguagetools.constants.Service.CereProc] = cloudlanguagetools.cereproc.CereProcService()
-            self.services[cloudlanguagetools.constants.Service.VocalWare] = cloudlanguagetools.vocalware.VocalWareService()
-            self.services[cloudlanguagetools.constants.Service.FptAi] = cloudlanguagetools.fptai.FptAiService()
-            self.services[cloudlanguagetools.constants.Service.ElevenLabs] = cloudlanguagetools.elevenlabs.ElevenLabsService()
-            self.services[cloudlanguagetools.constants.Service.EasyPronunciation] = cloudlanguagetools.easypronunciation.EasyPronunciationService()
-            self.services[cloudlanguagetools.constants.Service.Epitran] = cloudlanguagetools.epitran.EpitranService()
-            self.services[cloudlanguagetools.constants.Service.DeepL] = cloudlanguagetools.deepl.DeepLService()
-            self.services[cloudlanguagetools.constants.Service.PyThaiNLP] = cloudlanguagetools.pythainlp.PyThaiNLPService()
-            self.services[cloudlanguagetools.constants.Service.Spacy] = cloudlanguagetools.spacy.SpacyService()
-            self.services[cloudlanguagetools.constants.Service.MandarinCantonese] = cloudlanguagetools.mandarincantonese.MandarinCantoneseService()            
-            self.services[cloudlanguagetools.constants.Service.Wenlin] = cloudlanguagetools.wenlin.WenlinService()
-            self.services[cloudlanguagetools.constants.Service.OpenAI] = cloudlanguagetools.openai.OpenAIService()
-            self.services[cloudlanguagetools.constants.Service.Alibaba] = cloudlanguagetools.alibaba.AlibabaService()
-            self.services[cloudlanguagetools.constants.Service.Gemini] = cloudlanguagetools.gemini.GeminiService()
+            service_modules = cloudlanguagetools.serviceregistry.SERVICE_MODULES
+        if enabled_services is None:
+            enabled_services = cloudlanguagetools.serviceregistry.get_enabled_services_from_environment()
+        self.services = cloudlanguagetools.serviceregistry.ServiceRegistry(service_modules, enabled_services)
+        if catalog_store is None:
+            catalog_store = cloudlanguagetools.catalogstore.CatalogStore(
+                snapshot_path=os.environ.get(cloudlanguagetools.catalogstore.CATALOG_SNAPSHOT_ENV_VAR))
+        self.catalog_store = catalog_store
+        if translation_cache is None:
+            translation_cache = cloudlanguagetools.translationcache.TranslationCache(
+                path=os.environ.get(cloudlanguagetools.translationcache.TRANSLATION_CACHE_PATH_ENV_VAR))
+        self.translation_cache = translation_cache
+        if audio_cache is None and os.environ.get(cloudlanguagetools.audiocache.AUDIO_CACHE_DIR_ENV_VAR) is not None:
+            audio_cache = cloudlanguagetools.audiocache.AudioCache(os.environ[cloudlanguagetools.audiocache.AUDIO_CACHE_DIR_ENV_VAR])
+        self.audio_cache = audio_cache
+        # (catalog, service) -> (voice entries, voice key -> options)
+        self.voice_options_indexes = {}
+        # aggregated catalogs, rebuilt when the catalog store generation changes
+        self.catalog_results = {}
+        self.catalog_results_lock = threading.Lock()
+        # concurrent identical requests are sent to the service only once
+        self.single_flight = cloudlanguagetools.singleflight.SingleFlight()
+        self.async_single_flight = cloudlanguagetools.singleflight.AsyncSingleFlight()
+
+    def get_enabled_services(self):
+        return self.services.get_enabled_services()
 
     def configure_default(self):
         # use the stored keys to configure services
@@ -76,8 +111,7 @@ class ServiceManager():
     def configure_services(self, config):
         for service_name, value in config.items():
             service_enum = cloudlanguagetools.constants.Service[service_name]
-            if service_enum in self.services:
-                self.services[service_enum].configure(value)
+            self.services.configure(service_enum, value)
 
     def get_language_data_json(self):
         # retrieve all language data (tts, translation, transliteration, etc)
@@ -145,56 +179,133 @@ class ServiceManager():
             result_dict[language.name] = language.lang_name
         return result_dict
 
-    @cachetools.cached(cache=cachetools.TTLCache(maxsize=1024, ttl=cloudlanguagetools.constants.TTLCacheTimeout))
-    def get_tts_voice_list(self):
-        result = []
-        for key, service in self.services.items():
-            logging.info(f'retrieving voice list from {key}')
-            result.extend(service.get_tts_voice_list())
+    # catalogs (voice list, translation languages, etc)
+    # =================================================
+
+    def get_service_catalog(self, service_enum, catalog: cloudlanguagetools.constants.Catalog):
+        """retrieve a catalog from a single service. concurrent fetches of the same catalog
+        (for example a background refresh and a cold start) share the same request"""
+        def retrieve_catalog():
+            service = self.services[service_enum]
+            return getattr(service, catalog.service_method)()
+        return self.single_flight.do(('catalog', catalog, service_enum), retrieve_catalog)
+
+    def fetch_catalog(self, catalog: cloudlanguagetools.constants.Catalog, services, timeout=None):
+        """query the given services concurrently, and record the outcome in the catalog store.
+        a service which fails or doesn't respond within timeout seconds doesn't block the others."""
+        if timeout is None:
+            timeout = cloudlanguagetools.constants.CatalogServiceTimeout
+        start_time = timeit.default_timer()
+        tasks = {service_enum: functools.partial(self.get_service_catalog, service_enum, catalog) for service_enum in services}
+        service_status = cloudlanguagetools.concurrency.run_concurrently(tasks, timeout, thread_name_prefix=catalog.name)
+        for service_enum, task_result in service_status.items():
+            if task_result.status != cloudlanguagetools.concurrency.TaskStatus.ok:
+                logging.warning(f'could not retrieve {catalog.name} from {service_enum.name} ({task_result.status.name}): {task_result.exception}')
+            self.catalog_store.put(catalog, service_enum, task_result)
+        self.catalog_store.save_snapshot()
+        logging.info(f'retrieved {catalog.name} from {len(service_status)} services in {timeit.default_timer() - start_time:.1f}s')
+        return service_status
+
+    def build_catalog_result(self, catalog: cloudlanguagetools.constants.Catalog) -> CatalogResult:
+        generation = self.catalog_store.generation(catalog)
+        with self.catalog_results_lock:
+            catalog_result = self.catalog_results.get(catalog)
+        if catalog_result is not None and catalog_result.generation == generation:
+            return catalog_result
+        entries = []
+        service_status = {}
+        for service_enum in self.get_enabled_services():
+            entry = self.catalog_store.get(catalog, service_enum)
+            if entry is None:
+                continue
+            if entry.entries is not None:
+                entries.extend(entry.entries)
+            service_status[service_enum] = entry.task_result
+        catalog_result = CatalogResult(catalog=catalog, entries=entries, service_status=service_status, generation=generation)
+        with self.catalog_results_lock:
+            self.catalog_results[catalog] = catalog_result
+        return catalog_result
+
+    def aggregate_catalog(self, catalog: cloudlanguagetools.constants.Catalog, timeout=None) -> CatalogResult:
+        """query all services now, regardless of what's in the catalog store. a service which fails
+        or times out keeps its previous entries if any, its status is reported in CatalogResult.service_status"""
+        self.fetch_catalog(catalog, self.get_enabled_services(), timeout=timeout)
+        return self.build_catalog_result(catalog)
+
+    def get_catalog(self, catalog: cloudlanguagetools.constants.Catalog, timeout=None) -> CatalogResult:
+        """serve the catalog from the catalog store. services which were never retrieved get queried now,
+        stale services keep being served while they get refreshed in the background."""
+        missing_services = []
+        for service_enum in self.get_enabled_services():
+            entry = self.catalog_store.get(catalog, service_enum)
+            if entry is None:
+                missing_services.append(service_enum)
+            elif self.catalog_store.is_stale(entry):
+                if entry.entries is None:
+                    # nothing to serve while waiting for a refresh
+                    missing_services.append(service_enum)
+                else:
+                    self.catalog_store.refresh_in_background(catalog, service_enum,
+                        functools.partial(self.get_service_catalog, service_enum, catalog))
+        if len(missing_services) > 0:
+            self.fetch_catalog(catalog, missing_services, timeout=timeout)
+        return self.build_catalog_result(catalog)
+
+    def get_catalog_status_json(self):
+        """per-service status of each catalog retrieved so far"""
+        result = {}
+        for catalog in self.catalog_results.keys():
+            catalog_status = {}
+            for service_enum in self.get_enabled_services():
+                entry = self.catalog_store.get(catalog, service_enum)
+                if entry is None:
+                    continue
+                catalog_status[service_enum.name] = {
+                    **entry.task_result.json_obj(),
+                    'retrieved_at': entry.retrieved_at,
+                    'stale': self.catalog_store.is_stale(entry)
+                }
+            result[catalog.name] = catalog_status
         return result
 
+    def get_tts_voice_list(self):
+        return self.get_catalog(cloudlanguagetools.constants.Catalog.tts_voice_list).entries
+
     def get_tts_voice_list_json(self):
         tts_voice_list = self.get_tts_voice_list()
         return [voice.json_obj() for voice in tts_voice_list]
 
-    @cachetools.cached(cache=cachetools.TTLCache(maxsize=1024, ttl=cloudlanguagetools.constants.TTLCacheTimeout))
     def get_tts_voice_list_v3(self):
-        result = []
-        for key, service in self.services.items():
-            logging.info(f'retrieving voice list from {key}')
-            result.extend(service.get_tts_voice_list_v3())
-        return result
+        return self.get_catalog(cloudlanguagetools.constants.Catalog.tts_voice_list_v3).entries
 
-    @cachetools.cached(cache=cachetools.TTLCache(maxsize=1024, ttl=cloudlanguagetools.constants.TTLCacheTimeout))
     def get_translation_language_list(self) -> List[cloudlanguagetools.translationlanguage.TranslationLanguage]:
-        result = []
-        for key, service in self.services.items():
-            result.extend(service.get_translation_language_list())
-        return result        
+        return self.get_catalog(cloudlanguagetools.constants.Catalog.translation_language_list).entries
+
+    def get_translation_index(self) -> cloudlanguagetools.catalogindex.TranslationIndex:
+        return self.get_catalog(cloudlanguagetools.constants.Catalog.translation_language_list).index
+
+    def get_translation_services(self, from_language, to_language):
+        """services which can translate from_language into to_language (languages.Language)"""
+        return self.get_translation_index().get_language_pair_services(from_language, to_language)
 
     def get_translation_language_list_json(self):
         """return list of languages supported for translation, using plain objects/strings"""
         language_list = self.get_translation_language_list()
         return [language.json_obj() for language in language_list]
 
-    @cachetools.cached(cache=cachetools.TTLCache(maxsize=1024, ttl=cloudlanguagetools.constants.TTLCacheTimeout))
     def get_transliteration_language_list(self):
-        result = []
-        for key, service in self.services.items():
-            result.extend(service.get_transliteration_language_list())
-        return result
+        return self.get_catalog(cloudlanguagetools.constants.Catalog.transliteration_language_list).entries
+
+    def get_transliteration_index(self) -> cloudlanguagetools.catalogindex.CatalogIndex:
+        return self.get_catalog(cloudlanguagetools.constants.Catalog.transliteration_language_list).index
 
     def get_transliteration_language_list_json(self):
         """return list of languages supported for transliteration, using plain objects/strings"""
         language_list = self.get_transliteration_language_list()
         return [language.json_obj() for language in language_list]
 
-    @cachetools.cached(cache=cachetools.TTLCache(maxsize=1024, ttl=cloudlanguagetools.constants.TTLCacheTimeout))
     def get_tokenization_options(self):
-        result = []
-        for key, service in self.services.items():
-            result.extend(service.get_tokenization_options())
-        return result
+        return self.get_catalog(cloudlanguagetools.constants.Catalog.tokenization_options).entries
 
     def get_tokenization_options_json(self):
         """return list of languages supported for tokenization, using plain objects/strings"""
@@ -203,23 +314,137 @@ class ServiceManager():
 
     # dictionary lookups
 
-    @cachetools.cached(cache=cachetools.TTLCache(maxsize=1024, ttl=cloudlanguagetools.constants.TTLCacheTimeout))
     def get_dictionary_lookup_options(self):
-        result = []
-        for key, service in self.services.items():
-            result.extend(service.get_dictionary_lookup_list())
-        return result
+        return self.get_catalog(cloudlanguagetools.constants.Catalog.dictionary_lookup_options).entries
+
+    def get_dictionary_lookup_index(self) -> cloudlanguagetools.catalogindex.DictionaryLookupIndex:
+        return self.get_catalog(cloudlanguagetools.constants.Catalog.dictionary_lookup_options).index
 
     def get_dictionary_lookup_options_json(self):
         dictionary_lookup_list = self.get_dictionary_lookup_options()
         return [dict_lookup_option.json_obj() for dict_lookup_option in dictionary_lookup_list]
 
-    def get_tts_audio(self, text, service_name, voice_id, options):
+    def get_voice_options(self, service_enum, voice_key):
+        """options declared by a voice (see TtsVoice.get_options), looked up in the voice lists already
+        retrieved, the service doesn't get queried. returns None if the voice is unknown"""
+        voice_key_str = json.dumps(voice_key, sort_keys=True)
+        for catalog in [cloudlanguagetools.constants.Catalog.tts_voice_list_v3, cloudlanguagetools.constants.Catalog.tts_voice_list]:
+            entry = self.catalog_store.get(catalog, service_enum)
+            if entry is None or entry.entries is None:
+                continue
+            index_key = (catalog, service_enum)
+            voice_entries, voice_options_index = self.voice_options_indexes.get(index_key, (None, None))
+            if voice_entries is not entry.entries:
+                voice_options_index = {}
+                for voice in entry.entries:
+                    if isinstance(voice, cloudlanguagetools.ttsvoice.TtsVoice_v3):
+                        voice_options_index[json.dumps(voice.voice_key, sort_keys=True)] = voice.options
+                    else:
+                        voice_options_index[json.dumps(voice.get_voice_key(), sort_keys=True)] = voice.get_options()
+                self.voice_options_indexes[index_key] = (entry.entries, voice_options_index)
+            if voice_key_str in voice_options_index:
+                return voice_options_index[voice_key_str]
+        return None
+
+    def get_tts_audio_cache_key(self, service_enum, text, voice_id, options):
+        canonical_options = cloudlanguagetools.audiocache.canonicalize_options(options, self.get_voice_options(service_enum, voice_id))
+        return cloudlanguagetools.audiocache.get_cache_key(service_enum.name, voice_id, text, canonical_options)
+
+    def get_tts_segments(self, service, text) -> List[str]:
+        """only texts which the service would reject, longer than its TTS_MAX_CHARACTERS, are split at
+        sentence / clause boundaries. a single segment means the text is synthesized in one request.
+        texts containing SSML or other markup are never split, cutting them could break the tags"""
+        if service.TTS_MAX_CHARACTERS is None or len(text) <= service.TTS_MAX_CHARACTERS:
+            return [text]
+        if cloudlanguagetools.textsegmentation.contains_markup(text):
+            return [text]
+        return cloudlanguagetools.textsegmentation.split_text(text, service.TTS_MAX_CHARACTERS)
+
+    def get_segment_audio_list(self, task_results) -> List[cloudlanguagetools.audioresult.AudioResult]:
+        for task_result in task_results:
+            if task_result.status != cloudlanguagetools.concurrency.TaskStatus.ok:
+                raise task_result.exception
+        return [task_result.result for task_result in task_results]
+
+    def get_segments_audio_format(self, segment_audio_list, options) -> cloudlanguagetools.options.AudioFormat:
+        audio_format_name = options.get(cloudlanguagetools.options.AUDIO_FORMAT_PARAMETER)
+        if audio_format_name is not None:
+            return cloudlanguagetools.options.AudioFormat[audio_format_name]
+        if segment_audio_list[0].audio_format is not None:
+            return segment_audio_list[0].audio_format
+        return cloudlanguagetools.options.AudioFormat.mp3
+
+    def get_tts_audio_segmented(self, segments, service_name, voice_id, options) -> cloudlanguagetools.audioresult.AudioResult:
+        """synthesize the segments concurrently, with the same voice and options, and concatenate them"""
+        logging.info(f'generating audio in {len(segments)} segments, service: {service_name}')
+        task_results = cloudlanguagetools.concurrency.map_concurrently(
+            lambda segment: self.get_tts_audio(segment, service_name, voice_id, options), segments,
+            cloudlanguagetools.constants.MaxConcurrentRequests, thread_name_prefix='tts_segment')
+        segment_audio_list = self.get_segment_audio_list(task_results)
+        audio_format = self.get_segments_audio_format(segment_audio_list, options)
+        # imported here, pydub is only needed for long texts
+        from cloudlanguagetools import audio_processing
+        return audio_processing.concatenate_audio(segment_audio_list, audio_format)
+
+    def get_cached_tts_audio(self, audio_data, options) -> cloudlanguagetools.audioresult.AudioResult:
+        audio_format_name = options.get(cloudlanguagetools.options.AUDIO_FORMAT_PARAMETER)
+        audio_format = cloudlanguagetools.options.AudioFormat[audio_format_name] if audio_format_name is not None else None
+        return cloudlanguagetools.audioresult.AudioResult(audio_data, audio_format=audio_format)
+
+    def get_tts_audio(self, text, service_name, voice_id, options, bypass_cache=False) -> cloudlanguagetools.audioresult.AudioResult:
+        """returns an audioresult.AudioResult, use .name if a file is needed.
+        concurrent identical requests are sent to the service only once.
+        long texts are synthesized in segments concurrently (see get_tts_segments), then concatenated.
+        bypass_cache=True requests fresh audio (which replaces the cached one), it doesn't join requests in flight."""
         service_enum = cloudlanguagetools.constants.Service[service_name]
-        service = self.services[service_enum]
-        return service.get_tts_audio(text, voice_id, options)
+        cache_key = self.get_tts_audio_cache_key(service_enum, text, voice_id, options)
+        if self.audio_cache is not None:
+            if bypass_cache:
+                self.audio_cache.record_bypass()
+            else:
+                audio_data = self.audio_cache.get(cache_key)
+                if audio_data is not None:
+                    return self.get_cached_tts_audio(audio_data, options)
+
+        def generate_audio():
+            service = self.services[service_enum]
+            segments = self.get_tts_segments(service, text)
+            if len(segments) > 1:
+                audio = self.get_tts_audio_segmented(segments, service_name, voice_id, options)
+            else:
+                audio = service.get_tts_audio(text, voice_id, options)
+            if self.audio_cache is not None and len(audio.bytes) > 0:
+                self.audio_cache.put(cache_key, audio.bytes)
+            return audio
+
+        if bypass_cache:
+            audio = generate_audio()
+        else:
+            audio = self.single_flight.do(('tts', cache_key), generate_audio)
+        # the audio data is shared, but every caller gets its own result (and temporary file, if requested)
+        return cloudlanguagetools.audioresult.AudioResult(audio.bytes, audio_format=audio.audio_format)
+
+    def stream_tts_audio(self, text, service_name, voice_id, options) -> Iterator[bytes]:
+        """yield the audio in chunks as they arrive from the service, services which don't support streaming
+        yield a single chunk. the complete audio is added to the audio cache, and served from it when available."""
+        service_enum = cloudlanguagetools.constants.Service[service_name]
+        cache_key = self.get_tts_audio_cache_key(service_enum, text, voice_id, options)
+        if self.audio_cache is not None:
+            audio_data = self.audio_cache.get(cache_key)
+            if audio_data is not None:
+                yield from cloudlanguagetools.audioresult.AudioResult(audio_data).iter_chunks()
+                return
 
-    def get_tts_audio_v5(self, text, service_name, voice_id, options):
+        service = self.services[service_enum]
+        chunks = []
+        for chunk in service.stream_tts_audio(text, voice_id, options):
+            chunks.append(chunk)
+            yield chunk
+        # only reached if the caller consumed the whole stream
+        if self.audio_cache is not None and len(chunks) > 0:
+            self.audio_cache.put(cache_key, b''.join(chunks))
+
+    def get_tts_audio_v5(self, text, service_name, voice_id, options, bypass_cache=False):
         """Generate TTS audio, normalizing all exceptions to TransientError or PermanentError.
 
         This method wraps get_tts_audio and ensures only exceptions derived from
@@ -232,10 +457,14 @@ class ServiceManager():
             errors.TransientError: On failures that may succeed on retry.
             errors.PermanentError: On failures that will not succeed on retry.
         """
+        with self.tts_audio_v5_errors(service_name):
+            return self.get_tts_audio(text, service_name, voice_id, options, bypass_cache=bypass_cache)
+
+    @contextlib.contextmanager
+    def tts_audio_v5_errors(self, service_name):
+        """normalize exceptions to errors.TransientError or errors.PermanentError, see get_tts_audio_v5"""
         try:
-            service_enum = cloudlanguagetools.constants.Service[service_name]
-            service = self.services[service_enum]
-            return service.get_tts_audio(text, voice_id, options)
+            yield
         except (cloudlanguagetools.errors.TransientError, cloudlanguagetools.errors.PermanentError):
             # these exceptions are already properly categorized, so just re-throw them
             raise
@@ -246,47 +475,208 @@ class ServiceManager():
             # assume this is a transient error for now, and the error may later be categorized as permanent
             raise cloudlanguagetools.errors.TransientError(f'unexpected error generating TTS audio for {service_name}: {e}') from e
 
-    def get_translation(self, text, service_name: str, from_language_key, to_language_key):
-        """return text"""
-        service_enum = cloudlanguagetools.constants.Service[service_name]
-        service = self.services[service_enum]
-        return service.get_translation(text, from_language_key, to_language_key)
+    def get_translation(self, text, service_name: str, from_language_key, to_language_key, bypass_cache=False):
+        """return text. translations are cached, bypass_cache=True requests a fresh translation (which replaces the cached one),
+        it doesn't join requests in flight. the text is NFC normalized and stripped before being sent"""
+        text = cloudlanguagetools.translationcache.canonicalize_text(text)
+        cache_key = cloudlanguagetools.translationcache.get_cache_key(service_name, from_language_key, to_language_key, text)
+        if bypass_cache:
+            self.translation_cache.record_bypass()
+        else:
+            translation = self.translation_cache.get(cache_key)
+            if translation is not None:
+                return translation
 
-    def get_all_translations(self, text, from_language, to_language):
-        global_starttime = timeit.default_timer()
+        def translate():
+            service_enum = cloudlanguagetools.constants.Service[service_name]
+            service = self.services[service_enum]
+            translation = service.get_translation(text, from_language_key, to_language_key)
+            self.translation_cache.put(cache_key, translation)
+            return translation
+
+        if bypass_cache:
+            return translate()
+        return self.single_flight.do(('translation', cache_key), translate)
+
+    def get_translation_batch(self, texts, service_name: str, from_language_key, to_language_key, bypass_cache=False):
+        """translate several texts with the same service and languages.
+        services which support it receive several texts per request (chunked according to
+        TRANSLATION_BATCH_MAX_ITEMS / TRANSLATION_BATCH_MAX_CHARACTERS), other services receive one request
+        per text. requests are sent concurrently, at most constants.MaxConcurrentRequests at a time.
+        only texts not found in the translation cache are requested, each of them once.
+        returns a list in the same order as texts, each item is the translated text, or the exception for that text"""
+        texts = [cloudlanguagetools.translationcache.canonicalize_text(text) for text in texts]
+        cache_keys = [cloudlanguagetools.translationcache.get_cache_key(service_name, from_language_key, to_language_key, text) for text in texts]
+        translations = self.get_cached_translations(cache_keys, bypass_cache)
+
+        missing_texts = self.get_missing_texts(texts, cache_keys, translations)
+        if len(missing_texts) > 0:
+            service_enum = cloudlanguagetools.constants.Service[service_name]
+            service = self.services[service_enum]
+            results = self.process_batch(missing_texts.values(), service_name, 'translation',
+                lambda text: service.get_translation(text, from_language_key, to_language_key),
+                lambda chunk: service.get_translation_batch(chunk, from_language_key, to_language_key),
+                service.TRANSLATION_BATCH_MAX_ITEMS, service.TRANSLATION_BATCH_MAX_CHARACTERS)
+            translations.update(self.put_translations(missing_texts.keys(), results))
+
+        return [translations[cache_key] for cache_key in cache_keys]
+
+    def get_cached_translations(self, cache_keys, bypass_cache) -> Dict:
+        """cache key -> translation, for the keys found in the translation cache"""
+        translations = {}
+        if bypass_cache:
+            self.translation_cache.record_bypass()
+            return translations
+        for cache_key in dict.fromkeys(cache_keys):
+            translation = self.translation_cache.get(cache_key)
+            if translation is not None:
+                translations[cache_key] = translation
+        return translations
+
+    def get_missing_texts(self, texts, cache_keys, translations) -> Dict:
+        """cache key -> text, for each distinct text which needs to be translated"""
+        missing_texts = {}
+        for cache_key, text in zip(cache_keys, texts):
+            if cache_key not in translations and cache_key not in missing_texts:
+                missing_texts[cache_key] = text
+        return missing_texts
+
+    def put_translations(self, cache_keys, results) -> Dict:
+        """cache the successful translations, returns cache key -> translation or exception"""
+        translations = {}
+        for cache_key, translation in zip(cache_keys, results):
+            if not isinstance(translation, Exception):
+                self.translation_cache.put(cache_key, translation)
+            translations[cache_key] = translation
+        return translations
+
+    def process_batch(self, texts, service_name, request_name, single_function, batch_function, max_items, max_characters):
+        """send texts to single_function one at a time, or to batch_function in chunks if max_items is set.
+        returns a list in the same order as texts, each item is the result, or the exception for that text"""
+        texts = list(texts)
+
+        def process_single(texts):
+            task_results = cloudlanguagetools.concurrency.map_concurrently(single_function, texts,
+                cloudlanguagetools.constants.MaxConcurrentRequests, thread_name_prefix=request_name)
+            return [task_result.get_value() for task_result in task_results]
+
+        def process_chunk(chunk):
+            return self.check_batch_results(chunk, batch_function(chunk), service_name, request_name)
+
+        if max_items is None:
+            return process_single(texts)
+
+        chunks = cloudlanguagetools.concurrency.chunk_texts(texts, max_items, max_characters)
+        chunk_results = cloudlanguagetools.concurrency.map_concurrently(process_chunk, chunks,
+            cloudlanguagetools.constants.MaxConcurrentRequests, thread_name_prefix=request_name)
+        result = []
+        for chunk, chunk_result in zip(chunks, chunk_results):
+            if chunk_result.status == cloudlanguagetools.concurrency.TaskStatus.ok:
+                result.extend(chunk_result.result)
+            elif self.retry_chunk_individually(chunk, chunk_result.exception, service_name, request_name):
+                result.extend(process_single(chunk))
+            else:
+                result.extend([chunk_result.exception] * len(chunk))
+        return result
 
-        translation_language_list = self.get_translation_language_list()
+    def check_batch_results(self, chunk, results, service_name, request_name):
+        if len(results) != len(chunk):
+            raise cloudlanguagetools.errors.RequestError(f'{service_name}: expected {len(chunk)} {request_name} results, received {len(results)}')
+        return results
+
+    def retry_chunk_individually(self, chunk, exception, service_name, request_name) -> bool:
+        """whether a failed chunk gets processed text by text, to find out which texts failed"""
+        if len(chunk) > 1 and isinstance(exception, BATCH_RETRY_INDIVIDUALLY_EXCEPTIONS):
+            logging.warning(f'batch {request_name} of {len(chunk)} texts failed for service {service_name}, processing texts individually: {exception}')
+            return True
+        return False
+
+    def get_all_translations_tasks(self, text, from_language, to_language):
+        """service name -> function returning the translation, for every service which can translate
+        from_language into to_language (language codes)"""
+        return {service_name: functools.partial(self.get_translation, text, service_name, from_language_id, to_language_id)
+            for service_name, (from_language_id, to_language_id) in self.get_all_translations_language_ids(from_language, to_language).items()}
+
+    def get_all_translations_language_ids(self, from_language, to_language):
+        """service name -> (from language id, to language id), for every service which can translate
+        from_language into to_language (language codes)"""
+        translation_index = self.get_translation_index()
+        from_language_enum = cloudlanguagetools.languages.Language.__members__.get(from_language)
+        to_language_enum = cloudlanguagetools.languages.Language.__members__.get(to_language)
+        language_pair_services = translation_index.get_language_pair_services(from_language_enum, to_language_enum)
+
+        language_ids = {}
+        for service_enum in self.get_enabled_services():
+            if service_enum not in language_pair_services:
+                continue
+            from_language_entries = translation_index.get_entries(from_language_enum, service=service_enum)
+            to_language_entries = translation_index.get_entries(to_language_enum, service=service_enum)
+            if len(from_language_entries) == 1 and len(to_language_entries) == 1:
+                language_ids[service_enum.name] = (from_language_entries[0].get_language_id(), to_language_entries[0].get_language_id())
+        return language_ids
+
+    def iterate_all_translations(self, text, from_language, to_language, timeout=None):
+        """query all services which can translate from_language into to_language concurrently,
+        yield (service name, translated text or exception, elapsed seconds) as each service completes.
+        services which haven't completed after timeout seconds are yielded with errors.TimeoutError"""
+        if timeout is None:
+            timeout = cloudlanguagetools.constants.AllTranslationsTimeout
+        tasks = self.get_all_translations_tasks(text, from_language, to_language)
+        for service_name, task_result in cloudlanguagetools.concurrency.iterate_concurrently(tasks, timeout, thread_name_prefix='translation'):
+            yield self.get_all_translations_result(service_name, task_result)
+
+    def get_all_translations_result(self, service_name, task_result):
+        """(service name, translated text or exception, elapsed seconds)"""
+        logging.info(f'get_all_translation processing time for {service_name}: {task_result.elapsed:.1f}')
+        if task_result.status == cloudlanguagetools.concurrency.TaskStatus.ok:
+            return service_name, task_result.result, task_result.elapsed
+        elif task_result.status == cloudlanguagetools.concurrency.TaskStatus.timeout:
+            return service_name, cloudlanguagetools.errors.TimeoutError(f'translation timed out for service {service_name}'), task_result.elapsed
+        else:
+            return service_name, task_result.exception, task_result.elapsed
 
-        result = {}
-        for service_enum, service in self.services.items():
-            service_name = service_enum.name
-            # locate from language key
-            from_language_entries = [x for x in translation_language_list if x.service.name == service_name and x.get_language_code() == from_language]
-            if len(from_language_entries) == 1:
-                starttime = timeit.default_timer()
-                # this service provides the "from" language in translation list
-                from_language_id = from_language_entries[0].get_language_id()
-                # locate to language key
-                to_language_entries = [x for x in translation_language_list if x.service.name == service_name and x.get_language_code() == to_language]
-                if len(to_language_entries) == 1:
-                    to_language_id = to_language_entries[0].get_language_id()
-                    try:
-                        result[service_name] = self.get_translation(text, service_name, from_language_id, to_language_id)
-                    except cloudlanguagetools.errors.RequestError:
-                        pass # don't do anything
-                    except Exception as e:
-                        # default exception handler
-                        logging.exception(f'could not retrieve translation for service {service_name}, text: {text}')
-                    time_diff = timeit.default_timer() - starttime
-                    logging.info(f'get_all_translation processing time for {service_name}: {time_diff:.1f}')
+    def get_all_translations(self, text, from_language, to_language, timeout=None):
+        global_starttime = timeit.default_timer()
+        result = self.collect_all_translations(text, self.iterate_all_translations(text, from_language, to_language, timeout=timeout))
         global_time_diff = timeit.default_timer() - global_starttime
         logging.info(f'get_all_translation total processing time: {global_time_diff:.1f}')
         return result
 
+    def collect_all_translations(self, text, all_translations):
+        """service name -> translated text, for the services which succeeded, from the (service name, translation, elapsed) items"""
+        translations = {}
+        for service_name, translation, elapsed in all_translations:
+            if isinstance(translation, cloudlanguagetools.errors.TimeoutError):
+                logging.warning(f'could not retrieve translation for service {service_name}: {translation}')
+            elif isinstance(translation, cloudlanguagetools.errors.RequestError):
+                pass # don't do anything
+            elif isinstance(translation, Exception):
+                # default exception handler
+                logging.error(f'could not retrieve translation for service {service_name}, text: {text}', exc_info=translation)
+            else:
+                translations[service_name] = translation
+
+        # keep the service order stable, regardless of which service responded first
+        return {service_enum.name: translations[service_enum.name] for service_enum in self.get_enabled_services() if service_enum.name in translations}
+
     def get_transliteration(self, text, service_name: str, transliteration_key):
         service_enum = cloudlanguagetools.constants.Service[service_name]
         service = self.services[service_enum]
-        return service.get_transliteration(text, transliteration_key)
+        key = ('transliteration', service_name, json.dumps(transliteration_key, sort_keys=True, default=str), text)
+        return self.single_flight.do(key, lambda: service.get_transliteration(text, transliteration_key))
+
+    def get_transliteration_batch(self, texts, service_name: str, transliteration_key):
+        """transliterate several texts with the same service and transliteration key.
+        services which support it receive several texts per request (chunked according to
+        TRANSLITERATION_BATCH_MAX_ITEMS / TRANSLITERATION_BATCH_MAX_CHARACTERS), other services receive one request
+        per text. requests are sent concurrently, at most constants.MaxConcurrentRequests at a time.
+        returns a list in the same order as texts, each item is the transliterated text, or the exception for that text"""
+        service_enum = cloudlanguagetools.constants.Service[service_name]
+        service = self.services[service_enum]
+        return self.process_batch(texts, service_name, 'transliteration',
+            lambda text: service.get_transliteration(text, transliteration_key),
+            lambda chunk: service.get_transliteration_batch(chunk, transliteration_key),
+            service.TRANSLITERATION_BATCH_MAX_ITEMS, service.TRANSLITERATION_BATCH_MAX_CHARACTERS)
 
     def get_tokenization(self, text, service_name: str, tokenization_key):
         service_enum = cloudlanguagetools.constants.Service[service_name]
@@ -296,7 +686,22 @@ class ServiceManager():
     def get_dictionary_lookup(self, text, service_name, lookup_key):
         service_enum = cloudlanguagetools.constants.Service[service_name]
         service = self.services[service_enum]
-        return service.get_dictionary_lookup(text, lookup_key)
+        key = ('dictionary_lookup', service_name, json.dumps(lookup_key, sort_keys=True, default=str), text)
+        return self.single_flight.do(key, lambda: service.get_dictionary_lookup(text, lookup_key))
+
+    def get_dictionary_lookup_batch(self, texts, service_name, lookup_key) -> Dict:
+        """look up several texts with the same service and lookup key. services which support it
+        look up many texts at once (see Service.get_dictionary_lookup_batch), other services receive
+        one request per text, at most constants.MaxConcurrentRequests at a time.
+        returns a dict: text -> result, or the exception for that text (NotFoundError if there are no results)"""
+        service_enum = cloudlanguagetools.constants.Service[service_name]
+        service = self.services[service_enum]
+        texts = list(dict.fromkeys(texts))
+        results = self.process_batch(texts, service_name, 'dictionary_lookup',
+            lambda text: service.get_dictionary_lookup(text, lookup_key),
+            lambda chunk: service.get_dictionary_lookup_batch(chunk, lookup_key),
+            service.DICTIONARY_LOOKUP_BATCH_MAX_ITEMS, service.DICTIONARY_LOOKUP_BATCH_MAX_CHARACTERS)
+        return dict(zip(texts, results))
 
     def get_breakdown(self, text, tokenization_option, translation_option, transliteration_option):
         
@@ -314,7 +719,39 @@ class ServiceManager():
             transliteration_service = transliteration_option['service']
             transliteration_key = transliteration_option['transliteration_key']
 
-        # then, enrich tokens with translation and transliteration
+        # then, enrich tokens with translation and transliteration.
+        # each distinct lemma / token is only requested once, in batch.
+        # translation and transliteration run concurrently.
+        lemmas = []
+        tokens = []
+        if translation_option != None:
+            lemmas = list(dict.fromkeys([token['lemma'] for token in tokenization_result if token['can_translate']]))
+        if transliteration_option != None:
+            tokens = list(dict.fromkeys([token['token'] for token in tokenization_result if token['can_transliterate']]))
+
+        def translate_lemmas():
+            if len(lemmas) == 0:
+                return []
+            return self.get_translation_batch(lemmas, translation_service, translation_source_language_id, translation_target_language_id)
+
+        def transliterate_tokens():
+            if len(tokens) == 0:
+                return []
+            return self.get_transliteration_batch(tokens, transliteration_service, transliteration_key)
+
+        translation_results, transliteration_results = [task_result.get_value() for task_result in 
+            cloudlanguagetools.concurrency.map_concurrently(lambda function: function(), 
+                [translate_lemmas, transliterate_tokens], 2, thread_name_prefix='breakdown')]
+        for results in [translation_results, transliteration_results]:
+            if isinstance(results, Exception):
+                raise results
+            for value in results:
+                if isinstance(value, Exception):
+                    raise value
+        translations = dict(zip(lemmas, translation_results))
+        transliterations = dict(zip(tokens, transliteration_results))
+
+        # reassemble, in token order
         result = []
         for token in tokenization_result:
             entry = {
@@ -323,12 +760,10 @@ class ServiceManager():
             }
 
             if token['can_translate'] and translation_option != None:
-                # translate this token (lemma)
-                entry['translation'] = self.get_translation(token['lemma'], translation_service, translation_source_language_id, translation_target_language_id)
+                entry['translation'] = translations[token['lemma']]
 
             if token['can_transliterate'] and transliteration_option != None:
-                # transliterate the token
-                entry['transliteration'] = self.get_transliteration(token['token'], transliteration_service, transliteration_key)
+                entry['transliteration'] = transliterations[token['token']]
 
             if 'pos_description' in token:
                 entry['pos_description'] = token['pos_description']
@@ -357,6 +792,196 @@ class ServiceManager():
     def get_jyutping(self, text, tone_numbers, spaces, corrections=[]):
         return self.services[cloudlanguagetools.constants.Service.MandarinCantonese].get_jyutping(text, tone_numbers, spaces, corrections)
 
+    # async API
+    # =========
+    # REST services are called over async HTTP (see Service.*_async and asynchttptransport): requests are
+    # awaited on the event loop, up to constants.AsyncHttpMaxConnections open connections, without a thread per
+    # request. services built on blocking vendor SDKs, the disk caches, audio concatenation and catalog retrieval
+    # run on concurrency.blocking_executor, at most constants.AsyncMaxWorkers at a time (further calls wait for
+    # a worker). both limits can be overridden with environment variables, see constants.
+    # the async methods go through the same caches as the blocking methods, and coalesce concurrent identical
+    # requests. a coalesced request still completes when one of its callers gets cancelled.
+
+    async def get_service_async(self, service_enum):
+        """the service, imported and instantiated on the blocking executor the first time it's used"""
+        if self.services.is_loaded(service_enum):
+            return self.services[service_enum]
+        return await cloudlanguagetools.concurrency.run_blocking(self.services.load, service_enum)
+
+    async def run_translation_cache_call(self, function, *args):
+        """calls to the translation cache only need a thread when it has a disk tier"""
+        if self.translation_cache.blocking:
+            return await cloudlanguagetools.concurrency.run_blocking(function, *args)
+        return function(*args)
+
+    async def get_tts_audio_segmented_async(self, segments, service_name, voice_id, options) -> cloudlanguagetools.audioresult.AudioResult:
+        logging.info(f'generating audio in {len(segments)} segments, service: {service_name}')
+        task_results = await cloudlanguagetools.concurrency.map_concurrently_async(
+            lambda segment: self.get_tts_audio_async(segment, service_name, voice_id, options), segments,
+            cloudlanguagetools.constants.MaxConcurrentRequests)
+        segment_audio_list = self.get_segment_audio_list(task_results)
+        audio_format = self.get_segments_audio_format(segment_audio_list, options)
+        # imported here, pydub is only needed for long texts
+        from cloudlanguagetools import audio_processing
+        return await cloudlanguagetools.concurrency.run_blocking(audio_processing.concatenate_audio, segment_audio_list, audio_format)
+
+    async def get_tts_audio_async(self, text, service_name, voice_id, options, bypass_cache=False) -> cloudlanguagetools.audioresult.AudioResult:
+        service_enum = cloudlanguagetools.constants.Service[service_name]
+        cache_key = self.get_tts_audio_cache_key(service_enum, text, voice_id, options)
+        if self.audio_cache is not None:
+            if bypass_cache:
+                self.audio_cache.record_bypass()
+            else:
+                audio_data = await cloudlanguagetools.concurrency.run_blocking(self.audio_cache.get, cache_key)
+                if audio_data is not None:
+                    return self.get_cached_tts_audio(audio_data, options)
+
+        async def generate_audio():
+            service = await self.get_service_async(service_enum)
+            segments = self.get_tts_segments(service, text)
+            if len(segments) > 1:
+                audio = await self.get_tts_audio_segmented_async(segments, service_name, voice_id, options)
+            else:
+                audio = await service.get_tts_audio_async(text, voice_id, options)
+            if self.audio_cache is not None and len(audio.bytes) > 0:
+                await cloudlanguagetools.concurrency.run_blocking(self.audio_cache.put, cache_key, audio.bytes)
+            return audio
+
+        if bypass_cache:
+            audio = await generate_audio()
+        else:
+            audio = await self.async_single_flight.do(('tts', cache_key), generate_audio)
+        return cloudlanguagetools.audioresult.AudioResult(audio.bytes, audio_format=audio.audio_format)
+
+    async def get_tts_audio_v5_async(self, text, service_name, voice_id, options, bypass_cache=False):
+        with self.tts_audio_v5_errors(service_name):
+            return await self.get_tts_audio_async(text, service_name, voice_id, options, bypass_cache=bypass_cache)
+
+    async def get_translation_async(self, text, service_name: str, from_language_key, to_language_key, bypass_cache=False):
+        text = cloudlanguagetools.translationcache.canonicalize_text(text)
+        cache_key = cloudlanguagetools.translationcache.get_cache_key(service_name, from_language_key, to_language_key, text)
+        if bypass_cache:
+            self.translation_cache.record_bypass()
+        else:
+            translation = await self.run_translation_cache_call(self.translation_cache.get, cache_key)
+            if translation is not None:
+                return translation
+
+        async def translate():
+            service = await self.get_service_async(cloudlanguagetools.constants.Service[service_name])
+            translation = await service.get_translation_async(text, from_language_key, to_language_key)
+            await self.run_translation_cache_call(self.translation_cache.put, cache_key, translation)
+            return translation
+
+        if bypass_cache:
+            return await translate()
+        return await self.async_single_flight.do(('translation', cache_key), translate)
+
+    async def get_translation_batch_async(self, texts, service_name: str, from_language_key, to_language_key, bypass_cache=False):
+        texts = [cloudlanguagetools.translationcache.canonicalize_text(text) for text in texts]
+        cache_keys = [cloudlanguagetools.translationcache.get_cache_key(service_name, from_language_key, to_language_key, text) for text in texts]
+        translations = await self.run_translation_cache_call(self.get_cached_translations, cache_keys, bypass_cache)
+
+        missing_texts = self.get_missing_texts(texts, cache_keys, translations)
+        if len(missing_texts) > 0:
+            service = await self.get_service_async(cloudlanguagetools.constants.Service[service_name])
+            results = await self.process_batch_async(missing_texts.values(), service_name, 'translation',
+                lambda text: service.get_translation_async(text, from_language_key, to_language_key),
+                lambda chunk: service.get_translation_batch_async(chunk, from_language_key, to_language_key),
+                service.TRANSLATION_BATCH_MAX_ITEMS, service.TRANSLATION_BATCH_MAX_CHARACTERS)
+            translations.update(await self.run_translation_cache_call(self.put_translations, list(missing_texts.keys()), results))
+
+        return [translations[cache_key] for cache_key in cache_keys]
+
+    async def process_batch_async(self, texts, service_name, request_name, single_function, batch_function, max_items, max_characters):
+        """process_batch, single_function and batch_function being coroutine functions"""
+        texts = list(texts)
+
+        async def process_single(texts):
+            task_results = await cloudlanguagetools.concurrency.map_concurrently_async(single_function, texts,
+                cloudlanguagetools.constants.MaxConcurrentRequests)
+            return [task_result.get_value() for task_result in task_results]
+
+        async def process_chunk(chunk):
+            return self.check_batch_results(chunk, await batch_function(chunk), service_name, request_name)
+
+        if max_items is None:
+            return await process_single(texts)
+
+        chunks = cloudlanguagetools.concurrency.chunk_texts(texts, max_items, max_characters)
+        chunk_results = await cloudlanguagetools.concurrency.map_concurrently_async(process_chunk, chunks,
+            cloudlanguagetools.constants.MaxConcurrentRequests)
+        result = []
+        for chunk, chunk_result in zip(chunks, chunk_results):
+            if chunk_result.status == cloudlanguagetools.concurrency.TaskStatus.ok:
+                result.extend(chunk_result.result)
+            elif self.retry_chunk_individually(chunk, chunk_result.exception, service_name, request_name):
+                result.extend(await process_single(chunk))
+            else:
+                result.extend([chunk_result.exception] * len(chunk))
+        return result
+
+    async def get_all_translations_async(self, text, from_language, to_language, timeout=None):
+        if timeout is None:
+            timeout = cloudlanguagetools.constants.AllTranslationsTimeout
+        global_starttime = timeit.default_timer()
+        # may need to retrieve the translation language list
+        language_ids = await cloudlanguagetools.concurrency.run_blocking(self.get_all_translations_language_ids, from_language, to_language)
+        tasks = {service_name: functools.partial(self.get_translation_async, text, service_name, from_language_id, to_language_id)
+            for service_name, (from_language_id, to_language_id) in language_ids.items()}
+        all_translations = []
+        async for service_name, task_result in cloudlanguagetools.concurrency.iterate_concurrently_async(tasks, timeout):
+            all_translations.append(self.get_all_translations_result(service_name, task_result))
+        result = self.collect_all_translations(text, all_translations)
+        global_time_diff = timeit.default_timer() - global_starttime
+        logging.info(f'get_all_translation total processing time: {global_time_diff:.1f}')
+        return result
+
+    async def get_transliteration_async(self, text, service_name: str, transliteration_key):
+        service = await self.get_service_async(cloudlanguagetools.constants.Service[service_name])
+        key = ('transliteration', service_name, json.dumps(transliteration_key, sort_keys=True, default=str), text)
+        return await self.async_single_flight.do(key, lambda: service.get_transliteration_async(text, transliteration_key))
+
+    async def get_transliteration_batch_async(self, texts, service_name: str, transliteration_key):
+        service = await self.get_service_async(cloudlanguagetools.constants.Service[service_name])
+        return await self.process_batch_async(texts, service_name, 'transliteration',
+            lambda text: service.get_transliteration_async(text, transliteration_key),
+            lambda chunk: service.get_transliteration_batch_async(chunk, transliteration_key),
+            service.TRANSLITERATION_BATCH_MAX_ITEMS, service.TRANSLITERATION_BATCH_MAX_CHARACTERS)
+
+    async def get_tokenization_async(self, text, service_name: str, tokenization_key):
+        service = await self.get_service_async(cloudlanguagetools.constants.Service[service_name])
+        return await service.get_tokenization_async(text, tokenization_key)
+
+    async def get_dictionary_lookup_async(self, text, service_name, lookup_key):
+        service = await self.get_service_async(cloudlanguagetools.constants.Service[service_name])
+        key = ('dictionary_lookup', service_name, json.dumps(lookup_key, sort_keys=True, default=str), text)
+        return await self.async_single_flight.do(key, lambda: service.get_dictionary_lookup_async(text, lookup_key))
+
+    async def get_dictionary_lookup_batch_async(self, texts, service_name, lookup_key) -> Dict:
+        service = await self.get_service_async(cloudlanguagetools.constants.Service[service_name])
+        texts = list(dict.fromkeys(texts))
+        results = await self.process_batch_async(texts, service_name, 'dictionary_lookup',
+            lambda text: service.get_dictionary_lookup_async(text, lookup_key),
+            lambda chunk: service.get_dictionary_lookup_batch_async(chunk, lookup_key),
+            service.DICTIONARY_LOOKUP_BATCH_MAX_ITEMS, service.DICTIONARY_LOOKUP_BATCH_MAX_CHARACTERS)
+        return dict(zip(texts, results))
+
+    async def get_catalog_async(self, catalog: cloudlanguagetools.constants.Catalog, timeout=None) -> CatalogResult:
+        return await cloudlanguagetools.concurrency.run_blocking(self.get_catalog, catalog, timeout=timeout)
+
+    async def get_tts_voice_list_async(self):
+        return (await self.get_catalog_async(cloudlanguagetools.constants.Catalog.tts_voice_list)).entries
+
+    async def get_translation_language_list_async(self):
+        return (await self.get_catalog_async(cloudlanguagetools.constants.Catalog.translation_language_list)).entries
+
+    async def get_transliteration_language_list_async(self):
+        return (await self.get_catalog_async(cloudlanguagetools.constants.Catalog.transliteration_language_list)).entries
+
+    async def get_dictionary_lookup_options_async(self):
+        return (await self.get_catalog_async(cloudlanguagetools.constants.Catalog.dictionary_lookup_options)).entries
+
     # LLM APIs
     # ========
 
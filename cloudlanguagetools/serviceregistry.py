@@ -0,0 +1,149 @@
+import os
+import importlib
+import threading
+import logging
+import timeit
+
+import cloudlanguagetools.constants
+
+logger = logging.getLogger(__name__)
+
+# service enum -> (module path, class name)
+# modules are only imported the first time the service is used, so that a worker which only
+# needs a couple of services doesn't pay for the Azure Speech SDK, google.cloud, boto3, etc.
+SERVICE_MODULES = {
+    cloudlanguagetools.constants.Service.Azure: ('cloudlanguagetools.azure', 'AzureService'),
+    cloudlanguagetools.constants.Service.Google: ('cloudlanguagetools.google', 'GoogleService'),
+    cloudlanguagetools.constants.Service.Watson: ('cloudlanguagetools.watson', 'WatsonService'),
+    cloudlanguagetools.constants.Service.Naver: ('cloudlanguagetools.naver', 'NaverService'),
+    cloudlanguagetools.constants.Service.Amazon: ('cloudlanguagetools.amazon', 'AmazonService'),
+    cloudlanguagetools.constants.Service.Forvo: ('cloudlanguagetools.forvo', 'ForvoService'),
+    cloudlanguagetools.constants.Service.CereProc: ('cloudlanguagetools.cereproc', 'CereProcService'),
+    cloudlanguagetools.constants.Service.VocalWare: ('cloudlanguagetools.vocalware', 'VocalWareService'),
+    cloudlanguagetools.constants.Service.FptAi: ('cloudlanguagetools.fptai', 'FptAiService'),
+    cloudlanguagetools.constants.Service.ElevenLabs: ('cloudlanguagetools.elevenlabs', 'ElevenLabsService'),
+    cloudlanguagetools.constants.Service.EasyPronunciation: ('cloudlanguagetools.easypronunciation', 'EasyPronunciationService'),
+    cloudlanguagetools.constants.Service.Epitran: ('cloudlanguagetools.epitran', 'EpitranService'),
+    cloudlanguagetools.constants.Service.DeepL: ('cloudlanguagetools.deepl', 'DeepLService'),
+    cloudlanguagetools.constants.Service.PyThaiNLP: ('cloudlanguagetools.pythainlp', 'PyThaiNLPService'),
+    cloudlanguagetools.constants.Service.Spacy: ('cloudlanguagetools.spacy', 'SpacyService'),
+    cloudlanguagetools.constants.Service.MandarinCantonese: ('cloudlanguagetools.mandarincantonese', 'MandarinCantoneseService'),
+    cloudlanguagetools.constants.Service.Wenlin: ('cloudlanguagetools.wenlin', 'WenlinService'),
+    cloudlanguagetools.constants.Service.OpenAI: ('cloudlanguagetools.openai', 'OpenAIService'),
+    cloudlanguagetools.constants.Service.Alibaba: ('cloudlanguagetools.alibaba', 'AlibabaService'),
+    cloudlanguagetools.constants.Service.Gemini: ('cloudlanguagetools.gemini', 'GeminiService'),
+}
+
+# services which are configured with the keys of another service, they receive that service's
+# configuration whether or not the other service is enabled or loaded
+SHARED_CONFIG = {
+    cloudlanguagetools.constants.Service.Gemini: cloudlanguagetools.constants.Service.Google,
+}
+
+TEST_SERVICE_MODULES = {
+    cloudlanguagetools.constants.Service.TestServiceA: ('cloudlanguagetools.test_services', 'TestServiceA'),
+    cloudlanguagetools.constants.Service.TestServiceB: ('cloudlanguagetools.test_services', 'TestServiceB'),
+}
+
+# comma-separated list of service names, for example "Wenlin,MandarinCantonese"
+ENABLED_SERVICES_ENV_VAR = 'CLOUDLANGUAGETOOLS_CORE_ENABLED_SERVICES'
+
+def get_enabled_services_from_environment():
+    enabled_services_str = os.environ.get(ENABLED_SERVICES_ENV_VAR, '').strip()
+    if enabled_services_str == '':
+        return None
+    return [service_name.strip() for service_name in enabled_services_str.split(',') if service_name.strip() != '']
+
+
+class ServiceRegistry():
+    """dict-like container of services, keyed by constants.Service.
+    a service module is imported and the service instantiated the first time it is accessed.
+    configuration received before a service is loaded is kept and applied when it gets loaded."""
+
+    def __init__(self, service_modules, enabled_services=None):
+        if enabled_services is not None:
+            enabled_services = [cloudlanguagetools.constants.Service(service) for service in enabled_services]
+            unknown_services = [service for service in enabled_services if service not in service_modules]
+            if len(unknown_services) > 0:
+                raise ValueError(f'unknown services: {unknown_services}')
+            service_modules = {service: module for service, module in service_modules.items() if service in enabled_services}
+        self.service_modules = service_modules
+        self.loaded_services = {}
+        self.pending_config = {}
+        # time in seconds it took to import the module and instantiate each service
+        self.load_times = {}
+        self.lock = threading.RLock()
+
+    def get_enabled_services(self):
+        return list(self.service_modules.keys())
+
+    def is_loaded(self, service):
+        return cloudlanguagetools.constants.Service(service) in self.loaded_services
+
+    def load(self, service):
+        service = cloudlanguagetools.constants.Service(service)
+        # fast path, no locking once the service has been loaded
+        loaded_service = self.loaded_services.get(service)
+        if loaded_service is not None:
+            return loaded_service
+        if service not in self.service_modules:
+            raise KeyError(service)
+        with self.lock:
+            if service in self.loaded_services:
+                return self.loaded_services[service]
+            module_name, class_name = self.service_modules[service]
+            start_time = timeit.default_timer()
+            module = importlib.import_module(module_name)
+            service_instance = getattr(module, class_name)()
+            if service in self.pending_config:
+                service_instance.configure(self.pending_config.pop(service))
+            load_time = timeit.default_timer() - start_time
+            self.load_times[service] = load_time
+            logger.info(f'loaded service {service.name} in {load_time:.3f}s')
+            self.loaded_services[service] = service_instance
+            return service_instance
+
+    def load_all(self):
+        for service in self.service_modules.keys():
+            self.load(service)
+
+    def configure(self, service, config):
+        service = cloudlanguagetools.constants.Service(service)
+        target_services = [service] + [target for target, source in SHARED_CONFIG.items() if source == service]
+        with self.lock:
+            for target_service in target_services:
+                if target_service not in self.service_modules:
+                    continue
+                if target_service in self.loaded_services:
+                    self.loaded_services[target_service].configure(config)
+                else:
+                    self.pending_config[target_service] = config
+
+    # dict interface
+    # ==============
+
+    def __getitem__(self, service):
+        return self.load(service)
+
+    def __contains__(self, service):
+        try:
+            return cloudlanguagetools.constants.Service(service) in self.service_modules
+        except ValueError:
+            return False
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.service_modules)
+
+    def keys(self):
+        return self.get_enabled_services()
+
+    def values(self):
+        return [service_instance for service, service_instance in self.items()]
+
+    def items(self):
+        # listing services requires all of them to be loaded
+        self.load_all()
+        return [(service, self.loaded_services[service]) for service in self.service_modules.keys()]
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import threading
+import collections
+from typing import Any, Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class Call():
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+        self.waiters = 0
+
+
+class SingleFlight():
+    """coalesce concurrent identical calls: while a call for a given key is in flight, other callers
+    with the same key wait for it and receive its result (or exception) instead of making their own call.
+    nothing is kept once the call completes, this is not a cache."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.stats = collections.Counter()
+
+    def do(self, key: Hashable, function: Callable[[], Any]):
+        with self.lock:
+            call = self.calls.get(key)
+            if call is None:
+                call = Call()
+                self.calls[key] = call
+                leader = True
+                self.stats['calls'] += 1
+            else:
+                call.waiters += 1
+                leader = False
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.exception is not None:
+                raise call.exception
+            return call.result
+
+        try:
+            call.result = function()
+            return call.result
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            if call.waiters > 0:
+                logger.debug(f'shared result of {key} with {call.waiters} callers')
+            call.done.set()
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                'calls': self.stats['calls'],
+                'coalesced': self.stats['coalesced'],
+                'in_flight': len(self.calls)
+            }
+
+
+class AsyncSingleFlight():
+    """SingleFlight for coroutines: while a call for a given key is in flight on the event loop, other tasks
+    with the same key await it instead of making their own call. calls on different event loops are separate."""
+
+    def __init__(self):
+        self.calls = {}
+        self.stats = collections.Counter()
+
+    async def do(self, key: Hashable, function: Callable[[], Awaitable]):
+        loop_key = (asyncio.get_running_loop(), key)
+        future = self.calls.get(loop_key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+            # shield, so that a waiter getting cancelled doesn't cancel the call for the others
+            return await asyncio.shield(future)
+
+        self.stats['calls'] += 1
+        future = asyncio.ensure_future(function())
+        self.calls[loop_key] = future
+        def call_done(future):
+            if self.calls.get(loop_key) is future:
+                del self.calls[loop_key]
+            if not future.cancelled():
+                # retrieve the exception, in case every caller got cancelled
+                future.exception()
+        future.add_done_callback(call_done)
+        return await asyncio.shield(future)
+
+    def get_stats(self):
+        return {
+            'calls': self.stats['calls'],
+            'coalesced': self.stats['coalesced'],
+            'in_flight': len(self.calls)
+        }
@@ -6,6 +6,7 @@ import cloudlanguagetools.service
 import cloudlanguagetools.constants
 import cloudlanguagetools.languages
 import cloudlanguagetools.tokenization
+import cloudlanguagetools.errors
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +40,17 @@ class SpacyService(cloudlanguagetools.service.Service):
         model_name = tokenization_key['model_name']
 
         query_url = self.BASE_URL + '/spacy/v1/tokenize'
-        response = requests.post(query_url, json={'language': model_name, 'text': text}, timeout=cloudlanguagetools.constants.RequestTimeout)
+        response = self.http_post(query_url, json={'language': model_name, 'text': text}, timeout=cloudlanguagetools.constants.RequestTimeout)
+        return self.process_tokenization_response(response, text, model_name)
+
+    async def get_tokenization_async(self, text, tokenization_key):
+        model_name = tokenization_key['model_name']
+
+        query_url = self.BASE_URL + '/spacy/v1/tokenize'
+        response = await self.http_post_async(query_url, json={'language': model_name, 'text': text}, timeout=cloudlanguagetools.constants.RequestTimeout)
+        return self.process_tokenization_response(response, text, model_name)
+
+    def process_tokenization_response(self, response, text, model_name):
         response_data = response.json()        
 
         if response.status_code == 200:
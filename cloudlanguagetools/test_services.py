@@ -1,8 +1,8 @@
 import json
 import logging
-import tempfile
 
 import cloudlanguagetools.service
+import cloudlanguagetools.audioresult
 import cloudlanguagetools.constants
 import cloudlanguagetools.options
 import cloudlanguagetools.languages
@@ -34,7 +34,14 @@ class TestServiceVoice(cloudlanguagetools.ttsvoice.TtsVoice):
         return self.voice_name
 
     def get_options(self):
-        return {}
+        return {
+            'rate' : {
+                'type': cloudlanguagetools.options.ParameterType.number.name,
+                'min': 0.5,
+                'max': 3.0,
+                'default': 1.0
+            }
+        }
 
 class TestServiceTranslationLanguage(cloudlanguagetools.translationlanguage.TranslationLanguage):
     def __init__(self, language, language_id, service, service_fee):
@@ -68,6 +75,7 @@ class TestServiceDictionaryLookup(cloudlanguagetools.dictionarylookup.Dictionary
         self.service = service
         self.service_fee = service_fee
         self.language = language
+        self.target_language = cloudlanguagetools.languages.Language.en
         self.name = name
         self.lookup_key = lookup_key
 
@@ -97,14 +105,7 @@ class TestServiceBase(cloudlanguagetools.service.Service):
             }
         )
 
-        output_temp_file = tempfile.NamedTemporaryFile()
-        output_temp_filename = output_temp_file.name
-
-        f = open(output_temp_filename, 'w')
-        f.write(data_str)
-        f.close()
-
-        return output_temp_file
+        return cloudlanguagetools.audioresult.AudioResult(data_str.encode('utf-8'))
 
     def get_tts_voice_list(self):
         result = []
@@ -119,6 +120,9 @@ class TestServiceBase(cloudlanguagetools.service.Service):
             'to_language_key': to_language_key
         })
         
+    def get_translation_batch(self, texts, from_language_key, to_language_key):
+        return [self.get_translation(text, from_language_key, to_language_key) for text in texts]
+
     def get_transliteration(self, text, transliteration_key):
         return json.dumps(
             {
@@ -127,6 +131,9 @@ class TestServiceBase(cloudlanguagetools.service.Service):
             }
         )
 
+    def get_transliteration_batch(self, texts, transliteration_key):
+        return [self.get_transliteration(text, transliteration_key) for text in texts]
+
     def get_translation_language_list(self):
         result = []
         result.append(TestServiceTranslationLanguage(cloudlanguagetools.languages.Language.fr, 'fr', self.SERVICE, self.SERVICE_FEE))
@@ -162,6 +169,10 @@ class TestServiceA(TestServiceBase):
 class TestServiceB(TestServiceBase):
     SERVICE = cloudlanguagetools.constants.Service.TestServiceB
     SERVICE_FEE = cloudlanguagetools.constants.ServiceFee.paid
+    TRANSLATION_BATCH_MAX_ITEMS = 3
+    TRANSLATION_BATCH_MAX_CHARACTERS = 100
+    TRANSLITERATION_BATCH_MAX_ITEMS = 3
+    TRANSLITERATION_BATCH_MAX_CHARACTERS = 100
 
 
     
\ No newline at end of file
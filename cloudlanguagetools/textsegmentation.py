@@ -0,0 +1,54 @@
+"""
+split long texts into segments which can be synthesized separately, cutting at sentence boundaries
+when possible, then at clause boundaries, then between words.
+"""
+
+import re
+from typing import List
+
+# end of sentence punctuation, followed by whitespace, or CJK punctuation which isn't followed by a space
+SENTENCE_BOUNDARY = re.compile(r'[.!?…]+["\'”’)\]]*\s+|[。！？]+[」』”’）]*\s*|\n+')
+CLAUSE_BOUNDARY = re.compile(r'[,;:]\s+|[，；：、]\s*')
+WORD_BOUNDARY = re.compile(r'\s+')
+# SSML / XML tags, or comments
+MARKUP = re.compile(r'<[a-zA-Z/!?][^<>]*>')
+
+def contains_markup(text: str) -> bool:
+    return MARKUP.search(text) is not None
+
+def split_at(text: str, boundary: re.Pattern) -> List[str]:
+    """cut text after each boundary, the boundary stays with the preceding piece"""
+    pieces = []
+    start = 0
+    for match in boundary.finditer(text):
+        if match.end() > start and match.end() < len(text):
+            pieces.append(text[start:match.end()])
+            start = match.end()
+    pieces.append(text[start:])
+    return pieces
+
+def split_piece(text: str, max_characters: int, boundaries: List[re.Pattern]) -> List[str]:
+    if len(text) <= max_characters:
+        return [text]
+    if len(boundaries) == 0:
+        # no boundary left (long word, or CJK text without punctuation)
+        return [text[i:i + max_characters] for i in range(0, len(text), max_characters)]
+    result = []
+    for piece in split_at(text, boundaries[0]):
+        result.extend(split_piece(piece, max_characters, boundaries[1:]))
+    return result
+
+def split_text(text: str, max_characters: int) -> List[str]:
+    """returns segments of at most max_characters characters (leading and trailing whitespace excluded).
+    consecutive sentences are grouped into the same segment as long as they fit."""
+    pieces = split_piece(text, max_characters, [SENTENCE_BOUNDARY, CLAUSE_BOUNDARY, WORD_BOUNDARY])
+    segments = []
+    current_segment = ''
+    for piece in pieces:
+        if len(current_segment) > 0 and len((current_segment + piece).strip()) > max_characters:
+            segments.append(current_segment)
+            current_segment = ''
+        current_segment += piece
+    segments.append(current_segment)
+    segments = [segment.strip() for segment in segments]
+    return [segment for segment in segments if len(segment) > 0]
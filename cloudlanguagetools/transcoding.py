@@ -0,0 +1,105 @@
+"""
+audio format conversion. audio is streamed through ffmpeg's stdin / stdout, nothing gets written to disk.
+conversions run on a bounded pool of workers, so that a burst of requests can't start an unbounded
+number of ffmpeg processes.
+"""
+
+import os
+import shutil
+import struct
+import logging
+import subprocess
+import concurrent.futures
+from typing import Optional
+
+import cloudlanguagetools.constants
+import cloudlanguagetools.options
+import cloudlanguagetools.errors
+import cloudlanguagetools.audioresult
+
+logger = logging.getLogger(__name__)
+
+# path of the ffmpeg binary, when not set, ffmpeg is looked up in PATH
+FFMPEG_PATH_ENV_VAR = 'CLOUDLANGUAGETOOLS_CORE_FFMPEG_PATH'
+
+# ffmpeg demuxer for each input format
+INPUT_ARGUMENTS = {
+    cloudlanguagetools.options.AudioFormat.mp3: ['-f', 'mp3'],
+    cloudlanguagetools.options.AudioFormat.ogg_opus: ['-f', 'ogg'],
+    cloudlanguagetools.options.AudioFormat.ogg_vorbis: ['-f', 'ogg'],
+    cloudlanguagetools.options.AudioFormat.wav: ['-f', 'wav'],
+}
+
+# ffmpeg encoder and muxer for each output format
+OUTPUT_ARGUMENTS = {
+    cloudlanguagetools.options.AudioFormat.mp3: ['-c:a', 'libmp3lame', '-f', 'mp3'],
+    cloudlanguagetools.options.AudioFormat.ogg_opus: ['-c:a', 'libopus', '-f', 'ogg'],
+    cloudlanguagetools.options.AudioFormat.ogg_vorbis: ['-c:a', 'libvorbis', '-f', 'ogg'],
+    # no metadata, so that the header is a plain RIFF / fmt / data sequence
+    cloudlanguagetools.options.AudioFormat.wav: ['-c:a', 'pcm_s16le', '-map_metadata', '-1', '-bitexact', '-f', 'wav'],
+}
+
+transcoding_executor = concurrent.futures.ThreadPoolExecutor(max_workers=cloudlanguagetools.constants.TranscodingMaxWorkers,
+    thread_name_prefix='clt_transcode')
+
+def get_ffmpeg_path():
+    return os.environ.get(FFMPEG_PATH_ENV_VAR) or shutil.which('ffmpeg') or 'ffmpeg'
+
+def fix_wav_header(data: bytes) -> bytes:
+    """ffmpeg can't seek back on a pipe to write the RIFF and data chunk sizes, fill them in"""
+    if len(data) < 12 or data[0:4] != b'RIFF' or data[8:12] != b'WAVE':
+        return data
+    data = bytearray(data)
+    struct.pack_into('<I', data, 4, len(data) - 8)
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = bytes(data[offset:offset + 4])
+        if chunk_id == b'data':
+            struct.pack_into('<I', data, offset + 4, len(data) - offset - 8)
+            break
+        chunk_size = struct.unpack_from('<I', data, offset + 4)[0]
+        offset += 8 + chunk_size + (chunk_size % 2)
+    return bytes(data)
+
+def build_command(from_format, to_format, sample_rate=None, channels=None):
+    command = [get_ffmpeg_path(), '-hide_banner', '-loglevel', 'error', '-nostdin']
+    command += INPUT_ARGUMENTS[from_format] + ['-i', 'pipe:0', '-vn']
+    if sample_rate is not None:
+        command += ['-ar', str(sample_rate)]
+    if channels is not None:
+        command += ['-ac', str(channels)]
+    command += OUTPUT_ARGUMENTS[to_format] + ['pipe:1']
+    return command
+
+def run_ffmpeg(data: bytes, command) -> bytes:
+    try:
+        process = subprocess.run(command, input=data, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            timeout=cloudlanguagetools.constants.TranscodingTimeout)
+    except FileNotFoundError as e:
+        raise cloudlanguagetools.errors.RequestError(f'could not convert audio, ffmpeg not found: {e}') from e
+    except subprocess.TimeoutExpired as e:
+        raise cloudlanguagetools.errors.TimeoutError(f'audio conversion did not complete within {cloudlanguagetools.constants.TranscodingTimeout}s') from e
+    if process.returncode != 0:
+        error_message = process.stderr.decode('utf-8', errors='replace').strip()
+        raise cloudlanguagetools.errors.RequestError(f'could not convert audio: {error_message}')
+    return process.stdout
+
+def convert(audio: cloudlanguagetools.audioresult.AudioResult,
+        from_format: Optional[cloudlanguagetools.options.AudioFormat],
+        to_format: cloudlanguagetools.options.AudioFormat,
+        sample_rate=None, channels=None) -> cloudlanguagetools.audioresult.AudioResult:
+    """convert audio to to_format, from_format defaults to audio.audio_format.
+    sample_rate / channels resample the audio, by default they are kept."""
+    if from_format is None:
+        from_format = audio.audio_format
+    if from_format is None:
+        raise ValueError('could not convert audio, unknown source format')
+    if from_format == to_format and sample_rate is None and channels is None:
+        return cloudlanguagetools.audioresult.AudioResult(audio.bytes, audio_format=to_format)
+
+    command = build_command(from_format, to_format, sample_rate=sample_rate, channels=channels)
+    logger.debug(f'converting {len(audio.bytes)} bytes from {from_format.name} to {to_format.name}')
+    data = transcoding_executor.submit(run_ffmpeg, audio.bytes, command).result()
+    if to_format == cloudlanguagetools.options.AudioFormat.wav:
+        data = fix_wav_header(data)
+    return cloudlanguagetools.audioresult.AudioResult(data, audio_format=to_format)
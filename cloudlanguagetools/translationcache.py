@@ -0,0 +1,182 @@
+import json
+import time
+import queue
+import sqlite3
+import hashlib
+import logging
+import threading
+import collections
+import unicodedata
+import cachetools
+
+import cloudlanguagetools.constants
+
+logger = logging.getLogger(__name__)
+
+# path of the sqlite database, when not set, translations are only cached in memory
+TRANSLATION_CACHE_PATH_ENV_VAR = 'CLOUDLANGUAGETOOLS_CORE_TRANSLATION_CACHE_PATH'
+
+# check the size of the sqlite tier every N insertions
+DISK_EVICTION_INTERVAL = 1000
+# the last access time of entries read from the sqlite tier is written in batches of N entries
+DISK_ACCESS_UPDATE_BATCH_SIZE = 100
+
+def canonicalize_text(text):
+    """the text sent to the service, texts which only differ by unicode normalization or surrounding whitespace
+    get the same translation"""
+    return unicodedata.normalize('NFC', text).strip()
+
+def get_cache_key(service_name, from_language_key, to_language_key, text):
+    """text: the canonical text, as sent to the service"""
+    key_data = json.dumps([str(service_name), from_language_key, to_language_key, text], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(key_data.encode('utf-8')).hexdigest()
+
+
+class TranslationCache():
+    """translation results, in an in-memory LRU tier, and optionally in a sqlite tier shared across processes.
+    both tiers are bounded in size (least recently used entries get evicted) and entries expire after ttl seconds.
+    reads from the sqlite tier run concurrently, each on its own connection, outside of the lock."""
+
+    def __init__(self, path=None, max_entries=10000, disk_max_entries=1000000, ttl=cloudlanguagetools.constants.TranslationCacheTimeout):
+        self.path = path
+        self.ttl = ttl
+        self.disk_max_entries = disk_max_entries
+        self.memory_cache = cachetools.TTLCache(maxsize=max_entries, ttl=ttl)
+        self.lock = threading.Lock()
+        self.stats = collections.Counter()
+        self.connection = None
+        # serializes the writes, on self.connection
+        self.write_lock = threading.Lock()
+        # idle connections for reading, one per concurrent reader
+        self.read_connections = queue.SimpleQueue()
+        # key -> last access time, not written to the sqlite tier yet
+        self.pending_accesses = {}
+        self.disk_insertions = 0
+        if self.path is not None:
+            self.open_database()
+
+    def open_database(self):
+        self.connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('''CREATE TABLE IF NOT EXISTS translations (
+            key TEXT PRIMARY KEY,
+            translation TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            accessed_at REAL NOT NULL)''')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS translations_accessed_at ON translations(accessed_at)')
+        logger.info(f'opened translation cache {self.path}')
+
+    @property
+    def blocking(self):
+        """whether get / put access the sqlite tier, and may block"""
+        return self.connection is not None
+
+    def get(self, key):
+        """returns the cached translation, or None"""
+        with self.lock:
+            translation = self.memory_cache.get(key)
+            if translation is not None:
+                self.stats['memory_hits'] += 1
+                return translation
+        translation = None
+        if self.connection is not None:
+            now = time.time()
+            try:
+                translation = self.read_disk_entry(key, now)
+            except sqlite3.Error as e:
+                # the cache must never prevent a translation
+                logger.warning(f'could not read from translation cache {self.path}: {e}')
+        pending_accesses = None
+        with self.lock:
+            if translation is None:
+                self.stats['misses'] += 1
+                return None
+            self.memory_cache[key] = translation
+            self.stats['disk_hits'] += 1
+            self.pending_accesses[key] = now
+            if len(self.pending_accesses) >= DISK_ACCESS_UPDATE_BATCH_SIZE:
+                pending_accesses, self.pending_accesses = self.pending_accesses, {}
+        if pending_accesses is not None:
+            self.write_accesses(pending_accesses)
+        return translation
+
+    def read_disk_entry(self, key, now):
+        try:
+            connection = self.read_connections.get_nowait()
+        except queue.Empty:
+            connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        try:
+            row = connection.execute('SELECT translation FROM translations WHERE key = ? AND created_at > ?',
+                (key, now - self.ttl)).fetchone()
+        finally:
+            self.read_connections.put(connection)
+        return row[0] if row is not None else None
+
+    def write_accesses(self, pending_accesses):
+        """record the last access time of the entries read from the sqlite tier, used for eviction"""
+        try:
+            with self.write_lock:
+                self.connection.executemany('UPDATE translations SET accessed_at = ? WHERE key = ?',
+                    [(accessed_at, key) for key, accessed_at in pending_accesses.items()])
+        except sqlite3.Error as e:
+            logger.warning(f'could not write to translation cache {self.path}: {e}')
+
+    def flush_accesses(self):
+        with self.lock:
+            pending_accesses, self.pending_accesses = self.pending_accesses, {}
+        if len(pending_accesses) > 0:
+            self.write_accesses(pending_accesses)
+
+    def put(self, key, translation):
+        with self.lock:
+            self.memory_cache[key] = translation
+            self.pending_accesses.pop(key, None)
+        if self.connection is None:
+            return
+        now = time.time()
+        try:
+            with self.write_lock:
+                self.connection.execute('INSERT OR REPLACE INTO translations (key, translation, created_at, accessed_at) VALUES (?, ?, ?, ?)',
+                    (key, translation, now, now))
+                self.disk_insertions += 1
+                evict = self.disk_insertions % DISK_EVICTION_INTERVAL == 0
+            if evict:
+                self.evict_disk_entries()
+        except sqlite3.Error as e:
+            logger.warning(f'could not write to translation cache {self.path}: {e}')
+
+    def evict_disk_entries(self):
+        # least recently used, according to the latest accesses
+        self.flush_accesses()
+        now = time.time()
+        with self.write_lock:
+            self.connection.execute('DELETE FROM translations WHERE created_at <= ?', (now - self.ttl,))
+            entry_count = self.connection.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+            if entry_count > self.disk_max_entries:
+                self.connection.execute('''DELETE FROM translations WHERE key IN
+                    (SELECT key FROM translations ORDER BY accessed_at ASC LIMIT ?)''', (entry_count - self.disk_max_entries,))
+                logger.info(f'evicted {entry_count - self.disk_max_entries} entries from translation cache {self.path}')
+
+    def record_bypass(self):
+        with self.lock:
+            self.stats['bypass'] += 1
+
+    def get_stats(self):
+        with self.lock:
+            hits = self.stats['memory_hits'] + self.stats['disk_hits']
+            return {
+                'hits': hits,
+                'memory_hits': self.stats['memory_hits'],
+                'disk_hits': self.stats['disk_hits'],
+                'misses': self.stats['misses'],
+                'bypass': self.stats['bypass'],
+                'memory_entries': len(self.memory_cache)
+            }
+
+    def clear(self):
+        with self.lock:
+            self.memory_cache.clear()
+            self.pending_accesses.clear()
+        if self.connection is not None:
+            with self.write_lock:
+                self.connection.execute('DELETE FROM translations')
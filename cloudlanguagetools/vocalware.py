@@ -1,10 +1,10 @@
 import requests
 import urllib
 import hashlib
-import tempfile
 import logging
 
 import cloudlanguagetools.service
+import cloudlanguagetools.audioresult
 import cloudlanguagetools.constants
 import cloudlanguagetools.languages
 import cloudlanguagetools.ttsvoice
@@ -52,9 +52,6 @@ class VocalWareService(cloudlanguagetools.service.Service):
         raise cloudlanguagetools.errors.RequestError('not supported')
 
     def get_tts_audio(self, text, voice_key, options):
-        output_temp_file = tempfile.NamedTemporaryFile()
-        output_temp_filename = output_temp_file.name
-
         urlencoded_text = urllib.parse.unquote_plus(text)
 
         # checksum calculation
@@ -66,15 +63,13 @@ class VocalWareService(cloudlanguagetools.service.Service):
         url = f"""http://www.vocalware.com/tts/gen.php?{url_parameters}"""
 
         logger.debug(f'retrieving url {url}')
-        response = requests.get(url, timeout=cloudlanguagetools.constants.RequestTimeout)
+        response = self.http_get(url, timeout=cloudlanguagetools.constants.RequestTimeout)
         logger.debug(f'response.status_code: {response.status_code}')
         if '408 Request Timeout' in response.headers.get('X-Error', ''):
             logger.warning(f"found timeout in response header: {response.headers['X-Error']}, {response.headers['X-ErrorLine']}")
             raise cloudlanguagetools.errors.TimeoutError(f'timeout while retrieving VocalWare audio')
         if response.status_code == 200:
-            with open(output_temp_filename, 'wb') as audio:
-                audio.write(response.content)
-            return output_temp_file
+            return cloudlanguagetools.audioresult.AudioResult(response.content)
 
         response_data = response.content
         error_message = f'Status code: {response.status_code}: {response_data}'
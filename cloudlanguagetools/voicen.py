@@ -1,10 +1,10 @@
 import json
 import requests
-import tempfile
 import logging
 import time
 
 import cloudlanguagetools.service
+import cloudlanguagetools.audioresult
 import cloudlanguagetools.constants
 import cloudlanguagetools.languages
 import cloudlanguagetools.ttsvoice
@@ -70,7 +70,7 @@ class VoicenService(cloudlanguagetools.service.Service):
 
     def job_status_ready(self, job_id):
         check_status_url = f'https://tts.voicen.com/api/v1/jobs/{job_id}/'
-        response = requests.get(check_status_url, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout)
+        response = self.http_get(check_status_url, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout)
         status = response.json()['data']['status']        
         if status == 'ready':
             return True
@@ -81,9 +81,6 @@ class VoicenService(cloudlanguagetools.service.Service):
 
 
     def get_tts_audio(self, text, voice_key, options):
-        output_temp_file = tempfile.NamedTemporaryFile()
-        output_temp_filename = output_temp_file.name
-
         # create the audio request
         # ========================
         request_url = 'https://tts.voicen.com/api/v1/jobs/text/'
@@ -94,7 +91,7 @@ class VoicenService(cloudlanguagetools.service.Service):
         }
 
         logging.info(f'requesting audio for {text}, voice_key {voice_key}')
-        response = requests.post(request_url, json=data, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout)
+        response = self.http_post(request_url, json=data, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout)
         if response.status_code != 200:
             error_message = f"Status code: {response.status_code} reason: {response.reason}"
             raise cloudlanguagetools.errors.RequestError(error_message)
@@ -121,12 +118,10 @@ class VoicenService(cloudlanguagetools.service.Service):
 
         retrieve_url = f'https://tts.voicen.com/api/v1/jobs/{job_id}/synthesize/'
         logging.info(f'retrieving result from url {retrieve_url}')
-        response = requests.get(retrieve_url, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout)
+        response = self.http_get(retrieve_url, headers=self.get_headers(), timeout=cloudlanguagetools.constants.RequestTimeout)
 
         if response.status_code == 200:
-            with open(output_temp_filename, 'wb') as audio:
-                audio.write(response.content)
-            return output_temp_file            
+            return cloudlanguagetools.audioresult.AudioResult(response.content)
 
         # otherwise, an error occured
         error_message = f"Could not retrieve audio from Voicen: status code: {response.status_code} reason: {response.reason}]]"
@@ -1,10 +1,10 @@
 import json
 import requests
-import tempfile
 import logging
 import pprint
 
 import cloudlanguagetools.service
+import cloudlanguagetools.audioresult
 import cloudlanguagetools.constants
 import cloudlanguagetools.languages
 import cloudlanguagetools.ttsvoice
@@ -99,7 +99,7 @@ class WatsonService(cloudlanguagetools.service.Service):
         return []
 
     def get_translation_languages(self):
-        response = requests.get(self.translator_url + '/v3/languages?version=2018-05-01', auth=('apikey', self.translator_key), timeout=cloudlanguagetools.constants.RequestTimeout)
+        response = self.http_get(self.translator_url + '/v3/languages?version=2018-05-01', auth=('apikey', self.translator_key), timeout=cloudlanguagetools.constants.RequestTimeout)
         return response.json()
 
     def get_translation_language_list(self):
@@ -107,7 +107,7 @@ class WatsonService(cloudlanguagetools.service.Service):
         return []
 
     def list_voices(self):
-        response = requests.get(self.speech_url + '/v1/voices', auth=('apikey', self.speech_key), timeout=cloudlanguagetools.constants.RequestTimeout)
+        response = self.http_get(self.speech_url + '/v1/voices', auth=('apikey', self.speech_key), timeout=cloudlanguagetools.constants.RequestTimeout)
         data = response.json()
         logger.debug(f'voices: {data}')
         return data['voices']
@@ -125,7 +125,8 @@ class WatsonService(cloudlanguagetools.service.Service):
 
         return result
 
-    def get_tts_audio(self, text, voice_key, options):
+    def get_tts_request(self, text, voice_key, options):
+        """returns (url, data, headers, audio_format)"""
         response_format_parameter, audio_format = self.get_request_audio_format({
             AudioFormat.mp3: 'audio/mp3',
             AudioFormat.ogg_opus: 'audio/ogg;codecs=opus',
@@ -133,9 +134,6 @@ class WatsonService(cloudlanguagetools.service.Service):
             AudioFormat.wav: 'audio/wav;rate=48000'
         }, options, AudioFormat.mp3)
 
-        output_temp_file = tempfile.NamedTemporaryFile()
-        output_temp_filename = output_temp_file.name
-
         base_url = self.speech_url
         url_path = '/v1/synthesize'
         voice_name = voice_key["name"]
@@ -148,18 +146,26 @@ class WatsonService(cloudlanguagetools.service.Service):
         data = {
             'text': text
         }
+        return constructed_url, json.dumps(data), headers, audio_format
 
-        response = requests.post(constructed_url, data=json.dumps(data), auth=('apikey', self.speech_key), headers=headers, timeout=cloudlanguagetools.constants.RequestTimeout)
-
+    def process_tts_audio_response(self, response, voice_key, audio_format):
         if response.status_code == 200:
-            with open(output_temp_filename, 'wb') as audio:
-                audio.write(response.content)
-            return output_temp_file
+            return cloudlanguagetools.audioresult.AudioResult(response.content, audio_format=audio_format)
 
         # otherwise, an error occured
-        error_message = f"Status code: {response.status_code} reason: {response.reason} voice: [{voice_name}]]"
+        error_message = f"Status code: {response.status_code} reason: {response.reason} voice: [{voice_key['name']}]]"
         raise cloudlanguagetools.errors.RequestError(error_message)
 
+    def get_tts_audio(self, text, voice_key, options):
+        url, data, headers, audio_format = self.get_tts_request(text, voice_key, options)
+        response = self.http_post(url, data=data, auth=('apikey', self.speech_key), headers=headers, timeout=cloudlanguagetools.constants.RequestTimeout)
+        return self.process_tts_audio_response(response, voice_key, audio_format)
+
+    async def get_tts_audio_async(self, text, voice_key, options):
+        url, data, headers, audio_format = self.get_tts_request(text, voice_key, options)
+        response = await self.http_post_async(url, data=data, auth=('apikey', self.speech_key), headers=headers, timeout=cloudlanguagetools.constants.RequestTimeout)
+        return self.process_tts_audio_response(response, voice_key, audio_format)
+
 
     def get_transliteration_language_list(self):
         return []
@@ -170,7 +176,7 @@ class WatsonService(cloudlanguagetools.service.Service):
             'source': from_language_key,
             'target': to_language_key
         }
-        response = requests.post(self.translator_url + '/v3/translate?version=2018-05-01', auth=('apikey', self.translator_key), json=body, timeout=cloudlanguagetools.constants.RequestTimeout)
+        response = self.http_post(self.translator_url + '/v3/translate?version=2018-05-01', auth=('apikey', self.translator_key), json=body, timeout=cloudlanguagetools.constants.RequestTimeout)
 
         if response.status_code == 200:
             # {'translations': [{'translation': 'Le coût est très bas.'}], 'word_count': 2, 'character_count': 4}
@@ -1,9 +1,13 @@
+import re
 import json
 import requests
 import tempfile
 import logging
+import threading
+import urllib.parse
 import clt_wenlin
 import sqlite3
+import cachetools
 
 import cloudlanguagetools.service
 import cloudlanguagetools.constants
@@ -11,19 +15,91 @@ import cloudlanguagetools.languages
 import cloudlanguagetools.errors
 import cloudlanguagetools.dictionarylookup
 
+logger = logging.getLogger(__name__)
+
+# the database is memory-mapped, it's read-only and a few hundred MB at most
+WENLIN_MMAP_SIZE = 512 * 1024 * 1024
+
+# queries are constant strings (the input is a parameter), so each connection's statement cache
+# compiles them once
+LOOKUP_COLUMNS = {
+    cloudlanguagetools.languages.Language.zh_cn: 'simplified',
+    cloudlanguagetools.languages.Language.zh_tw: 'traditional',
+    cloudlanguagetools.languages.Language.yue: 'traditional',
+}
+LOOKUP_QUERIES = {language: f'SELECT entry FROM words WHERE {column} = ?' for language, column in LOOKUP_COLUMNS.items()}
+
+# max number of headwords for which the lookup results are kept in memory
+WENLIN_CACHE_MAX_ENTRIES = 50000
+
+# reverse lookups (english to chinese) search the definitions FTS5 table, and return at most this many headwords
+REVERSE_LOOKUP_MAX_RESULTS = 20
+# rank by relevance of the definition, more than REVERSE_LOOKUP_MAX_RESULTS rows are needed since several
+# definitions of the same headword can match
+REVERSE_LOOKUP_QUERY = """SELECT words.{column} FROM definitions JOIN words ON words.entry_id = definitions.entry_id
+    WHERE definitions MATCH ? ORDER BY bm25(definitions) LIMIT ?"""
+REVERSE_LOOKUP_TOKEN = re.compile(r'\w+')
+
+def build_match_expression(text):
+    """FTS5 query matching definitions which contain all the words of text, the last one as a prefix.
+    every word is quoted, the input can't inject FTS5 syntax. returns None if text contains no word"""
+    tokens = REVERSE_LOOKUP_TOKEN.findall(text.lower())
+    if len(tokens) == 0:
+        return None
+    terms = ['"' + token.replace('"', '""') + '"' for token in tokens]
+    terms[-1] += '*'
+    return 'definition : (' + ' '.join(terms) + ')'
+
+# max number of headwords in the IN list of a batch lookup query, sqlite limits the number of parameters
+BATCH_QUERY_MAX_ITEMS = 500
+
+def build_lookup_views(entries):
+    """walk the entries once, and build the result of every lookup type"""
+    definitions = []
+    parts_of_speech = set()
+    measure_words = set()
+    part_of_speech_definitions = {}
+    for entry in entries:
+        for part_of_speech in entry['parts_of_speech']:
+            parts_of_speech.add(part_of_speech['part_of_speech'])
+            if part_of_speech['part_of_speech'] not in part_of_speech_definitions:
+                part_of_speech_definitions[part_of_speech['part_of_speech']] = []
+            for definition in part_of_speech['definitions']:
+                definitions.append(definition['definition'])
+                part_of_speech_definitions[part_of_speech['part_of_speech']].append(definition['definition'])
+                if 'measure_word' in definition:
+                    measure_words.add(definition['measure_word'])
+    return {
+        cloudlanguagetools.constants.DictionaryLookupType.Definitions: definitions,
+        # definitions which come before any ps band have a None part of speech, sorted last
+        cloudlanguagetools.constants.DictionaryLookupType.PartOfSpeech: sorted(parts_of_speech, key=lambda x: (x is None, x or '')),
+        cloudlanguagetools.constants.DictionaryLookupType.MeasureWord: sorted(measure_words),
+        cloudlanguagetools.constants.DictionaryLookupType.PartOfSpeechDefinitions: part_of_speech_definitions,
+    }
+
+def copy_view(view):
+    # cached views are shared, callers get their own copy
+    if isinstance(view, dict):
+        return {key: list(value) for key, value in view.items()}
+    return list(view)
+
 class WenlinDictionaryLookup(cloudlanguagetools.dictionarylookup.DictionaryLookup):
-    def __init__(self, source_language, lookup_type):
+    def __init__(self, source_language, lookup_type, target_language=cloudlanguagetools.languages.Language.en):
         self.service = cloudlanguagetools.constants.Service.Wenlin
         self.service_fee = cloudlanguagetools.constants.ServiceFee.free
-        self.target_language = cloudlanguagetools.languages.Language.en
+        self.target_language = target_language
         self.language = source_language
         self.lookup_type = lookup_type
 
     def get_lookup_key(self):
-        return {
+        lookup_key = {
             'language': self.language.name,
             'lookup_type': self.lookup_type.name
-        }        
+        }
+        if self.target_language != cloudlanguagetools.languages.Language.en:
+            # reverse lookup, english to chinese
+            lookup_key['target_language'] = self.target_language.name
+        return lookup_key
 
     def get_lookup_name(self):
         return f'Wenlin ({self.language.lang_name} to {self.target_language.lang_name}), {self.lookup_type.name}'
@@ -33,8 +109,15 @@ class WenlinDictionaryLookup(cloudlanguagetools.dictionarylookup.DictionaryLooku
 
 
 class WenlinService(cloudlanguagetools.service.Service):
+    # lookups are local, a batch only needs to be bounded so that callers get results progressively
+    DICTIONARY_LOOKUP_BATCH_MAX_ITEMS = 10000
+    DICTIONARY_LOOKUP_BATCH_MAX_CHARACTERS = 1000000
+
     def __init__(self):
-        pass
+        # sqlite connections can't be shared across threads, each thread keeps its own
+        self.thread_local = threading.local()
+        self.lookup_views_cache = cachetools.LRUCache(maxsize=WENLIN_CACHE_MAX_ENTRIES)
+        self.lock = threading.Lock()
 
     def configure(self, config):
         pass
@@ -71,97 +154,144 @@ class WenlinService(cloudlanguagetools.service.Service):
                 WenlinDictionaryLookup(language, cloudlanguagetools.constants.DictionaryLookupType.PartOfSpeechDefinitions),
             ])
 
+        # reverse lookup, english word to chinese headwords
+        for target_language in [
+            cloudlanguagetools.languages.Language.zh_cn,
+            cloudlanguagetools.languages.Language.zh_tw,
+        ]:
+            result.append(WenlinDictionaryLookup(cloudlanguagetools.languages.Language.en,
+                cloudlanguagetools.constants.DictionaryLookupType.Definitions, target_language=target_language))
+
         return result
 
+    def open_connection(self, db_filepath):
+        # immutable: the file never changes while we use it, sqlite skips locking and change detection
+        uri = f'file:{urllib.parse.quote(db_filepath)}?mode=ro&immutable=1'
+        connection = sqlite3.connect(uri, uri=True)
+        connection.execute(f'PRAGMA mmap_size={WENLIN_MMAP_SIZE}')
+        logger.info(f'opened wenlin database {db_filepath}')
+        return connection
+
     def get_connection(self):
+        """read-only connection for the current thread, opened once and then reused"""
         db_filepath = clt_wenlin.get_wenlin_db_path()
-        connection = sqlite3.connect(db_filepath)
+        connection = getattr(self.thread_local, 'connection', None)
+        if connection is None or self.thread_local.db_filepath != db_filepath:
+            if connection is not None:
+                connection.close()
+            connection = self.open_connection(db_filepath)
+            self.thread_local.connection = connection
+            self.thread_local.db_filepath = db_filepath
         return connection
 
     def iterate_dictionary_results(self, text, lookup_key):
-        connection = self.get_connection()
-
         language = cloudlanguagetools.languages.Language[lookup_key['language']]
-        column_map = {
-            cloudlanguagetools.languages.Language.zh_cn: 'simplified',
-            cloudlanguagetools.languages.Language.zh_tw: 'traditional',
-            cloudlanguagetools.languages.Language.yue: 'traditional',
-        }
-        column = column_map[language]
+        yield from self.query_entries(text, language)
 
-        query = f"""SELECT entry FROM words WHERE {column}='{text}'"""
-        cur = connection.cursor()
-        for row in cur.execute(query):
-            entry_json_str = row[0]
-            entry_json = json.loads(entry_json_str)
-            yield entry_json
-
-        connection.close()
-
-    def collect_definitions(self, generator):
-        result = []
-        for entry in generator:
-            # definitions
-            for part_of_speech in entry['parts_of_speech']:
-                for definition in part_of_speech['definitions']:
-                    result.append(definition['definition'])        
-        return result
-
-    def collect_partofspeech(self, generator):
-        result = []
-        for entry in generator:
-            for part_of_speech in entry['parts_of_speech']:
-                result.append(part_of_speech['part_of_speech'])
-
-        result = list(set(result))
-        result.sort()                
+    def query_entries(self, text, language):
+        connection = self.get_connection()
+        rows = connection.execute(LOOKUP_QUERIES[language], (text,)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def get_lookup_views(self, text, language):
+        """all lookup-type views for text, from the cache, or from a single query"""
+        cache_key = (LOOKUP_COLUMNS[language], text)
+        with self.lock:
+            views = self.lookup_views_cache.get(cache_key)
+        if views is None:
+            views = build_lookup_views(self.query_entries(text, language))
+            with self.lock:
+                self.lookup_views_cache[cache_key] = views
+        return views
+
+    def query_entries_batch(self, texts, language):
+        """returns dict: text -> list of entries, using one query per BATCH_QUERY_MAX_ITEMS texts"""
+        connection = self.get_connection()
+        column = LOOKUP_COLUMNS[language]
+        result = {text: [] for text in texts}
+        texts = list(result.keys())
+        for start in range(0, len(texts), BATCH_QUERY_MAX_ITEMS):
+            chunk = texts[start:start + BATCH_QUERY_MAX_ITEMS]
+            placeholders = ','.join(['?'] * len(chunk))
+            query = f'SELECT {column}, entry FROM words WHERE {column} IN ({placeholders})'
+            for headword, entry_json_str in connection.execute(query, chunk).fetchall():
+                result[headword].append(json.loads(entry_json_str))
         return result
 
-    def collect_measureword(self, generator):
-        result = []
-        for entry in generator:
-            for part_of_speech in entry['parts_of_speech']:
-                for definition in part_of_speech['definitions']:
-                    if 'measure_word' in definition:
-                        result.append(definition['measure_word'])
-        result = list(set(result))
-        result.sort()                
-        return result                      
-
-    def collect_partofspeech_definitions(self, generator):
+    def get_lookup_views_batch(self, texts, language):
+        """returns dict: text -> lookup views, headwords which aren't cached are queried together"""
+        column = LOOKUP_COLUMNS[language]
         result = {}
-        for entry in generator:
-            for part_of_speech in entry['parts_of_speech']:
-                if part_of_speech['part_of_speech'] not in result:
-                    result[part_of_speech['part_of_speech']] = []
-                for definition in part_of_speech['definitions']:
-                    result[part_of_speech['part_of_speech']].append(definition['definition'])
+        with self.lock:
+            for text in texts:
+                views = self.lookup_views_cache.get((column, text))
+                if views is not None:
+                    result[text] = views
+        missing_texts = [text for text in dict.fromkeys(texts) if text not in result]
+        if len(missing_texts) > 0:
+            for text, entries in self.query_entries_batch(missing_texts, language).items():
+                result[text] = build_lookup_views(entries)
+            with self.lock:
+                for text in missing_texts:
+                    self.lookup_views_cache[(column, text)] = result[text]
         return result
 
-    def collect_result_check_empty(self, generator, collect_result_fn, text):
-        result = collect_result_fn(generator)
-
-        not_found_error_msg = f'Wenlin: no results found for {text}'
-
-        if type(result) is list:
-            if len(result) == 0:
-                raise cloudlanguagetools.errors.NotFoundError(not_found_error_msg)
-        if type(result) is dict:
-            if len(result.keys()) == 0:
-                raise cloudlanguagetools.errors.NotFoundError(not_found_error_msg)
-
+    def get_reverse_lookup(self, text, target_language):
+        """chinese headwords whose definitions match the english text, most relevant first"""
+        column = LOOKUP_COLUMNS[target_language]
+        cache_key = ('reverse', column, text)
+        with self.lock:
+            result = self.lookup_views_cache.get(cache_key)
+        if result is None:
+            match_expression = build_match_expression(text)
+            result = []
+            if match_expression is not None:
+                rows = self.get_connection().execute(REVERSE_LOOKUP_QUERY.format(column=column),
+                    (match_expression, REVERSE_LOOKUP_MAX_RESULTS * 5)).fetchall()
+                result = list(dict.fromkeys([row[0] for row in rows]))[:REVERSE_LOOKUP_MAX_RESULTS]
+            with self.lock:
+                self.lookup_views_cache[cache_key] = result
+        if len(result) == 0:
+            raise cloudlanguagetools.errors.NotFoundError(f'Wenlin: no results found for {text}')
+        return list(result)
+
+    def get_dictionary_lookup_batch(self, texts, lookup_key):
+        if 'target_language' in lookup_key:
+            target_language = cloudlanguagetools.languages.Language[lookup_key['target_language']]
+            result = []
+            for text in texts:
+                try:
+                    result.append(self.get_reverse_lookup(text, target_language))
+                except cloudlanguagetools.errors.NotFoundError as e:
+                    result.append(e)
+            return result
+        lookup_type = cloudlanguagetools.constants.DictionaryLookupType[lookup_key['lookup_type']]
+        language = cloudlanguagetools.languages.Language[lookup_key['language']]
+        views = self.get_lookup_views_batch(texts, language)
+        result = []
+        for text in texts:
+            view = views[text][lookup_type]
+            if len(view) == 0:
+                result.append(cloudlanguagetools.errors.NotFoundError(f'Wenlin: no results found for {text}'))
+            else:
+                result.append(copy_view(view))
         return result
 
     def get_dictionary_lookup(self, text, lookup_key):
+        if 'target_language' in lookup_key:
+            target_language = cloudlanguagetools.languages.Language[lookup_key['target_language']]
+            return self.get_reverse_lookup(text, target_language)
         lookup_type = cloudlanguagetools.constants.DictionaryLookupType[lookup_key['lookup_type']]
-        lookup_type_fn_map = {
-            cloudlanguagetools.constants.DictionaryLookupType.Definitions: self.collect_definitions,
-            cloudlanguagetools.constants.DictionaryLookupType.PartOfSpeech: self.collect_partofspeech,
-            cloudlanguagetools.constants.DictionaryLookupType.MeasureWord: self.collect_measureword,
-            cloudlanguagetools.constants.DictionaryLookupType.PartOfSpeechDefinitions: self.collect_partofspeech_definitions,
-        }
-
-        collect_result_fn = lookup_type_fn_map[lookup_type]
-        generator = self.iterate_dictionary_results(text, lookup_key)
-
-        return self.collect_result_check_empty(generator, collect_result_fn, text)
\ No newline at end of file
+        language = cloudlanguagetools.languages.Language[lookup_key['language']]
+        result = self.get_lookup_views(text, language)[lookup_type]
+        if len(result) == 0:
+            raise cloudlanguagetools.errors.NotFoundError(f'Wenlin: no results found for {text}')
+        return copy_view(result)
+
+    def get_dictionary_lookup_all_types(self, text, language=cloudlanguagetools.languages.Language.zh_cn):
+        """returns a dict: DictionaryLookupType -> result, for every lookup type, with a single query.
+        lookup types with no results for this text have an empty result."""
+        views = self.get_lookup_views(text, language)
+        if all([len(view) == 0 for view in views.values()]):
+            raise cloudlanguagetools.errors.NotFoundError(f'Wenlin: no results found for {text}')
+        return {lookup_type: copy_view(view) for lookup_type, view in views.items()}
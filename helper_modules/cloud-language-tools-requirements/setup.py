@@ -6,7 +6,7 @@ from setuptools import setup
 
 
 setup(name='clt_requirements',
-      version='2.3',
+      version='2.4',
       description='Helper module for Cloud Language Tools, additional dependencies',
       url='https://github.com/Vocab-Apps/cloud-language-tools-core',
       author='Luc',
@@ -19,7 +19,8 @@ setup(name='clt_requirements',
       packages=['clt_requirements'],
       install_requires=[
         'azure-cognitiveservices-speech',
-        'requests',
+        'requests',
+        'httpx',
         'google-cloud-texttospeech>=2.29.0',
         'google-cloud-translate',
         'boto3',
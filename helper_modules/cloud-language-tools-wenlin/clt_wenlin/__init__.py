@@ -6,11 +6,28 @@ import sqlite3
 import json
 import tempfile
 import hashlib
+import time
 
 logger = logging.getLogger(__name__)
 
 WENLIN_DB_REV = 'revA'
 
+# cidian.u8 line patterns, a line starts with a band name, optionally preceded by a sense number
+SENSE_NUMBER_CHARACTERS = '0123456789'
+PINYIN_PATTERN = re.compile(r'\.py\s+([^\s]+)')
+CHARACTERS_PATTERN = re.compile(r'char\s+(.+)$')
+ENTRY_ID_PATTERN = re.compile(r'ser\s+([0-9]+)$')
+DEFINITION_PATTERN = re.compile(r'[0-9]*(df[^\s]*|psx.{0,1})\s+(.+)$')
+PART_OF_SPEECH_PATTERN = re.compile(r'[0-9]*ps.{0,1}\s+(.+)$')
+MEASURE_WORD_PATTERN = re.compile(r'[0-9]*mw\s+(.+)$')
+EXAMPLE_PINYIN_PATTERN = re.compile(r'[0-9]*ex\s+(.+)$')
+EXAMPLE_CHINESE_PATTERN = re.compile(r'[0-9]*hz\s+(.+)$')
+EXAMPLE_TRANSLATION_PATTERN = re.compile(r'[0-9]*tr\s+(.+)$')
+CHARACTERS_SPLIT_PATTERN = re.compile(r'([^\]]+)\[(.*)\]')
+
+# number of entries inserted per transaction when building the database
+SQLITE_INSERT_BATCH_SIZE = 20000
+
 class Definition():
     def __init__(self, definition):
         # logger.debug(f'creating Definition [{definition}]')
@@ -117,7 +134,7 @@ class DictionaryEntry():
         return f'simplified: {self.simplified}'
 
 def process_characters(chars):
-    m = re.match('([^\]]+)\[(.*)\]', chars)
+    m = CHARACTERS_SPLIT_PATTERN.match(chars)
     if m == None:
         return chars, chars
     simplified = m.groups()[0]
@@ -138,127 +155,148 @@ def process_definition(definition):
     definition = definition.replace('[en] ', '')
     return definition
 
-def iterate_lines(lines):
+def iterate_entries(lines):
+    """parse the lines of cidian.u8, yielding each entry once all its lines have been read.
+    each line is dispatched on its band name (first two characters after the sense number),
+    so at most two patterns get tried per line."""
     current_entry = None
     ignore_current_entry = False
-    lines_read = 0    
-    entries = []    
-    ignored_entries = []
+    lines_read = 0
+    ignored_entries = 0
     for line in lines:
+        completed_entry = None
         try:
-            m = re.match('\.py\s+([^\s]+)', line)
-            if m != None:
-                pinyin = m.groups()[0]
-                if current_entry != None and ignore_current_entry == False:
-                    entries.append(current_entry)
-                if ignore_current_entry == True:
-                    ignored_entries.append(current_entry)
-                ignore_current_entry = False
-                current_entry = DictionaryEntry()
-                current_entry.pinyin = pinyin
-            m = re.match('char\s+(.+)$', line)
-            if m != None:
-                simplified, traditional = process_characters(m.groups()[0])
-                current_entry.simplified = simplified
-                current_entry.traditional = traditional
-
-            m = re.match('ser\s+([0-9]+)$', line)
-            if m != None:
-                current_entry.entry_id = int(m.groups()[0])
-
-            m = re.match('[0-9]*(df[^\s]*|psx.{0,1})\s+(.+)$', line)
-            if m != None:
-                definition = process_definition(m.groups()[1])
-                if definition != None:
-                    current_entry.add_definition(definition)
-                continue
-
-            m = re.match('[0-9]*ps.{0,1}\s+(.+)$', line)
-            if m != None:
-                current_entry.add_part_of_speech(m.groups()[0])
-                continue
-
-            m = re.match('[0-9]*mw\s+(.+)$', line)
-            if m != None:
-                current_entry.add_measure_word(m.groups()[0])
-
-            m = re.match('[0-9]*ex\s+(.+)$', line)
-            if m != None:
-                current_entry.add_example_pinyin(m.groups()[0])                
-
-            m = re.match('[0-9]*hz\s+(.+)$', line)
-            if m != None:
-                current_entry.add_example_chinese(m.groups()[0])
-
-            m = re.match('[0-9]*tr\s+(.+)$', line)
-            if m != None:
-                translation = process_definition(m.groups()[0])
-                if translation != None:
-                    current_entry.add_example_translation(translation)
+            band = line.lstrip(SENSE_NUMBER_CHARACTERS)[:2]
+            if band == '.p':
+                m = PINYIN_PATTERN.match(line)
+                if m != None:
+                    if ignore_current_entry == True:
+                        ignored_entries += 1
+                    elif current_entry != None:
+                        completed_entry = current_entry
+                    ignore_current_entry = False
+                    current_entry = DictionaryEntry()
+                    current_entry.pinyin = m.groups()[0]
+            elif band == 'ch':
+                m = CHARACTERS_PATTERN.match(line)
+                if m != None:
+                    simplified, traditional = process_characters(m.groups()[0])
+                    current_entry.simplified = simplified
+                    current_entry.traditional = traditional
+            elif band == 'se':
+                m = ENTRY_ID_PATTERN.match(line)
+                if m != None:
+                    current_entry.entry_id = int(m.groups()[0])
+            elif band == 'df' or band == 'ps':
+                # psx bands are definitions
+                m = DEFINITION_PATTERN.match(line)
+                if m != None:
+                    definition = process_definition(m.groups()[1])
+                    if definition != None:
+                        current_entry.add_definition(definition)
+                else:
+                    m = PART_OF_SPEECH_PATTERN.match(line)
+                    if m != None:
+                        current_entry.add_part_of_speech(m.groups()[0])
+            elif band == 'mw':
+                m = MEASURE_WORD_PATTERN.match(line)
+                if m != None:
+                    current_entry.add_measure_word(m.groups()[0])
+            elif band == 'ex':
+                m = EXAMPLE_PINYIN_PATTERN.match(line)
+                if m != None:
+                    current_entry.add_example_pinyin(m.groups()[0])
+            elif band == 'hz':
+                m = EXAMPLE_CHINESE_PATTERN.match(line)
+                if m != None:
+                    current_entry.add_example_chinese(m.groups()[0])
+            elif band == 'tr':
+                m = EXAMPLE_TRANSLATION_PATTERN.match(line)
+                if m != None:
+                    translation = process_definition(m.groups()[0])
+                    if translation != None:
+                        current_entry.add_example_translation(translation)
 
             lines_read += 1
-            if lines_read % 10000 == 0:
+            if lines_read % 100000 == 0:
                 logger.debug(f'read {lines_read} lines')
         except Exception as e:
             logger.exception(f'while processing {[line.strip()]}, {current_entry}')
             ignore_current_entry = True
-            # raise e
 
-    if ignore_current_entry == False:
-        entries.append(current_entry)
+        if completed_entry != None:
+            yield completed_entry
 
-    logger.error(f'ignored entries: {len(ignored_entries)}')
+    if ignore_current_entry == False and current_entry != None:
+        yield current_entry
+    elif ignore_current_entry == True:
+        ignored_entries += 1
 
-    return entries
+    logger.error(f'ignored entries: {ignored_entries}')
+
+def iterate_lines(lines):
+    return list(iterate_entries(lines))
 
 def read_dictionary_file(filepath):
-    f = open(filepath, 'r')
-    entries = iterate_lines(f)
-    f.close()
+    with open(filepath, 'r') as f:
+        entries = iterate_lines(f)
 
     return entries
 
+def iterate_batches(entries, batch_size):
+    batch = []
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if len(batch) > 0:
+        yield batch
+
 def create_sqlite_file(dict_filepath, sqlite_filepath):
-    entries = read_dictionary_file(dict_filepath)
+    start_time = time.time()
 
     connection = sqlite3.connect(sqlite_filepath)
     cur = connection.cursor()
 
-    # add word entries (lookup from chinese characters)
-    # =================================================
+    # the database is built from scratch, if the build gets interrupted it has to be started over anyway,
+    # so skip the rollback journal and the fsyncs
+    cur.execute('PRAGMA journal_mode = OFF')
+    cur.execute('PRAGMA synchronous = OFF')
 
+    # words: lookup from chinese characters
+    # definitions: full text search on the definitions
     cur.execute('''CREATE TABLE words (simplified text, traditional text, entry text, entry_id integer)''')
-
-    for entry in entries:
-        json_string = json.dumps(entry.to_dict())
-        # query = f"""INSERT INTO words VALUES ('{entry.simplified}', '{entry.traditional}', '{json_string}')"""
-        cur.execute("INSERT INTO words VALUES (?, ?, ?, ?)", 
-                    (entry.simplified, entry.traditional, json_string, entry.entry_id))
-    connection.commit()
-        
-    # add indices
-    create_index_query = """CREATE INDEX idx_simplified ON words (simplified);"""
-    cur.execute(create_index_query)
-    create_index_query = """CREATE INDEX idx_traditional ON words (traditional);"""
-    cur.execute(create_index_query)
-    create_index_query = """CREATE UNIQUE INDEX idx_entry_id ON words (entry_id);"""
-    cur.execute(create_index_query)    
-
-    connection.commit()
-
-    # add definitions
-    # ===============
     cur.execute('''CREATE VIRTUAL TABLE definitions USING FTS5(definition, entry_id);''')
-    connection.commit()
 
-    for entry in entries:
-        definitions = entry.get_all_definitions()
-        for definition in definitions:
-            cur.execute("INSERT INTO definitions VALUES (?, ?)", (definition, entry.entry_id))
+    # entries are streamed from the dictionary file and inserted in batches
+    entry_count = 0
+    definition_count = 0
+    with open(dict_filepath, 'r') as f:
+        for batch in iterate_batches(iterate_entries(f), SQLITE_INSERT_BATCH_SIZE):
+            words_rows = [(entry.simplified, entry.traditional, json.dumps(entry.to_dict()), entry.entry_id) for entry in batch]
+            definitions_rows = [(definition, entry.entry_id) for entry in batch for definition in entry.get_all_definitions()]
+            cur.executemany("INSERT INTO words VALUES (?, ?, ?, ?)", words_rows)
+            cur.executemany("INSERT INTO definitions VALUES (?, ?)", definitions_rows)
+            connection.commit()
+            entry_count += len(words_rows)
+            definition_count += len(definitions_rows)
+            logger.debug(f'inserted {entry_count} entries')
+
+    # add indices, once all the rows are in
+    cur.execute("""CREATE INDEX idx_simplified ON words (simplified);""")
+    cur.execute("""CREATE INDEX idx_traditional ON words (traditional);""")
+    cur.execute("""CREATE UNIQUE INDEX idx_entry_id ON words (entry_id);""")
+    # merge the full text index b-trees
+    cur.execute("""INSERT INTO definitions(definitions) VALUES('optimize');""")
     connection.commit()
 
     connection.close()
 
+    elapsed = time.time() - start_time
+    logger.info(f'created {sqlite_filepath} in {elapsed:.1f}s: {entry_count} entries, {definition_count} definitions '
+                f'({entry_count / max(elapsed, 0.001):.0f} entries/s)')
+
 def get_wenlin_db_path():
     return os.path.join('/clt_data', f'wenlin_{WENLIN_DB_REV}.db')
 
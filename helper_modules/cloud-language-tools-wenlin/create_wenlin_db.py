@@ -3,6 +3,10 @@
 from genericpath import isfile
 import clt_wenlin
 import os
+import logging
+
+# report build progress and throughput
+logging.basicConfig(level=logging.INFO)
 
 sqlite_filepath = 'wenlin.db'
 if os.path.isfile(sqlite_filepath):
@@ -398,6 +398,34 @@ timestamp 2015-06-25T14:46:25Z"""
 
 
 
+    def test_iterate_entries(self):
+        input = """.py   āizhe
+char   挨着[-著]
+ser   1000039833
+1ps   v.
+1df   be next to; get close to
+.py   xuésheng
+char   学生[學-]
+ser   1000100002
+rem   no part of speech
+df   student
+"""
+        lines = input.split('\n')
+        entries = clt_wenlin.iterate_entries(iter(lines))
+
+        # entries are yielded as soon as the next one starts
+        entry = next(entries)
+        self.assertEqual(entry.traditional, '挨著')
+        self.assertEqual(entry.get_all_definitions(), ['be next to; get close to'])
+        entry = next(entries)
+        self.assertEqual(entry.entry_id, 1000100002)
+        self.assertEqual(entry.parts_of_speech[0].part_of_speech, None)
+        self.assertEqual(entry.get_all_definitions(), ['student'])
+        self.assertEqual(list(entries), [])
+
+        self.assertEqual(clt_wenlin.iterate_lines([]), [])
+
+
     def test_parse_full_file(self):
         entries = clt_wenlin.read_dictionary_file('/home/luc/cpp/wenlin/server/cidian.u8')
 
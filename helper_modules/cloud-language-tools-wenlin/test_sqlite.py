@@ -3,9 +3,48 @@ import clt_wenlin
 import tempfile
 import sqlite3
 import json
+import os
+from unittest.mock import patch
 
 
 class TestWenlinSqlite(unittest.TestCase):
+    def test_create_sqlite_file_batches(self):
+        input = ''
+        for i in range(25):
+            input += f""".py   ci{i}
+char   词{i}[詞--]
+ser   {1000000000 + i}
+ps   n.
+df   [en] word number {i}
+df   [fr] mot numéro {i}
+"""
+        temp_dir = tempfile.TemporaryDirectory()
+        dictionary_filepath = os.path.join(temp_dir.name, 'cidian.u8')
+        with open(dictionary_filepath, 'w') as f:
+            f.write(input)
+        sqlite_filepath = os.path.join(temp_dir.name, 'wenlin.db')
+
+        # several transactions, the last one not full
+        with patch('clt_wenlin.SQLITE_INSERT_BATCH_SIZE', 10):
+            clt_wenlin.create_sqlite_file(dictionary_filepath, sqlite_filepath)
+
+        connection = sqlite3.connect(sqlite_filepath)
+        cur = connection.cursor()
+        self.assertEqual(cur.execute('SELECT COUNT(*) FROM words').fetchone()[0], 25)
+        simplified, traditional, entry, entry_id = cur.execute("SELECT * FROM words WHERE traditional='詞24'").fetchone()
+        self.assertEqual(simplified, '词24')
+        self.assertEqual(entry_id, 1000000024)
+        self.assertEqual(json.loads(entry)['parts_of_speech'], [{'part_of_speech': 'n.', 'definitions': [{'definition': 'word number 24'}]}])
+
+        results = cur.execute("SELECT definition, entry_id FROM definitions WHERE definitions MATCH '12 OR 13'").fetchall()
+        self.assertEqual(results, [('word number 12', 1000000012), ('word number 13', 1000000013)])
+
+        indices = [row[0] for row in cur.execute("SELECT name FROM sqlite_master WHERE type='index'")]
+        self.assertEqual(sorted(indices), ['idx_entry_id', 'idx_simplified', 'idx_traditional'])
+
+        connection.close()
+        temp_dir.cleanup()
+
     def test_create_sqlite_file(self):
         dictionary_filepath = '/home/luc/cpp/wenlin/server/cidian.u8'
         sqlite_tempfile = tempfile.NamedTemporaryFile(suffix='.db')
@@ -1,5 +1,6 @@
 import os
 import sys
+import time
 from unittest.mock import patch, MagicMock
 
 import pytest
@@ -69,6 +70,12 @@ def _build_failed_synth_result(error_details):
 
 
 class TestAzureGetTtsAudioErrors:
+    @pytest.fixture(autouse=True)
+    def mock_connection(self):
+        # synthesizers pre-open their connection
+        with patch('cloudlanguagetools.azure.azure.cognitiveservices.speech.Connection'):
+            yield
+
     def _make_service(self):
         service = cloudlanguagetools.azure.AzureService()
         service.configure({'key': 'fake-key', 'region': 'eastus'})
@@ -102,3 +109,86 @@ class TestAzureGetTtsAudioErrors:
 
         assert 'WebSocket connection closed unexpectedly' in str(exc_info.value)
         assert not isinstance(exc_info.value, cloudlanguagetools.errors.TimeoutError)
+
+
+def _build_completed_synth_result(audio_data):
+    result = MagicMock()
+    result.reason = azure.cognitiveservices.speech.ResultReason.SynthesizingAudioCompleted
+    result.audio_data = audio_data
+    return result
+
+
+@patch('cloudlanguagetools.azure.azure.cognitiveservices.speech.Connection')
+@patch('cloudlanguagetools.azure.azure.cognitiveservices.speech.SpeechSynthesizer')
+@patch('cloudlanguagetools.azure.azure.cognitiveservices.speech.SpeechConfig')
+class TestAzureSynthesizerPool:
+    def _make_service(self):
+        service = cloudlanguagetools.azure.AzureService()
+        service.configure({'key': 'fake-key', 'region': 'eastus'})
+        return service
+
+    def test_synthesizer_reused(self, mock_speech_config, mock_synthesizer_cls, mock_connection_cls):
+        mock_synthesizer_cls.return_value.speak_ssml.return_value = _build_completed_synth_result(b'audio')
+
+        service = self._make_service()
+        for i in range(3):
+            audio = service.get_tts_audio('hello', {'name': 'en-US-JennyNeural'}, {})
+            assert audio.bytes == b'audio'
+
+        assert mock_synthesizer_cls.call_count == 1
+        # the connection is opened ahead of the first request
+        mock_connection_cls.from_speech_synthesizer.return_value.open.assert_called_once_with(True)
+        assert service.synthesizer_pool.get_stats() == {'created': 1, 'reused': 2, 'discarded': 0, 'idle': 1}
+
+    def test_one_synthesizer_per_output_format(self, mock_speech_config, mock_synthesizer_cls, mock_connection_cls):
+        mock_synthesizer_cls.return_value.speak_ssml.return_value = _build_completed_synth_result(b'audio')
+
+        service = self._make_service()
+        service.get_tts_audio('hello', {'name': 'en-US-JennyNeural'}, {})
+        service.get_tts_audio('hello', {'name': 'en-US-JennyNeural'}, {'format': 'ogg_opus'})
+        service.get_tts_audio('hello', {'name': 'en-US-JennyNeural'}, {'format': 'ogg_opus'})
+
+        assert mock_synthesizer_cls.call_count == 2
+        assert service.synthesizer_pool.get_stats()['idle'] == 2
+
+    def test_failed_synthesizer_discarded(self, mock_speech_config, mock_synthesizer_cls, mock_connection_cls):
+        mock_synthesizer_cls.return_value.speak_ssml.return_value = _build_failed_synth_result('WebSocket connection closed unexpectedly')
+
+        service = self._make_service()
+        with pytest.raises(cloudlanguagetools.errors.RequestError):
+            service.get_tts_audio('hello', {'name': 'en-US-JennyNeural'}, {})
+        assert service.synthesizer_pool.get_stats()['idle'] == 0
+
+        mock_synthesizer_cls.return_value.speak_ssml.return_value = _build_completed_synth_result(b'audio')
+        service.get_tts_audio('hello', {'name': 'en-US-JennyNeural'}, {})
+        assert mock_synthesizer_cls.call_count == 2
+
+    def test_disconnected_or_idle_synthesizer_discarded(self, mock_speech_config, mock_synthesizer_cls, mock_connection_cls):
+        mock_synthesizer_cls.return_value.speak_ssml.return_value = _build_completed_synth_result(b'audio')
+
+        service = self._make_service()
+        service.get_tts_audio('hello', {'name': 'en-US-JennyNeural'}, {})
+        # the service closed the connection
+        idle_synthesizer = service.synthesizer_pool.idle[('eastus', 'Audio24Khz96KBitRateMonoMp3')][0]
+        idle_synthesizer.on_disconnected(None)
+        service.get_tts_audio('hello', {'name': 'en-US-JennyNeural'}, {})
+        assert mock_synthesizer_cls.call_count == 2
+
+        # idle for too long
+        idle_synthesizer = service.synthesizer_pool.idle[('eastus', 'Audio24Khz96KBitRateMonoMp3')][0]
+        idle_synthesizer.released_at -= cloudlanguagetools.azure.SYNTHESIZER_MAX_IDLE_TIME
+        service.get_tts_audio('hello', {'name': 'en-US-JennyNeural'}, {})
+        assert mock_synthesizer_cls.call_count == 3
+        assert service.synthesizer_pool.get_stats()['discarded'] == 2
+
+    def test_timed_out_synthesizer_discarded(self, mock_speech_config, mock_synthesizer_cls, mock_connection_cls):
+        def slow_speak_ssml(ssml):
+            time.sleep(0.5)
+            return _build_completed_synth_result(b'audio')
+        mock_synthesizer_cls.return_value.speak_ssml.side_effect = slow_speak_ssml
+
+        service = self._make_service()
+        with patch('cloudlanguagetools.constants.RequestTimeout', 0.1):
+            with pytest.raises(cloudlanguagetools.errors.TimeoutError):
+                service.get_tts_audio('hello', {'name': 'en-US-JennyNeural'}, {})
+        assert service.synthesizer_pool.get_stats()['idle'] == 0
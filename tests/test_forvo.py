@@ -19,7 +19,7 @@ class TestForvoGetTtsAudio(unittest.TestCase):
         self.voice_key = {'language_code': 'en', 'country_code': 'ANY'}
         self.options = {}
 
-    @patch('cloudlanguagetools.forvo.requests.get')
+    @patch('cloudlanguagetools.service.Service.http_get')
     def test_forvo_404_redirect_raises_not_found(self, mock_get):
         """When Forvo redirects the API request to its 404 page, raise NotFoundError."""
         mock_response = MagicMock()
@@ -33,7 +33,7 @@ class TestForvoGetTtsAudio(unittest.TestCase):
 
         self.assertIn('nonexistent', str(ctx.exception))
 
-    @patch('cloudlanguagetools.forvo.requests.get')
+    @patch('cloudlanguagetools.service.Service.http_get')
     def test_forvo_empty_items_raises_not_found(self, mock_get):
         """When Forvo returns an empty items list, raise NotFoundError."""
         mock_response = MagicMock()
@@ -48,7 +48,7 @@ class TestForvoGetTtsAudio(unittest.TestCase):
 
         self.assertIn('rareword', str(ctx.exception))
 
-    @patch('cloudlanguagetools.forvo.requests.get')
+    @patch('cloudlanguagetools.service.Service.http_get')
     def test_forvo_read_timeout_raises_timeout(self, mock_get):
         """A read timeout from requests.exceptions.Timeout maps to TimeoutError."""
         mock_get.side_effect = requests.exceptions.ReadTimeout('Read timed out.')
@@ -56,7 +56,7 @@ class TestForvoGetTtsAudio(unittest.TestCase):
         with self.assertRaises(cloudlanguagetools.errors.TimeoutError):
             self.service.get_tts_audio('word', self.voice_key, self.options)
 
-    @patch('cloudlanguagetools.forvo.requests.get')
+    @patch('cloudlanguagetools.service.Service.http_get')
     def test_forvo_body_read_timeout_raises_timeout(self, mock_get):
         """When requests wraps urllib3 ReadTimeoutError in ConnectionError
         (timeout during response body read), it must still map to TimeoutError."""
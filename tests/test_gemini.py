@@ -5,9 +5,13 @@ from unittest.mock import patch, MagicMock
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import base64
+import json
 import google.api_core.exceptions
 import cloudlanguagetools.gemini
 import cloudlanguagetools.errors
+import cloudlanguagetools.serviceregistry
+from cloudlanguagetools.constants import Service
 
 
 class TestGeminiTtsInvalidArgument(unittest.TestCase):
@@ -50,5 +54,25 @@ class TestGeminiTtsDeadlineExceeded(unittest.TestCase):
             service.get_tts_audio('hello', self.VOICE_KEY, self.OPTIONS)
 
 
+
+class TestGeminiConfiguration(unittest.TestCase):
+
+    GOOGLE_CONFIG = {'key': base64.b64encode(json.dumps({'type': 'service_account'}).encode('utf-8')).decode('utf-8')}
+
+    @patch.dict(os.environ, {}, clear=False)
+    def test_configured_with_google_key_without_google_service(self):
+        """Gemini gets the Google key when it is loaded first, or when Google isn't enabled."""
+        os.environ.pop('GOOGLE_APPLICATION_CREDENTIALS', None)
+        registry = cloudlanguagetools.serviceregistry.ServiceRegistry(cloudlanguagetools.serviceregistry.SERVICE_MODULES,
+            enabled_services=['Gemini'])
+        registry.configure(Service.Google, self.GOOGLE_CONFIG)
+        service = registry[Service.Gemini]
+        self.assertFalse(registry.is_loaded(Service.Google))
+        credentials_path = os.environ['GOOGLE_APPLICATION_CREDENTIALS']
+        self.assertEqual(credentials_path, service.google_key_temp_file.name)
+        with open(credentials_path) as f:
+            self.assertEqual(json.load(f), {'type': 'service_account'})
+
+
 if __name__ == '__main__':
     unittest.main()
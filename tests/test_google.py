@@ -1,5 +1,6 @@
 import os
 import sys
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 
@@ -11,6 +12,7 @@ import cloudlanguagetools.translationlanguage
 import cloudlanguagetools.ttsvoice
 import cloudlanguagetools.google
 import cloudlanguagetools.errors
+import cloudlanguagetools.googleclient
 
 
 class MockVoiceData:
@@ -173,5 +175,72 @@ class TestGoogleTtsRateLimit(unittest.TestCase):
         self.assertEqual(ctx.exception.retry_after, 60)
 
 
+class TestGoogleClientPool(unittest.TestCase):
+
+    VOICE_KEY = {
+        'name': 'en-US-Standard-A',
+        'language_code': 'en-US',
+        'ssml_gender': 'FEMALE',
+    }
+
+    def setUp(self):
+        self.key_file = tempfile.NamedTemporaryFile()
+        patcher = patch.dict(os.environ, {'GOOGLE_APPLICATION_CREDENTIALS': self.key_file.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.key_file.close()
+
+    def test_clients_reused_round_robin(self):
+        factory = MagicMock(side_effect=lambda: MagicMock())
+        pool = cloudlanguagetools.googleclient.ClientPool(factory, size=2)
+        clients = [pool.get() for i in range(4)]
+        self.assertEqual(factory.call_count, 2)
+        self.assertIsNot(clients[0], clients[1])
+        self.assertIs(clients[0], clients[2])
+        self.assertIs(clients[1], clients[3])
+
+    def test_credentials_change(self):
+        factory = MagicMock(side_effect=lambda: MagicMock())
+        pool = cloudlanguagetools.googleclient.ClientPool(factory)
+        client_1 = pool.get()
+        with tempfile.NamedTemporaryFile() as new_key_file:
+            with patch.dict(os.environ, {'GOOGLE_APPLICATION_CREDENTIALS': new_key_file.name}):
+                client_2 = pool.get()
+        self.assertIsNot(client_1, client_2)
+        self.assertEqual(factory.call_count, 2)
+
+    def test_discard_after_channel_failure(self):
+        factory = MagicMock(side_effect=lambda: MagicMock())
+        pool = cloudlanguagetools.googleclient.ClientPool(factory)
+        client_1 = pool.get()
+        pool.discard(client_1, google.api_core.exceptions.InvalidArgument('bad input'))
+        self.assertIs(pool.get(), client_1)
+        pool.discard(client_1, google.api_core.exceptions.ServiceUnavailable('connection reset'))
+        self.assertIsNot(pool.get(), client_1)
+        self.assertEqual(factory.call_count, 2)
+
+    @patch('google.cloud.texttospeech.TextToSpeechClient')
+    def test_tts_client_shared_across_requests(self, mock_client_class):
+        mock_client_class.return_value.synthesize_speech.return_value.audio_content = b'audio'
+        service = cloudlanguagetools.google.GoogleService()
+        service.tts_clients.factory = mock_client_class
+        for i in range(3):
+            service.get_tts_audio('hello', self.VOICE_KEY, {})
+        self.assertEqual(mock_client_class.call_count, cloudlanguagetools.googleclient.GRPC_CLIENT_POOL_SIZE)
+        self.assertEqual(mock_client_class.return_value.synthesize_speech.call_count, 3)
+
+    def test_tts_client_discarded_on_unavailable(self):
+        factory = MagicMock(side_effect=lambda: MagicMock())
+        service = cloudlanguagetools.google.GoogleService()
+        service.tts_clients = cloudlanguagetools.googleclient.ClientPool(factory)
+        client = service.get_client()
+        client.synthesize_speech.side_effect = google.api_core.exceptions.ServiceUnavailable('connection reset')
+        with self.assertRaises(cloudlanguagetools.errors.RequestError):
+            service.get_tts_audio('hello', self.VOICE_KEY, {})
+        self.assertIsNot(service.get_client(), client)
+
+
 if __name__ == '__main__':
     unittest.main()
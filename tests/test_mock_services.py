@@ -1,7 +1,15 @@
+import io
+import shutil
 import os
 import sys
+import time
+import tempfile
+import subprocess
+import threading
 import logging
 import unittest
+import wave
+import asyncio
 import json
 import pytest
 import pprint
@@ -15,8 +23,24 @@ import requests.exceptions
 import cloudlanguagetools
 import cloudlanguagetools.servicemanager
 from cloudlanguagetools.languages import Language
-from cloudlanguagetools.constants import Service
+from cloudlanguagetools.constants import Service, Catalog
+import cloudlanguagetools.constants
+import cloudlanguagetools.test_services
+import cloudlanguagetools.service
+import cloudlanguagetools.catalogstore
+import cloudlanguagetools.chatapi
+import cloudlanguagetools.concurrency
+import cloudlanguagetools.translationcache
+import cloudlanguagetools.audiocache
+import cloudlanguagetools.singleflight
+import cloudlanguagetools.audioresult
+import cloudlanguagetools.audio_processing
+import cloudlanguagetools.options
 import cloudlanguagetools.errors
+import cloudlanguagetools.textsegmentation
+import cloudlanguagetools.transcoding
+import pydub
+import pydub.generators
 
 def get_manager():
     manager = cloudlanguagetools.servicemanager.ServiceManager()
@@ -175,3 +199,1206 @@ class TestTtsAudioV5(unittest.TestCase):
             with self.assertRaises(cloudlanguagetools.errors.TransientError) as ctx:
                 self.manager.get_tts_audio_v5('hello', 'TestServiceA', {'voice_id': 'paul'}, {})
             self.assertIs(ctx.exception.__cause__, original)
+
+
+@pytest.mark.skipif(
+    os.environ.get('CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES', 'no') != 'yes',
+    reason='you must set CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES=yes'
+)
+class TestLazyServiceLoading(unittest.TestCase):
+    """Tests for lazy service instantiation in ServiceManager."""
+
+    def test_no_service_loaded_on_construction(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        self.assertEqual(manager.get_enabled_services(), [Service.TestServiceA, Service.TestServiceB])
+        self.assertFalse(manager.services.is_loaded(Service.TestServiceA))
+        self.assertFalse(manager.services.is_loaded(Service.TestServiceB))
+
+    def test_service_loaded_on_first_use(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        manager.get_translation('text_input', 'TestServiceA', 'fr', 'en')
+        self.assertTrue(manager.services.is_loaded(Service.TestServiceA))
+        self.assertFalse(manager.services.is_loaded(Service.TestServiceB))
+        self.assertIn(Service.TestServiceA, manager.services.load_times)
+        # same instance is returned on subsequent accesses, including by name
+        self.assertIs(manager.services[Service.TestServiceA], manager.services['TestServiceA'])
+
+    def test_configuration_applied_on_load(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        with patch('cloudlanguagetools.test_services.TestServiceBase.configure') as mock_configure:
+            manager.configure_services({'TestServiceB': {'key': 'abcd'}})
+            self.assertFalse(manager.services.is_loaded(Service.TestServiceB))
+            mock_configure.assert_not_called()
+            manager.services[Service.TestServiceB]
+            mock_configure.assert_called_once_with({'key': 'abcd'})
+
+    def test_listing_loads_all_services(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        voice_list = manager.get_tts_voice_list()
+        self.assertEqual(set([voice.service for voice in voice_list]), set([Service.TestServiceA, Service.TestServiceB]))
+        self.assertTrue(manager.services.is_loaded(Service.TestServiceA))
+        self.assertTrue(manager.services.is_loaded(Service.TestServiceB))
+
+    def test_enabled_services(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager(enabled_services=['TestServiceB'])
+        self.assertEqual(manager.get_enabled_services(), [Service.TestServiceB])
+        self.assertNotIn(Service.TestServiceA, manager.services)
+        with self.assertRaises(KeyError):
+            manager.get_translation('text_input', 'TestServiceA', 'fr', 'en')
+        translation_languages = manager.get_translation_language_list()
+        self.assertEqual(set([x.service for x in translation_languages]), set([Service.TestServiceB]))
+
+    def test_unknown_enabled_service(self):
+        with self.assertRaises(ValueError):
+            cloudlanguagetools.servicemanager.ServiceManager(enabled_services=['Azure'])
+
+
+@pytest.mark.skipif(
+    os.environ.get('CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES', 'no') != 'yes',
+    reason='you must set CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES=yes'
+)
+class TestCatalogAggregation(unittest.TestCase):
+    """Tests for concurrent catalog retrieval across services."""
+
+    def test_complete_catalog(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        catalog_result = manager.get_catalog(Catalog.translation_language_list)
+        self.assertTrue(catalog_result.complete)
+        self.assertEqual(catalog_result.failed_services(), [])
+        self.assertEqual(set([x.service for x in catalog_result.entries]), set([Service.TestServiceA, Service.TestServiceB]))
+        status = manager.get_catalog_status_json()
+        self.assertEqual(status['translation_language_list']['TestServiceA']['status'], 'ok')
+
+    def test_failed_service_returns_partial_results(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        with patch('cloudlanguagetools.test_services.TestServiceB.get_translation_language_list',
+                   side_effect=cloudlanguagetools.errors.RequestError('service unavailable')):
+            translation_languages = manager.get_translation_language_list()
+        self.assertEqual(set([x.service for x in translation_languages]), set([Service.TestServiceA]))
+        catalog_result = manager.get_catalog(Catalog.translation_language_list)
+        self.assertFalse(catalog_result.complete)
+        self.assertEqual(catalog_result.failed_services(), [Service.TestServiceB])
+        status = catalog_result.status_json()
+        self.assertEqual(status['TestServiceB']['status'], 'error')
+        self.assertIn('service unavailable', status['TestServiceB']['error'])
+
+    def test_slow_service_times_out(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        original_method = cloudlanguagetools.test_services.TestServiceB.get_translation_language_list
+        def slow_language_list(service):
+            time.sleep(2)
+            return original_method(service)
+        with patch('cloudlanguagetools.test_services.TestServiceB.get_translation_language_list', slow_language_list):
+            start_time = time.time()
+            catalog_result = manager.aggregate_catalog(Catalog.translation_language_list, timeout=0.5)
+            elapsed = time.time() - start_time
+        self.assertLess(elapsed, 1.5)
+        self.assertEqual(set([x.service for x in catalog_result.entries]), set([Service.TestServiceA]))
+        self.assertEqual(catalog_result.status_json()['TestServiceB']['status'], 'timeout')
+
+    def test_services_queried_concurrently(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        original_method = cloudlanguagetools.test_services.TestServiceBase.get_tts_voice_list
+        def slow_voice_list(service):
+            time.sleep(0.5)
+            return original_method(service)
+        with patch('cloudlanguagetools.test_services.TestServiceBase.get_tts_voice_list', slow_voice_list):
+            start_time = time.time()
+            voice_list = manager.get_tts_voice_list()
+            elapsed = time.time() - start_time
+        self.assertEqual(len(voice_list), 2)
+        self.assertLess(elapsed, 0.9)
+
+    def test_failed_service_retried_sooner(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        with patch('cloudlanguagetools.test_services.TestServiceA.get_tokenization_options', side_effect=Exception('failure')):
+            start_time = time.time()
+            manager.get_tokenization_options()
+        entry_a = manager.catalog_store.get(Catalog.tokenization_options, Service.TestServiceA)
+        entry_b = manager.catalog_store.get(Catalog.tokenization_options, Service.TestServiceB)
+        self.assertIsNone(entry_a.entries)
+        self.assertLess(entry_a.expires_at, start_time + cloudlanguagetools.constants.TTLCachePartialTimeout + 5)
+        self.assertGreater(entry_b.expires_at, start_time + cloudlanguagetools.constants.TTLCacheTimeout - 5)
+
+
+@pytest.mark.skipif(
+    os.environ.get('CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES', 'no') != 'yes',
+    reason='you must set CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES=yes'
+)
+class TestCatalogStore(unittest.TestCase):
+    """Tests for the persistent catalog store and stale-while-revalidate refresh."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.snapshot_path = os.path.join(self.temp_dir.name, 'catalog_snapshot.pickle')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def get_manager(self, **kwargs):
+        catalog_store = cloudlanguagetools.catalogstore.CatalogStore(snapshot_path=self.snapshot_path, **kwargs)
+        return cloudlanguagetools.servicemanager.ServiceManager(catalog_store=catalog_store)
+
+    def wait_for_refresh(self, manager):
+        deadline = time.time() + 5
+        while len(manager.catalog_store.refreshing) > 0 and time.time() < deadline:
+            time.sleep(0.01)
+
+    def test_snapshot_loaded_on_startup(self):
+        manager = self.get_manager()
+        translation_languages = manager.get_translation_language_list()
+        self.assertTrue(os.path.exists(self.snapshot_path))
+
+        # a new process starts from the snapshot, without querying or even loading services
+        manager = self.get_manager()
+        with patch('cloudlanguagetools.test_services.TestServiceBase.get_translation_language_list', side_effect=Exception('should not be called')):
+            snapshot_languages = manager.get_translation_language_list()
+        self.assertEqual([x.json_obj() for x in snapshot_languages], [x.json_obj() for x in translation_languages])
+        self.assertFalse(manager.services.is_loaded(Service.TestServiceA))
+        self.assertFalse(manager.services.is_loaded(Service.TestServiceB))
+
+    def test_stale_entry_served_while_refreshing(self):
+        manager = self.get_manager()
+        voice_list = manager.get_tts_voice_list()
+        self.assertEqual(len(voice_list), 2)
+        manager.catalog_store.get(Catalog.tts_voice_list, Service.TestServiceB).expires_at = 0
+
+        refresh_started = threading.Event()
+        release_refresh = threading.Event()
+        def slow_voice_list(service):
+            refresh_started.set()
+            release_refresh.wait(5)
+            return []
+        with patch('cloudlanguagetools.test_services.TestServiceB.get_tts_voice_list', slow_voice_list):
+            # the stale entry is returned right away
+            self.assertEqual(len(manager.get_tts_voice_list()), 2)
+            self.assertTrue(refresh_started.wait(5))
+            # only one refresh in flight
+            self.assertEqual(len(manager.get_tts_voice_list()), 2)
+            release_refresh.set()
+            self.wait_for_refresh(manager)
+        self.assertEqual(set([voice.service for voice in manager.get_tts_voice_list()]), set([Service.TestServiceA]))
+        status = manager.get_catalog_status_json()['tts_voice_list']
+        self.assertFalse(status['TestServiceB']['stale'])
+
+    def test_failed_refresh_keeps_stale_entries(self):
+        manager = self.get_manager()
+        manager.get_translation_language_list()
+        manager.catalog_store.get(Catalog.translation_language_list, Service.TestServiceB).expires_at = 0
+        expires_at_a = manager.catalog_store.get(Catalog.translation_language_list, Service.TestServiceA).expires_at
+        with patch('cloudlanguagetools.test_services.TestServiceB.get_translation_language_list', side_effect=Exception('failure')):
+            manager.get_translation_language_list()
+            self.wait_for_refresh(manager)
+        catalog_result = manager.get_catalog(Catalog.translation_language_list)
+        self.assertEqual(set([x.service for x in catalog_result.entries]), set([Service.TestServiceA, Service.TestServiceB]))
+        self.assertEqual(catalog_result.failed_services(), [Service.TestServiceB])
+        # other services are not affected
+        self.assertEqual(manager.catalog_store.get(Catalog.translation_language_list, Service.TestServiceA).expires_at, expires_at_a)
+
+    def test_per_service_ttl(self):
+        manager = self.get_manager(service_ttl={Service.TestServiceA: 60})
+        manager.get_tokenization_options()
+        entry_a = manager.catalog_store.get(Catalog.tokenization_options, Service.TestServiceA)
+        entry_b = manager.catalog_store.get(Catalog.tokenization_options, Service.TestServiceB)
+        self.assertAlmostEqual(entry_a.expires_at - entry_a.retrieved_at, 60)
+        self.assertAlmostEqual(entry_b.expires_at - entry_b.retrieved_at, cloudlanguagetools.constants.TTLCacheTimeout)
+
+
+@pytest.mark.skipif(
+    os.environ.get('CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES', 'no') != 'yes',
+    reason='you must set CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES=yes'
+)
+class TestCatalogIndex(unittest.TestCase):
+    """Tests for the indexes built over the translation/transliteration/dictionary catalogs."""
+
+    def test_translation_language_pair_matrix(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        self.assertEqual(manager.get_translation_services(Language.fr, Language.en), frozenset([Service.TestServiceA, Service.TestServiceB]))
+        self.assertEqual(manager.get_translation_services(Language.fr, Language.de), frozenset())
+
+        translation_index = manager.get_translation_index()
+        source_entry, target_entry = translation_index.get_language_pair(Service.TestServiceB, Language.zh_cn, Language.en)
+        self.assertEqual(source_entry.get_language_id(), 'zh')
+        self.assertEqual(target_entry.get_language_id(), 'en')
+        self.assertIsNone(translation_index.get_language_pair(Service.TestServiceB, Language.zh_cn, Language.de))
+
+    def test_index_rebuilt_on_refresh(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        translation_index = manager.get_translation_index()
+        self.assertIs(manager.get_translation_index(), translation_index)
+        with patch('cloudlanguagetools.test_services.TestServiceB.get_translation_language_list', return_value=[]):
+            manager.aggregate_catalog(Catalog.translation_language_list)
+        self.assertIsNot(manager.get_translation_index(), translation_index)
+        self.assertEqual(manager.get_translation_services(Language.fr, Language.en), frozenset([Service.TestServiceA]))
+
+    def test_all_translations(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        result = manager.get_all_translations('text_input', 'fr', 'en')
+        self.assertEqual(list(result.keys()), ['TestServiceA', 'TestServiceB'])
+        self.assertEqual(json.loads(result['TestServiceB']), {'text': 'text_input', 'from_language_key': 'fr', 'to_language_key': 'en'})
+        self.assertEqual(manager.get_all_translations('text_input', 'fr', 'de'), {})
+
+    def test_chatapi_option_selection(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        chatapi = cloudlanguagetools.chatapi.ChatAPI(manager)
+        translation_option = chatapi.select_translation_option(Service.TestServiceB, Language.fr, Language.en)
+        self.assertEqual(translation_option, {'service': Service.TestServiceB, 'source_language_id': 'fr', 'target_language_id': 'en'})
+        transliteration_option = chatapi.select_transliteration_option(Service.TestServiceA, Language.zh_cn)
+        self.assertEqual(transliteration_option.service, Service.TestServiceA)
+        self.assertEqual(transliteration_option.get_transliteration_key(), 'pinyin')
+        with self.assertRaises(cloudlanguagetools.chatapi.NoDataFoundException):
+            chatapi.select_transliteration_option(None, Language.fr)
+
+    def test_dictionary_lookup_index(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        dictionary_lookup_index = manager.get_dictionary_lookup_index()
+        self.assertEqual(dictionary_lookup_index.get_language_pair_services(Language.zh_cn, Language.en), set([Service.TestServiceA, Service.TestServiceB]))
+        entries = dictionary_lookup_index.get_language_pair_entries(Language.fr, Language.en, service=Service.TestServiceA)
+        self.assertEqual([x.get_lookup_key() for x in entries], ['french'])
+        self.assertEqual(dictionary_lookup_index.get_language_pair_entries(Language.fr, Language.de), [])
+
+
+@pytest.mark.skipif(
+    os.environ.get('CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES', 'no') != 'yes',
+    reason='you must set CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES=yes'
+)
+class TestAllTranslations(unittest.TestCase):
+    """Tests for concurrent translation across all services."""
+
+    def slow_translation(self, delays):
+        original_method = cloudlanguagetools.test_services.TestServiceBase.get_translation
+        def get_translation(service, text, from_language_key, to_language_key):
+            time.sleep(delays.get(service.SERVICE, 0))
+            return original_method(service, text, from_language_key, to_language_key)
+        return get_translation
+
+    def test_services_queried_concurrently(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        delays = {Service.TestServiceA: 0.5, Service.TestServiceB: 0.5}
+        with patch('cloudlanguagetools.test_services.TestServiceBase.get_translation', self.slow_translation(delays)):
+            start_time = time.time()
+            result = manager.get_all_translations('text_input', 'fr', 'en')
+            elapsed = time.time() - start_time
+        self.assertEqual(list(result.keys()), ['TestServiceA', 'TestServiceB'])
+        self.assertLess(elapsed, 0.9)
+
+    def test_iterate_as_completed(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        delays = {Service.TestServiceA: 0.5}
+        with patch('cloudlanguagetools.test_services.TestServiceBase.get_translation', self.slow_translation(delays)):
+            results = list(manager.iterate_all_translations('text_input', 'fr', 'en'))
+        self.assertEqual([service_name for service_name, translation, elapsed in results], ['TestServiceB', 'TestServiceA'])
+        service_name, translation, elapsed = results[1]
+        self.assertEqual(json.loads(translation)['text'], 'text_input')
+        self.assertGreaterEqual(elapsed, 0.5)
+
+    def test_errors_and_deadline(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        delays = {Service.TestServiceA: 2}
+        with patch('cloudlanguagetools.test_services.TestServiceBase.get_translation', self.slow_translation(delays)):
+            start_time = time.time()
+            results = {service_name: translation for service_name, translation, elapsed in 
+                manager.iterate_all_translations('text_input', 'fr', 'en', timeout=0.5)}
+            elapsed = time.time() - start_time
+        self.assertLess(elapsed, 1.5)
+        self.assertIsInstance(results['TestServiceA'], cloudlanguagetools.errors.TimeoutError)
+        self.assertEqual(json.loads(results['TestServiceB'])['text'], 'text_input')
+
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        with patch('cloudlanguagetools.test_services.TestServiceB.get_translation', side_effect=cloudlanguagetools.errors.RequestError('failure')):
+            result = manager.get_all_translations('text_input', 'fr', 'en')
+        self.assertEqual(list(result.keys()), ['TestServiceA'])
+
+
+@pytest.mark.skipif(
+    os.environ.get('CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES', 'no') != 'yes',
+    reason='you must set CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES=yes'
+)
+class TestBreakdown(unittest.TestCase):
+    """Tests for token enrichment in get_breakdown."""
+
+    TOKENS = [
+        {'token': 'les', 'lemma': 'le', 'can_translate': True, 'can_transliterate': True},
+        {'token': 'chats', 'lemma': 'chat', 'can_translate': True, 'can_transliterate': True, 'pos_description': 'noun'},
+        {'token': ',', 'lemma': ',', 'can_translate': False, 'can_transliterate': False},
+        {'token': 'le', 'lemma': 'le', 'can_translate': True, 'can_transliterate': True},
+        {'token': 'chat', 'lemma': 'chat', 'can_translate': True, 'can_transliterate': True},
+    ]
+
+    def get_breakdown(self, manager):
+        tokenization_option = {'service': 'TestServiceA', 'tokenization_key': 'fr'}
+        translation_option = {'service': 'TestServiceB', 'source_language_id': 'fr', 'target_language_id': 'en'}
+        transliteration_option = {'service': 'TestServiceA', 'transliteration_key': 'ipa'}
+        return manager.get_breakdown('les chats, le chat', tokenization_option, translation_option, transliteration_option)
+
+    def test_breakdown(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        with patch('cloudlanguagetools.test_services.TestServiceA.get_tokenization', return_value=self.TOKENS, create=True), \
+             patch('cloudlanguagetools.test_services.TestServiceB.get_translation_batch', wraps=manager.services[Service.TestServiceB].get_translation_batch) as mock_translation, \
+             patch('cloudlanguagetools.test_services.TestServiceA.get_transliteration', wraps=manager.services[Service.TestServiceA].get_transliteration) as mock_transliteration:
+            result = self.get_breakdown(manager)
+        self.assertEqual([entry['token'] for entry in result], ['les', 'chats', ',', 'le', 'chat'])
+        self.assertEqual(json.loads(result[1]['translation'])['text'], 'chat')
+        self.assertEqual(json.loads(result[4]['translation'])['text'], 'chat')
+        self.assertEqual(json.loads(result[0]['transliteration'])['text'], 'les')
+        self.assertEqual(result[1]['pos_description'], 'noun')
+        self.assertNotIn('translation', result[2])
+        self.assertNotIn('transliteration', result[2])
+        # repeated lemmas are only translated once, in a single batch
+        self.assertEqual([call.args[0] for call in mock_translation.call_args_list], [['le', 'chat']])
+        self.assertEqual(sorted([call.args[0] for call in mock_transliteration.call_args_list]), ['chat', 'chats', 'le', 'les'])
+
+    def test_breakdown_error(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        with patch('cloudlanguagetools.test_services.TestServiceA.get_tokenization', return_value=self.TOKENS, create=True), \
+             patch('cloudlanguagetools.test_services.TestServiceB.get_translation', side_effect=cloudlanguagetools.errors.RequestError('failure')):
+            with self.assertRaises(cloudlanguagetools.errors.RequestError):
+                self.get_breakdown(manager)
+        with patch('cloudlanguagetools.test_services.TestServiceA.get_tokenization', return_value=self.TOKENS, create=True), \
+             patch('cloudlanguagetools.test_services.TestServiceA.get_transliteration', side_effect=cloudlanguagetools.errors.RequestError('failure')):
+            with self.assertRaises(cloudlanguagetools.errors.RequestError):
+                self.get_breakdown(manager)
+
+
+@pytest.mark.skipif(
+    os.environ.get('CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES', 'no') != 'yes',
+    reason='you must set CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES=yes'
+)
+class TestTranslationBatch(unittest.TestCase):
+    """Tests for ServiceManager.get_translation_batch. TestServiceB supports native batching (3 texts / 100 characters
+    per request), TestServiceA doesn't."""
+
+    def test_chunk_texts(self):
+        chunk_texts = cloudlanguagetools.concurrency.chunk_texts
+        self.assertEqual(chunk_texts(['a', 'b', 'c', 'd'], 3, 100), [['a', 'b', 'c'], ['d']])
+        self.assertEqual(chunk_texts(['aaaa', 'bbbb', 'cc', 'dddddddddd'], 10, 8), [['aaaa', 'bbbb'], ['cc'], ['dddddddddd']])
+        self.assertEqual(chunk_texts([], 3, 100), [])
+
+    def test_native_batch(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        texts = [f'text {i}' for i in range(7)] + [' '.join(['long text'] * 20)]
+        with patch('cloudlanguagetools.test_services.TestServiceB.get_translation_batch', 
+                   wraps=manager.services[Service.TestServiceB].get_translation_batch) as mock_batch:
+            result = manager.get_translation_batch(texts, 'TestServiceB', 'fr', 'en')
+        self.assertEqual([json.loads(x)['text'] for x in result], texts)
+        # 3 + 3 + 1 texts, then the long text on its own
+        self.assertEqual(sorted([len(call.args[0]) for call in mock_batch.call_args_list]), [1, 1, 3, 3])
+
+    def test_fallback_without_native_batch(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        texts = ['a', 'b', 'c']
+        result = manager.get_translation_batch(texts, 'TestServiceA', 'fr', 'en')
+        self.assertEqual([json.loads(x)['text'] for x in result], texts)
+
+    def test_per_item_errors(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        original_method = cloudlanguagetools.test_services.TestServiceBase.get_translation
+        def get_translation(service, text, from_language_key, to_language_key):
+            if text == 'bad':
+                raise cloudlanguagetools.errors.InputError('could not translate')
+            return original_method(service, text, from_language_key, to_language_key)
+        with patch('cloudlanguagetools.test_services.TestServiceBase.get_translation', get_translation):
+            for service_name in ['TestServiceA', 'TestServiceB']:
+                result = manager.get_translation_batch(['good', 'bad', 'other'], service_name, 'fr', 'en')
+                self.assertEqual(json.loads(result[0])['text'], 'good')
+                self.assertIsInstance(result[1], cloudlanguagetools.errors.InputError)
+                self.assertEqual(json.loads(result[2])['text'], 'other')
+
+    def test_account_errors_apply_to_chunk(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        for exception in [cloudlanguagetools.errors.AuthenticationError('bad key'),
+                          cloudlanguagetools.errors.OverQuotaError('quota exceeded'),
+                          cloudlanguagetools.errors.RequestError('service unavailable')]:
+            with patch('cloudlanguagetools.test_services.TestServiceB.get_translation_batch', side_effect=exception), \
+                 patch('cloudlanguagetools.test_services.TestServiceB.get_translation') as mock_translation:
+                result = manager.get_translation_batch(['a', 'b', 'c'], 'TestServiceB', 'fr', 'en')
+            self.assertEqual(result, [exception] * 3)
+            mock_translation.assert_not_called()
+
+    def test_base_batch_translates_one_by_one(self):
+        service = cloudlanguagetools.test_services.TestServiceA()
+        result = cloudlanguagetools.service.Service.get_translation_batch(service, ['a', 'b'], 'fr', 'en')
+        self.assertEqual([json.loads(x)['text'] for x in result], ['a', 'b'])
+
+    def test_rate_limited_chunk(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        with patch('cloudlanguagetools.test_services.TestServiceB.get_translation_batch', 
+                   side_effect=cloudlanguagetools.errors.RateLimitError('rate limited')), \
+             patch('cloudlanguagetools.test_services.TestServiceB.get_translation') as mock_translation:
+            result = manager.get_translation_batch(['a', 'b'], 'TestServiceB', 'fr', 'en')
+        self.assertEqual(len(result), 2)
+        self.assertTrue(all(isinstance(x, cloudlanguagetools.errors.RateLimitError) for x in result))
+        mock_translation.assert_not_called()
+
+
+@pytest.mark.skipif(
+    os.environ.get('CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES', 'no') != 'yes',
+    reason='you must set CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES=yes'
+)
+class TestTransliterationBatch(unittest.TestCase):
+    """Tests for ServiceManager.get_transliteration_batch. TestServiceB supports native batching (3 texts / 100 characters
+    per request), TestServiceA doesn't."""
+
+    def test_native_batch(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        texts = [f'text {i}' for i in range(10)]
+        with patch('cloudlanguagetools.test_services.TestServiceB.get_transliteration_batch', 
+                   wraps=manager.services[Service.TestServiceB].get_transliteration_batch) as mock_batch:
+            result = manager.get_transliteration_batch(texts, 'TestServiceB', 'pinyin')
+        self.assertEqual([json.loads(x)['text'] for x in result], texts)
+        self.assertEqual(sorted([len(call.args[0]) for call in mock_batch.call_args_list]), [1, 3, 3, 3])
+
+    def test_fallback_without_native_batch(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        texts = ['a', 'b', 'c']
+        result = manager.get_transliteration_batch(texts, 'TestServiceA', 'pinyin')
+        self.assertEqual([json.loads(x)['text'] for x in result], texts)
+        self.assertEqual([json.loads(x)['transliteration_key'] for x in result], ['pinyin'] * 3)
+
+    def test_per_item_errors(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        original_method = cloudlanguagetools.test_services.TestServiceBase.get_transliteration
+        def get_transliteration(service, text, transliteration_key):
+            if text == 'bad':
+                raise cloudlanguagetools.errors.InputError('could not transliterate')
+            return original_method(service, text, transliteration_key)
+        with patch('cloudlanguagetools.test_services.TestServiceBase.get_transliteration', get_transliteration):
+            result = manager.get_transliteration_batch(['good', 'bad'], 'TestServiceB', 'pinyin')
+        self.assertEqual(json.loads(result[0])['text'], 'good')
+        self.assertIsInstance(result[1], cloudlanguagetools.errors.InputError)
+
+    def test_account_errors_apply_to_chunk(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        exception = cloudlanguagetools.errors.AuthenticationError('bad key')
+        with patch('cloudlanguagetools.test_services.TestServiceB.get_transliteration_batch', side_effect=exception), \
+             patch('cloudlanguagetools.test_services.TestServiceB.get_transliteration') as mock_transliteration:
+            result = manager.get_transliteration_batch(['a', 'b'], 'TestServiceB', 'pinyin')
+        self.assertEqual(result, [exception] * 2)
+        mock_transliteration.assert_not_called()
+
+    def test_base_batch_transliterates_one_by_one(self):
+        service = cloudlanguagetools.test_services.TestServiceA()
+        result = cloudlanguagetools.service.Service.get_transliteration_batch(service, ['a', 'b'], 'pinyin')
+        self.assertEqual([json.loads(x)['text'] for x in result], ['a', 'b'])
+
+
+@pytest.mark.skipif(
+    os.environ.get('CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES', 'no') != 'yes',
+    reason='you must set CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES=yes'
+)
+class TestDictionaryLookupBatch(unittest.TestCase):
+    """Tests for ServiceManager.get_dictionary_lookup_batch, the test services don't have a batch lookup."""
+
+    def test_lookup_one_by_one(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        original_method = cloudlanguagetools.test_services.TestServiceBase.get_dictionary_lookup
+        def get_dictionary_lookup(service, text, lookup_key):
+            if text == 'missing':
+                raise cloudlanguagetools.errors.NotFoundError('no results')
+            return original_method(service, text, lookup_key)
+        with patch('cloudlanguagetools.test_services.TestServiceBase.get_dictionary_lookup', get_dictionary_lookup):
+            service = manager.services[Service.TestServiceA]
+            result = cloudlanguagetools.service.Service.get_dictionary_lookup_batch(service, ['a', 'missing', 'b'], 'zh')
+        self.assertEqual(json.loads(result[0])['text'], 'a')
+        self.assertIsInstance(result[1], cloudlanguagetools.errors.NotFoundError)
+        self.assertEqual(json.loads(result[2])['text'], 'b')
+
+
+@pytest.mark.skipif(
+    os.environ.get('CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES', 'no') != 'yes',
+    reason='you must set CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES=yes'
+)
+class TestTranslationCache(unittest.TestCase):
+    """Tests for the translation cache in front of ServiceManager.get_translation."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, 'translation_cache.sqlite')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_cache_key(self):
+        canonicalize_text = cloudlanguagetools.translationcache.canonicalize_text
+        get_cache_key = cloudlanguagetools.translationcache.get_cache_key
+        # precomposed vs decomposed é, surrounding whitespace
+        self.assertEqual(canonicalize_text(' café\n'), 'café')
+        self.assertNotEqual(get_cache_key('Azure', 'fr', 'en', 'café'), get_cache_key('DeepL', 'fr', 'en', 'café'))
+        self.assertNotEqual(get_cache_key('Azure', 'fr', 'en', 'café'), get_cache_key('Azure', 'fr', 'de', 'café'))
+
+    def test_cache_hit(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        with patch('cloudlanguagetools.test_services.TestServiceA.get_translation', return_value='translated') as mock_translation:
+            self.assertEqual(manager.get_translation('café', 'TestServiceA', 'fr', 'en'), 'translated')
+            self.assertEqual(manager.get_translation(' café ', 'TestServiceA', 'fr', 'en'), 'translated')
+            self.assertEqual(mock_translation.call_count, 1)
+            # different service or languages
+            manager.get_translation('café', 'TestServiceA', 'fr', 'zh')
+            self.assertEqual(mock_translation.call_count, 2)
+        # the service receives the canonical text
+        self.assertEqual([call.args[0] for call in mock_translation.call_args_list], ['café', 'café'])
+        stats = manager.translation_cache.get_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 2)
+
+    def test_bypass(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        with patch('cloudlanguagetools.test_services.TestServiceA.get_translation', side_effect=['first', 'second']) as mock_translation:
+            self.assertEqual(manager.get_translation('texte', 'TestServiceA', 'fr', 'en'), 'first')
+            self.assertEqual(manager.get_translation('texte', 'TestServiceA', 'fr', 'en', bypass_cache=True), 'second')
+            # the fresh translation replaces the cached one
+            self.assertEqual(manager.get_translation('texte', 'TestServiceA', 'fr', 'en'), 'second')
+            self.assertEqual(mock_translation.call_count, 2)
+        self.assertEqual(manager.translation_cache.get_stats()['bypass'], 1)
+
+    def test_errors_not_cached(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        with patch('cloudlanguagetools.test_services.TestServiceA.get_translation', 
+                   side_effect=[cloudlanguagetools.errors.RequestError('failure'), 'translated']):
+            with self.assertRaises(cloudlanguagetools.errors.RequestError):
+                manager.get_translation('texte', 'TestServiceA', 'fr', 'en')
+            self.assertEqual(manager.get_translation('texte', 'TestServiceA', 'fr', 'en'), 'translated')
+
+    def test_disk_tier(self):
+        translation_cache = cloudlanguagetools.translationcache.TranslationCache(path=self.cache_path)
+        manager = cloudlanguagetools.servicemanager.ServiceManager(translation_cache=translation_cache)
+        manager.get_translation('texte', 'TestServiceA', 'fr', 'en')
+
+        # another process, sharing the same sqlite file
+        translation_cache = cloudlanguagetools.translationcache.TranslationCache(path=self.cache_path)
+        manager = cloudlanguagetools.servicemanager.ServiceManager(translation_cache=translation_cache)
+        with patch('cloudlanguagetools.test_services.TestServiceA.get_translation') as mock_translation:
+            translation = manager.get_translation('texte', 'TestServiceA', 'fr', 'en')
+            mock_translation.assert_not_called()
+        self.assertEqual(json.loads(translation)['text'], 'texte')
+        self.assertEqual(translation_cache.get_stats()['disk_hits'], 1)
+
+    def test_disk_tier_expiration_and_eviction(self):
+        translation_cache = cloudlanguagetools.translationcache.TranslationCache(path=self.cache_path, max_entries=1, disk_max_entries=2, ttl=60)
+        for i in range(3):
+            translation_cache.put(f'key_{i}', f'translation_{i}')
+        translation_cache.evict_disk_entries()
+        # least recently used entry evicted
+        self.assertIsNone(translation_cache.get('key_0'))
+        self.assertEqual(translation_cache.get('key_1'), 'translation_1')
+        # expired entries are ignored
+        translation_cache.connection.execute('UPDATE translations SET created_at = 0')
+        self.assertIsNone(cloudlanguagetools.translationcache.TranslationCache(path=self.cache_path).get('key_1'))
+
+    def test_disk_tier_access_updates(self):
+        translation_cache = cloudlanguagetools.translationcache.TranslationCache(path=self.cache_path, max_entries=1, disk_max_entries=2)
+        for i in range(3):
+            translation_cache.put(f'key_{i}', f'translation_{i}')
+        translation_cache.connection.execute('UPDATE translations SET accessed_at = 0')
+        # the last access time of key_0 is only written with the next batch
+        self.assertEqual(translation_cache.get('key_0'), 'translation_0')
+        accessed_at = translation_cache.connection.execute('SELECT accessed_at FROM translations WHERE key = ?', ('key_0',)).fetchone()[0]
+        self.assertEqual(accessed_at, 0)
+        # or before evicting
+        translation_cache.evict_disk_entries()
+        self.assertEqual(translation_cache.connection.execute('SELECT COUNT(*) FROM translations').fetchone()[0], 2)
+        self.assertEqual(translation_cache.get('key_0'), 'translation_0')
+
+    def test_batch_uses_cache(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        manager.get_translation('un', 'TestServiceB', 'fr', 'en')
+        with patch('cloudlanguagetools.test_services.TestServiceB.get_translation_batch', 
+                   wraps=manager.services[Service.TestServiceB].get_translation_batch) as mock_batch:
+            result = manager.get_translation_batch(['un', 'deux', 'deux', 'trois'], 'TestServiceB', 'fr', 'en')
+        self.assertEqual([json.loads(x)['text'] for x in result], ['un', 'deux', 'deux', 'trois'])
+        self.assertEqual([call.args[0] for call in mock_batch.call_args_list], [['deux', 'trois']])
+
+
+@pytest.mark.skipif(
+    os.environ.get('CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES', 'no') != 'yes',
+    reason='you must set CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES=yes'
+)
+class TestAudioCache(unittest.TestCase):
+    """Tests for the audio cache in front of ServiceManager.get_tts_audio."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.audio_cache = cloudlanguagetools.audiocache.AudioCache(os.path.join(self.temp_dir.name, 'audio'))
+        self.manager = cloudlanguagetools.servicemanager.ServiceManager(audio_cache=self.audio_cache)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read_audio(self, audio_file):
+        with open(audio_file.name, 'r') as f:
+            return json.loads(f.read())
+
+    def count_service_calls(self, function):
+        with patch('cloudlanguagetools.test_services.TestServiceA.get_tts_audio', 
+                   wraps=self.manager.services[Service.TestServiceA].get_tts_audio) as mock_tts_audio:
+            function()
+            return mock_tts_audio.call_count
+
+    def test_cache_hit(self):
+        def generate():
+            audio_1 = self.manager.get_tts_audio('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {})
+            audio_2 = self.manager.get_tts_audio('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {})
+            self.assertEqual(self.read_audio(audio_1), self.read_audio(audio_2))
+            self.assertEqual(self.read_audio(audio_2)['text'], 'bonjour')
+        self.assertEqual(self.count_service_calls(generate), 1)
+        self.assertEqual(self.audio_cache.get_stats()['hits'], 1)
+        # v5 goes through the cache too
+        self.assertEqual(self.count_service_calls(lambda: self.manager.get_tts_audio_v5('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {})), 0)
+        # different text, voice, service
+        self.assertEqual(self.count_service_calls(lambda: self.manager.get_tts_audio('salut', 'TestServiceA', {'voice_id': 'paul'}, {})), 1)
+        self.assertEqual(self.count_service_calls(lambda: self.manager.get_tts_audio('bonjour', 'TestServiceA', {'voice_id': 'pierre'}, {})), 1)
+
+    def test_options_canonicalized_with_voice_defaults(self):
+        self.manager.get_tts_voice_list()
+        def generate():
+            self.manager.get_tts_audio('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {})
+            self.manager.get_tts_audio('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {'rate': 1.0})
+            self.manager.get_tts_audio('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {'rate': 1})
+        self.assertEqual(self.count_service_calls(generate), 1)
+        self.assertEqual(self.count_service_calls(lambda: self.manager.get_tts_audio('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {'rate': 1.5})), 1)
+
+    def test_voice_list_not_fetched(self):
+        with patch('cloudlanguagetools.test_services.TestServiceBase.get_tts_voice_list', side_effect=Exception('should not be called')):
+            self.manager.get_tts_audio('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {'rate': 1.0})
+        self.assertIsNone(self.manager.get_voice_options(Service.TestServiceA, {'voice_id': 'paul'}))
+
+    def test_errors_not_cached(self):
+        with patch('cloudlanguagetools.test_services.TestServiceA.get_tts_audio', side_effect=cloudlanguagetools.errors.RequestError('failure')):
+            with self.assertRaises(cloudlanguagetools.errors.RequestError):
+                self.manager.get_tts_audio('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {})
+        self.assertEqual(self.count_service_calls(lambda: self.manager.get_tts_audio('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {})), 1)
+
+    def test_bypass_cache(self):
+        self.manager.get_tts_audio('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {})
+        self.assertEqual(self.count_service_calls(lambda: self.manager.get_tts_audio('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {}, bypass_cache=True)), 1)
+        self.assertEqual(self.count_service_calls(lambda: self.manager.get_tts_audio_v5('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {}, bypass_cache=True)), 1)
+        self.assertEqual(self.audio_cache.get_stats()['bypass'], 2)
+        # the fresh audio is cached
+        self.assertEqual(self.count_service_calls(lambda: self.manager.get_tts_audio('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {})), 0)
+
+    def test_eviction(self):
+        audio_cache = cloudlanguagetools.audiocache.AudioCache(os.path.join(self.temp_dir.name, 'evict'), max_size=100)
+        for i in range(3):
+            audio_cache.put(f'key_{i}', b'0' * 40)
+            time.sleep(0.01)
+        self.assertIsNone(audio_cache.get('key_0'))
+        self.assertEqual(audio_cache.get('key_2'), b'0' * 40)
+        self.assertLessEqual(audio_cache.get_stats()['size'], 90)
+        # size is recovered from the directory on startup
+        self.assertEqual(cloudlanguagetools.audiocache.AudioCache(os.path.join(self.temp_dir.name, 'evict')).total_size, 80)
+
+
+@pytest.mark.skipif(
+    os.environ.get('CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES', 'no') != 'yes',
+    reason='you must set CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES=yes'
+)
+class TestSingleFlight(unittest.TestCase):
+    """Tests for coalescing of concurrent identical requests."""
+
+    def run_concurrently(self, function, count=4):
+        results = [None] * count
+        def run(i):
+            try:
+                results[i] = function()
+            except Exception as e:
+                results[i] = e
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def slow_call(self, result, call_count):
+        def function():
+            call_count.append(1)
+            time.sleep(0.3)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return function
+
+    def test_identical_calls_coalesced(self):
+        single_flight = cloudlanguagetools.singleflight.SingleFlight()
+        call_count = []
+        results = self.run_concurrently(lambda: single_flight.do('key', self.slow_call('result', call_count)))
+        self.assertEqual(results, ['result'] * 4)
+        self.assertEqual(len(call_count), 1)
+        self.assertEqual(single_flight.get_stats(), {'calls': 1, 'coalesced': 3, 'in_flight': 0})
+        # nothing is kept once the call completes
+        single_flight.do('key', self.slow_call('result', call_count))
+        self.assertEqual(len(call_count), 2)
+
+    def test_exception_shared(self):
+        single_flight = cloudlanguagetools.singleflight.SingleFlight()
+        call_count = []
+        error = cloudlanguagetools.errors.RequestError('failure')
+        results = self.run_concurrently(lambda: single_flight.do('key', self.slow_call(error, call_count)))
+        self.assertEqual(results, [error] * 4)
+        self.assertEqual(len(call_count), 1)
+
+    def test_different_keys_not_coalesced(self):
+        single_flight = cloudlanguagetools.singleflight.SingleFlight()
+        call_count = []
+        keys = iter(range(4))
+        lock = threading.Lock()
+        def call():
+            with lock:
+                key = next(keys)
+            return single_flight.do(key, self.slow_call(key, call_count))
+        results = self.run_concurrently(call)
+        self.assertEqual(sorted(results), [0, 1, 2, 3])
+        self.assertEqual(len(call_count), 4)
+
+    def test_tts_audio(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        original_method = cloudlanguagetools.test_services.TestServiceA.get_tts_audio
+        call_count = []
+        def slow_tts_audio(service, text, voice_key, options):
+            call_count.append(1)
+            time.sleep(0.3)
+            return original_method(service, text, voice_key, options)
+        with patch('cloudlanguagetools.test_services.TestServiceA.get_tts_audio', slow_tts_audio):
+            audio_files = self.run_concurrently(lambda: manager.get_tts_audio('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {}))
+        self.assertEqual(len(call_count), 1)
+        # every caller has its own file
+        self.assertEqual(len(set([audio_file.name for audio_file in audio_files])), 4)
+        for audio_file in audio_files:
+            with open(audio_file.name, 'r') as f:
+                self.assertEqual(json.loads(f.read())['text'], 'bonjour')
+        audio_files[0].close()
+        self.assertTrue(os.path.exists(audio_files[1].name))
+
+    def test_translation(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        original_method = cloudlanguagetools.test_services.TestServiceA.get_translation
+        call_count = []
+        def slow_translation(service, text, from_language_key, to_language_key):
+            call_count.append(1)
+            time.sleep(0.3)
+            return original_method(service, text, from_language_key, to_language_key)
+        with patch('cloudlanguagetools.test_services.TestServiceA.get_translation', slow_translation):
+            results = self.run_concurrently(lambda: manager.get_translation('chat', 'TestServiceA', 'fr', 'en'))
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(len(call_count), 1)
+
+    def test_bypass_cache_not_coalesced(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        original_tts_audio = cloudlanguagetools.test_services.TestServiceA.get_tts_audio
+        original_translation = cloudlanguagetools.test_services.TestServiceA.get_translation
+        call_count = []
+        def slow_tts_audio(service, text, voice_key, options):
+            call_count.append(1)
+            time.sleep(0.3)
+            return original_tts_audio(service, text, voice_key, options)
+        def slow_translation(service, text, from_language_key, to_language_key):
+            call_count.append(1)
+            time.sleep(0.3)
+            return original_translation(service, text, from_language_key, to_language_key)
+        bypass_cache = iter([False, True])
+        lock = threading.Lock()
+        def next_bypass_cache():
+            with lock:
+                return next(bypass_cache)
+        with patch('cloudlanguagetools.test_services.TestServiceA.get_tts_audio', slow_tts_audio):
+            self.run_concurrently(lambda: manager.get_tts_audio('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {}, bypass_cache=next_bypass_cache()), count=2)
+        self.assertEqual(len(call_count), 2)
+        call_count.clear()
+        bypass_cache = iter([False, True])
+        with patch('cloudlanguagetools.test_services.TestServiceA.get_translation', slow_translation):
+            self.run_concurrently(lambda: manager.get_translation('chat', 'TestServiceA', 'fr', 'en', bypass_cache=next_bypass_cache()), count=2)
+        self.assertEqual(len(call_count), 2)
+
+    def test_catalog(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        original_method = cloudlanguagetools.test_services.TestServiceBase.get_tts_voice_list
+        call_count = []
+        def slow_voice_list(service):
+            call_count.append(1)
+            time.sleep(0.3)
+            return original_method(service)
+        with patch('cloudlanguagetools.test_services.TestServiceBase.get_tts_voice_list', slow_voice_list):
+            results = self.run_concurrently(manager.get_tts_voice_list)
+        for voice_list in results:
+            self.assertEqual(len(voice_list), 2)
+        # once per service
+        self.assertEqual(len(call_count), 2)
+
+
+@pytest.mark.skipif(
+    os.environ.get('CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES', 'no') != 'yes',
+    reason='you must set CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES=yes'
+)
+class TestAsyncAPI(unittest.TestCase):
+    """Tests for the async counterparts of the ServiceManager methods."""
+
+    def setUp(self):
+        self.manager = cloudlanguagetools.servicemanager.ServiceManager()
+
+    def test_tts_audio_concurrent(self):
+        original_method = cloudlanguagetools.test_services.TestServiceA.get_tts_audio
+        def slow_tts_audio(service, text, voice_key, options):
+            time.sleep(0.3)
+            return original_method(service, text, voice_key, options)
+        async def generate():
+            return await asyncio.gather(*[self.manager.get_tts_audio_async(f'text {i}', 'TestServiceA', {'voice_id': 'paul'}, {}) for i in range(5)])
+        with patch('cloudlanguagetools.test_services.TestServiceA.get_tts_audio', slow_tts_audio):
+            start_time = time.time()
+            audio_files = asyncio.run(generate())
+            elapsed = time.time() - start_time
+        self.assertLess(elapsed, 1.0)
+        for i, audio_file in enumerate(audio_files):
+            with open(audio_file.name, 'r') as f:
+                self.assertEqual(json.loads(f.read())['text'], f'text {i}')
+
+    def test_translation_transliteration_dictionary(self):
+        async def run():
+            translation = await self.manager.get_translation_async('chat', 'TestServiceA', 'fr', 'en')
+            transliteration = await self.manager.get_transliteration_async('chat', 'TestServiceA', {'transliteration_key': 'key'})
+            dictionary_lookup = await self.manager.get_dictionary_lookup_async('chat', 'TestServiceA', {'lookup_key': 'key'})
+            return translation, transliteration, dictionary_lookup
+        translation, transliteration, dictionary_lookup = asyncio.run(run())
+        self.assertEqual(translation, self.manager.get_translation('chat', 'TestServiceA', 'fr', 'en'))
+        self.assertEqual(transliteration, self.manager.get_transliteration('chat', 'TestServiceA', {'transliteration_key': 'key'}))
+        self.assertEqual(dictionary_lookup, self.manager.get_dictionary_lookup('chat', 'TestServiceA', {'lookup_key': 'key'}))
+
+    def test_tts_audio_coalesced(self):
+        original_method = cloudlanguagetools.test_services.TestServiceA.get_tts_audio
+        call_count = []
+        def slow_tts_audio(service, text, voice_key, options):
+            call_count.append(1)
+            time.sleep(0.3)
+            return original_method(service, text, voice_key, options)
+        async def generate():
+            return await asyncio.gather(*[self.manager.get_tts_audio_async('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {}) for i in range(4)])
+        with patch('cloudlanguagetools.test_services.TestServiceA.get_tts_audio', slow_tts_audio):
+            audio_list = asyncio.run(generate())
+        self.assertEqual(len(call_count), 1)
+        self.assertEqual(self.manager.async_single_flight.get_stats(), {'calls': 1, 'coalesced': 3, 'in_flight': 0})
+        for audio in audio_list:
+            self.assertEqual(json.loads(audio.bytes)['text'], 'bonjour')
+
+    def test_translation_batch(self):
+        texts = [f'text {i}' for i in range(7)] + ['bad']
+        original_method = cloudlanguagetools.test_services.TestServiceBase.get_translation
+        def get_translation(service, text, from_language_key, to_language_key):
+            if text == 'bad':
+                raise cloudlanguagetools.errors.InputError('could not translate')
+            return original_method(service, text, from_language_key, to_language_key)
+        with patch('cloudlanguagetools.test_services.TestServiceBase.get_translation', get_translation):
+            for service_name in ['TestServiceA', 'TestServiceB']:
+                result = asyncio.run(self.manager.get_translation_batch_async(texts, service_name, 'fr', 'en'))
+                self.assertEqual([json.loads(x)['text'] for x in result[:-1]], texts[:-1])
+                self.assertIsInstance(result[-1], cloudlanguagetools.errors.InputError)
+        transliterations = asyncio.run(self.manager.get_transliteration_batch_async(['a', 'b'], 'TestServiceB', {'transliteration_key': 'key'}))
+        self.assertEqual(transliterations, self.manager.get_transliteration_batch(['a', 'b'], 'TestServiceB', {'transliteration_key': 'key'}))
+
+    def test_all_translations_deadline(self):
+        original_method = cloudlanguagetools.test_services.TestServiceBase.get_translation
+        def get_translation(service, text, from_language_key, to_language_key):
+            if service.SERVICE == Service.TestServiceA:
+                time.sleep(2)
+            return original_method(service, text, from_language_key, to_language_key)
+        with patch('cloudlanguagetools.test_services.TestServiceBase.get_translation', get_translation):
+            start_time = time.time()
+            result = asyncio.run(self.manager.get_all_translations_async('text_input', 'fr', 'en', timeout=0.5))
+            elapsed = time.time() - start_time
+        self.assertLess(elapsed, 1.5)
+        self.assertEqual(list(result.keys()), ['TestServiceB'])
+
+    def test_exception_propagated(self):
+        with patch('cloudlanguagetools.test_services.TestServiceA.get_tts_audio', side_effect=Exception('failure')):
+            with self.assertRaises(cloudlanguagetools.errors.TransientError):
+                asyncio.run(self.manager.get_tts_audio_v5_async('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {}))
+
+    def test_catalog(self):
+        voice_list = asyncio.run(self.manager.get_tts_voice_list_async())
+        self.assertEqual(len(voice_list), 2)
+        catalog_result = asyncio.run(self.manager.get_catalog_async(Catalog.translation_language_list))
+        self.assertTrue(catalog_result.complete)
+
+
+@pytest.mark.skipif(
+    os.environ.get('CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES', 'no') != 'yes',
+    reason='you must set CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES=yes'
+)
+class TestAudioResult(unittest.TestCase):
+    """Tests for the in-memory audio returned by get_tts_audio."""
+
+    def test_in_memory(self):
+        audio = cloudlanguagetools.audioresult.AudioResult(b'0123456789', audio_format=cloudlanguagetools.options.AudioFormat.mp3)
+        self.assertEqual(audio.bytes, b'0123456789')
+        self.assertEqual(len(audio), 10)
+        self.assertEqual(audio.open().read(), b'0123456789')
+        self.assertEqual(list(audio.iter_chunks(chunk_size=4)), [b'0123', b'4567', b'89'])
+        self.assertIsNone(audio.temp_file)
+
+    def test_lazy_name(self):
+        audio = cloudlanguagetools.audioresult.AudioResult(b'audio', audio_format=cloudlanguagetools.options.AudioFormat.ogg_opus)
+        path = audio.name
+        self.assertTrue(path.endswith('.ogg'))
+        self.assertEqual(audio.name, path)
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), b'audio')
+        audio.close()
+        self.assertFalse(os.path.exists(path))
+        with cloudlanguagetools.audioresult.AudioResult(b'audio') as audio:
+            path = audio.name
+        self.assertFalse(os.path.exists(path))
+
+    def test_file_interface(self):
+        audio = cloudlanguagetools.audioresult.AudioResult(b'0123456789', audio_format=cloudlanguagetools.options.AudioFormat.mp3)
+        self.assertEqual(audio.read(4), b'0123')
+        self.assertEqual(audio.tell(), 4)
+        self.assertEqual(audio.read(), b'456789')
+        self.assertEqual(audio.read(), b'')
+        audio.seek(0)
+        self.assertEqual(audio.read(), b'0123456789')
+        audio.seek(-2, io.SEEK_END)
+        self.assertEqual(audio.read(), b'89')
+        # no temporary file needed
+        self.assertIsNone(audio.temp_file)
+        # accepted where a file object is expected
+        audio.seek(0)
+        destination = io.BytesIO()
+        shutil.copyfileobj(audio, destination)
+        self.assertEqual(destination.getvalue(), b'0123456789')
+
+    def test_wrap_pcm_data_wave(self):
+        pcm_audio = cloudlanguagetools.audioresult.AudioResult(b'\x00\x01' * 100)
+        wav_audio = cloudlanguagetools.audio_processing.wrap_pcm_data_wave(pcm_audio, num_channels=1, sample_width=2, framerate=16000)
+        self.assertEqual(wav_audio.audio_format, cloudlanguagetools.options.AudioFormat.wav)
+        with wave.open(wav_audio.open(), 'rb') as wav_file:
+            self.assertEqual(wav_file.getframerate(), 16000)
+            self.assertEqual(wav_file.readframes(100), b'\x00\x01' * 100)
+
+    def test_service_manager(self):
+        manager = cloudlanguagetools.servicemanager.ServiceManager()
+        audio = manager.get_tts_audio('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {})
+        self.assertIsInstance(audio, cloudlanguagetools.audioresult.AudioResult)
+        self.assertEqual(json.loads(audio.bytes)['text'], 'bonjour')
+        self.assertIsNone(audio.temp_file)
+        # legacy callers
+        self.assertEqual(json.loads(audio.read())['text'], 'bonjour')
+        audio.seek(0)
+        self.assertEqual(json.loads(audio.read())['text'], 'bonjour')
+        with open(audio.name, 'r') as f:
+            self.assertEqual(json.loads(f.read())['text'], 'bonjour')
+
+
+@pytest.mark.skipif(
+    os.environ.get('CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES', 'no') != 'yes',
+    reason='you must set CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES=yes'
+)
+class TestStreamTtsAudio(unittest.TestCase):
+    """Tests for ServiceManager.stream_tts_audio."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.audio_cache = cloudlanguagetools.audiocache.AudioCache(os.path.join(self.temp_dir.name, 'audio'))
+        self.manager = cloudlanguagetools.servicemanager.ServiceManager(audio_cache=self.audio_cache)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_single_chunk_fallback(self):
+        chunks = list(self.manager.stream_tts_audio('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {}))
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(json.loads(chunks[0])['text'], 'bonjour')
+
+    def test_chunks_yielded_as_they_arrive(self):
+        second_chunk_requested = threading.Event()
+        def stream_tts_audio(service, text, voice_key, options):
+            yield b'first'
+            second_chunk_requested.set()
+            yield b'second'
+        with patch('cloudlanguagetools.test_services.TestServiceA.stream_tts_audio', stream_tts_audio):
+            stream = self.manager.stream_tts_audio('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {})
+            self.assertEqual(next(stream), b'first')
+            self.assertFalse(second_chunk_requested.is_set())
+            self.assertEqual(list(stream), [b'second'])
+        # the complete audio got cached
+        with patch('cloudlanguagetools.test_services.TestServiceA.stream_tts_audio', side_effect=Exception('should not be called')):
+            self.assertEqual(b''.join(self.manager.stream_tts_audio('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {})), b'firstsecond')
+            self.assertEqual(self.manager.get_tts_audio('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {}).bytes, b'firstsecond')
+
+    def test_partial_stream_not_cached(self):
+        def stream_tts_audio(service, text, voice_key, options):
+            yield b'first'
+            yield b'second'
+        with patch('cloudlanguagetools.test_services.TestServiceA.stream_tts_audio', stream_tts_audio):
+            stream = self.manager.stream_tts_audio('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {})
+            next(stream)
+            stream.close()
+        self.assertEqual(self.audio_cache.get_stats()['size'], 0)
+
+    def test_error(self):
+        with patch('cloudlanguagetools.test_services.TestServiceA.get_tts_audio', side_effect=cloudlanguagetools.errors.RequestError('failure')):
+            with self.assertRaises(cloudlanguagetools.errors.RequestError):
+                list(self.manager.stream_tts_audio('bonjour', 'TestServiceA', {'voice_id': 'paul'}, {}))
+
+
+class TestTextSegmentation(unittest.TestCase):
+    """Tests for splitting long texts into TTS segments."""
+
+    def test_short_text(self):
+        self.assertEqual(cloudlanguagetools.textsegmentation.split_text(' Hello world. ', 100), ['Hello world.'])
+
+    def test_sentences_grouped(self):
+        text = 'The first sentence. The second one! A third? And the last one.'
+        self.assertEqual(cloudlanguagetools.textsegmentation.split_text(text, 40),
+            ['The first sentence. The second one!', 'A third? And the last one.'])
+
+    def test_clause_boundaries(self):
+        text = 'a long sentence, with several clauses, which is too long'
+        segments = cloudlanguagetools.textsegmentation.split_text(text, 20)
+        self.assertEqual(segments, ['a long sentence,', 'with several', 'clauses,', 'which is too long'])
+
+    def test_cjk(self):
+        text = '今天天气很好。我们去公园吧！好的'
+        self.assertEqual(cloudlanguagetools.textsegmentation.split_text(text, 9), ['今天天气很好。', '我们去公园吧！好的'])
+        # no punctuation at all
+        self.assertEqual(cloudlanguagetools.textsegmentation.split_text('一二三四五六七', 3), ['一二三', '四五六', '七'])
+
+    def test_segments_within_limit(self):
+        text = ' '.join([f'Sentence number {i}, with a clause.' for i in range(50)])
+        segments = cloudlanguagetools.textsegmentation.split_text(text, 100)
+        self.assertTrue(all(len(segment) <= 100 for segment in segments))
+        self.assertEqual(' '.join(segments), text)
+
+
+@pytest.mark.skipif(
+    os.environ.get('CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES', 'no') != 'yes',
+    reason='you must set CLOUDLANGUAGETOOLS_CORE_TEST_SERVICES=yes'
+)
+class TestSegmentedTtsAudio(unittest.TestCase):
+    """Tests for long-text synthesis in ServiceManager.get_tts_audio."""
+
+    TEXT = 'The first sentence is here. The second sentence is here. The third sentence is here.'
+
+    def setUp(self):
+        self.manager = cloudlanguagetools.servicemanager.ServiceManager()
+        self.requested_texts = []
+        self.lock = threading.Lock()
+        def get_tts_audio(service, text, voice_key, options):
+            return self.generate_audio(text)
+        self.get_tts_audio = get_tts_audio
+
+    def generate_audio(self, text):
+        with self.lock:
+            self.requested_texts.append(text)
+        # the second segment comes back at a different sample rate
+        frame_rate = 16000 if text.startswith('The second') else 24000
+        tone = pydub.generators.Sine(440, sample_rate=frame_rate).to_audio_segment(duration=200)
+        audio = pydub.AudioSegment.silent(duration=50, frame_rate=frame_rate) + tone + pydub.AudioSegment.silent(duration=50, frame_rate=frame_rate)
+        buffer = io.BytesIO()
+        audio.set_sample_width(2).export(buffer, format='wav')
+        return cloudlanguagetools.audioresult.AudioResult(buffer.getvalue(), audio_format=cloudlanguagetools.options.AudioFormat.wav)
+
+    def test_long_text_segmented(self):
+        options = {cloudlanguagetools.options.AUDIO_FORMAT_PARAMETER: 'wav'}
+        with patch('cloudlanguagetools.test_services.TestServiceA.TTS_MAX_CHARACTERS', 40), \
+             patch('cloudlanguagetools.test_services.TestServiceA.get_tts_audio', self.get_tts_audio):
+            audio = self.manager.get_tts_audio(self.TEXT, 'TestServiceA', {'voice_id': 'paul'}, options)
+        self.assertEqual(sorted(self.requested_texts),
+            ['The first sentence is here.', 'The second sentence is here.', 'The third sentence is here.'])
+        self.assertEqual(audio.audio_format, cloudlanguagetools.options.AudioFormat.wav)
+        with wave.open(audio.open()) as wav_file:
+            self.assertEqual(wav_file.getframerate(), 24000)
+            duration_ms = wav_file.getnframes() * 1000 / wav_file.getframerate()
+        # outer silence kept, silence at the junctions replaced by the gap
+        expected_duration = 50 + 3 * 200 + 2 * cloudlanguagetools.constants.TtsSegmentGap + 50
+        self.assertAlmostEqual(duration_ms, expected_duration, delta=30)
+
+    def test_short_text_single_request(self):
+        with patch('cloudlanguagetools.test_services.TestServiceA.TTS_MAX_CHARACTERS', 40), \
+             patch('cloudlanguagetools.test_services.TestServiceA.get_tts_audio', self.get_tts_audio):
+            self.manager.get_tts_audio('The first sentence is here.', 'TestServiceA', {'voice_id': 'paul'}, {})
+        self.assertEqual(self.requested_texts, ['The first sentence is here.'])
+
+    def test_within_limit_not_segmented(self):
+        text = self.TEXT * 10
+        with patch('cloudlanguagetools.test_services.TestServiceA.TTS_MAX_CHARACTERS', 5000), \
+             patch('cloudlanguagetools.test_services.TestServiceA.get_tts_audio', self.get_tts_audio):
+            self.manager.get_tts_audio(text, 'TestServiceA', {'voice_id': 'paul'}, {})
+        self.assertEqual(self.requested_texts, [text])
+
+    def test_markup_not_segmented(self):
+        text = 'The first sentence is here. <break time="500ms"/> The second sentence is here.'
+        with patch('cloudlanguagetools.test_services.TestServiceA.TTS_MAX_CHARACTERS', 40), \
+             patch('cloudlanguagetools.test_services.TestServiceA.get_tts_audio', self.get_tts_audio):
+            self.manager.get_tts_audio(text, 'TestServiceA', {'voice_id': 'paul'}, {})
+        self.assertEqual(self.requested_texts, [text])
+
+    def test_no_limit_not_segmented(self):
+        audio = self.manager.get_tts_audio(self.TEXT, 'TestServiceA', {'voice_id': 'paul'}, {})
+        self.assertEqual(json.loads(audio.bytes)['text'], self.TEXT)
+
+    def test_segment_error(self):
+        def get_tts_audio(service, text, voice_key, options):
+            if text.startswith('The third'):
+                raise cloudlanguagetools.errors.RequestError('failure')
+            return self.generate_audio(text)
+        with patch('cloudlanguagetools.test_services.TestServiceA.TTS_MAX_CHARACTERS', 40), \
+             patch('cloudlanguagetools.test_services.TestServiceA.get_tts_audio', get_tts_audio):
+            with self.assertRaises(cloudlanguagetools.errors.RequestError):
+                self.manager.get_tts_audio(self.TEXT, 'TestServiceA', {'voice_id': 'paul'}, {})
+
+
+class TestTranscoding(unittest.TestCase):
+    """Tests for transcoding.convert, ffmpeg itself is mocked."""
+
+    def make_wav(self, frames=b'\x00\x01' * 100):
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(16000)
+            wav_file.writeframes(frames)
+        return buffer.getvalue()
+
+    def test_same_format(self):
+        audio = cloudlanguagetools.audioresult.AudioResult(b'mp3 data', audio_format=cloudlanguagetools.options.AudioFormat.mp3)
+        with patch('subprocess.run', side_effect=Exception('should not be called')):
+            result = cloudlanguagetools.transcoding.convert(audio, None, cloudlanguagetools.options.AudioFormat.mp3)
+        self.assertEqual(result.bytes, b'mp3 data')
+
+    def test_pipes(self):
+        audio = cloudlanguagetools.audioresult.AudioResult(b'mp3 data', audio_format=cloudlanguagetools.options.AudioFormat.mp3)
+        completed_process = subprocess.CompletedProcess(args=[], returncode=0, stdout=b'ogg data', stderr=b'')
+        with patch('subprocess.run', return_value=completed_process) as mock_run:
+            result = cloudlanguagetools.transcoding.convert(audio, cloudlanguagetools.options.AudioFormat.mp3, cloudlanguagetools.options.AudioFormat.ogg_opus)
+        self.assertEqual(result.bytes, b'ogg data')
+        self.assertEqual(result.audio_format, cloudlanguagetools.options.AudioFormat.ogg_opus)
+        command = mock_run.call_args.args[0]
+        self.assertEqual(command[command.index('-i') + 1], 'pipe:0')
+        self.assertEqual(command[-1], 'pipe:1')
+        self.assertIn('libopus', command)
+        self.assertEqual(mock_run.call_args.kwargs['input'], b'mp3 data')
+
+    def test_wav_header_fixed(self):
+        wav_data = self.make_wav()
+        # sizes as written by ffmpeg on a pipe
+        piped_data = bytearray(wav_data)
+        piped_data[4:8] = b'\xff\xff\xff\xff'
+        piped_data[40:44] = b'\xff\xff\xff\xff'
+        completed_process = subprocess.CompletedProcess(args=[], returncode=0, stdout=bytes(piped_data), stderr=b'')
+        audio = cloudlanguagetools.audioresult.AudioResult(b'mp3 data', audio_format=cloudlanguagetools.options.AudioFormat.mp3)
+        with patch('subprocess.run', return_value=completed_process):
+            result = cloudlanguagetools.transcoding.convert(audio, None, cloudlanguagetools.options.AudioFormat.wav)
+        self.assertEqual(result.bytes, wav_data)
+        with wave.open(result.open()) as wav_file:
+            self.assertEqual(wav_file.getnframes(), 100)
+
+    def test_ffmpeg_error(self):
+        audio = cloudlanguagetools.audioresult.AudioResult(b'not audio', audio_format=cloudlanguagetools.options.AudioFormat.mp3)
+        completed_process = subprocess.CompletedProcess(args=[], returncode=1, stdout=b'', stderr=b'Invalid data found when processing input')
+        with patch('subprocess.run', return_value=completed_process):
+            with self.assertRaisesRegex(cloudlanguagetools.errors.RequestError, 'Invalid data'):
+                cloudlanguagetools.transcoding.convert(audio, None, cloudlanguagetools.options.AudioFormat.wav)
+
+    def test_ffmpeg_not_found(self):
+        audio = cloudlanguagetools.audioresult.AudioResult(b'mp3 data', audio_format=cloudlanguagetools.options.AudioFormat.mp3)
+        with patch.dict(os.environ, {cloudlanguagetools.transcoding.FFMPEG_PATH_ENV_VAR: '/nonexistent/ffmpeg'}):
+            with self.assertRaises(cloudlanguagetools.errors.RequestError):
+                cloudlanguagetools.transcoding.convert(audio, None, cloudlanguagetools.options.AudioFormat.wav)
@@ -1,10 +1,20 @@
 import json
+import time
+import base64
 import unittest
+import threading
+import asyncio
+import http.client
+import httpx
+import requests
+import urllib3
 from unittest.mock import patch, MagicMock
 
 import cloudlanguagetools.service
 import cloudlanguagetools.constants
 import cloudlanguagetools.errors
+import cloudlanguagetools.httptransport
+import cloudlanguagetools.asynchttptransport
 
 
 class ConcreteService(cloudlanguagetools.service.Service):
@@ -101,7 +111,7 @@ class TestGetResponseErrorMessage(unittest.TestCase):
 
 class TestGetTtsAudioBasePostRequest(unittest.TestCase):
 
-    @patch('requests.post')
+    @patch('cloudlanguagetools.service.Service.http_post')
     def test_429_with_json_detail_message(self, mock_post):
         """HTTP 429 with ElevenLabs-style JSON raises RateLimitError with parsed message."""
         mock_post.return_value = _make_mock_response(429, json_body={'detail': {'message': 'The system is experiencing heavy traffic'}})
@@ -113,7 +123,7 @@ class TestGetTtsAudioBasePostRequest(unittest.TestCase):
         self.assertIn('The system is experiencing heavy traffic', str(ctx.exception))
         self.assertIn('ElevenLabs', str(ctx.exception))
 
-    @patch('requests.post')
+    @patch('cloudlanguagetools.service.Service.http_post')
     def test_429_with_plain_error_key(self, mock_post):
         """HTTP 429 with {"error": "msg"} raises RateLimitError with that message."""
         mock_post.return_value = _make_mock_response(429, json_body={'error': 'too many requests'})
@@ -124,7 +134,7 @@ class TestGetTtsAudioBasePostRequest(unittest.TestCase):
 
         self.assertIn('too many requests', str(ctx.exception))
 
-    @patch('requests.post')
+    @patch('cloudlanguagetools.service.Service.http_post')
     def test_429_with_non_json_body(self, mock_post):
         """HTTP 429 with non-JSON body raises RateLimitError with text body."""
         mock_post.return_value = _make_mock_response(429, text_body='rate limited')
@@ -135,7 +145,7 @@ class TestGetTtsAudioBasePostRequest(unittest.TestCase):
 
         self.assertIn('rate limited', str(ctx.exception))
 
-    @patch('requests.post')
+    @patch('cloudlanguagetools.service.Service.http_post')
     def test_400_with_json_message(self, mock_post):
         """HTTP 400 with JSON message raises RequestError."""
         mock_post.return_value = _make_mock_response(400, json_body={'message': 'invalid parameter'})
@@ -147,7 +157,7 @@ class TestGetTtsAudioBasePostRequest(unittest.TestCase):
         self.assertNotIsInstance(ctx.exception, cloudlanguagetools.errors.RateLimitError)
         self.assertIn('invalid parameter', str(ctx.exception))
 
-    @patch('requests.post')
+    @patch('cloudlanguagetools.service.Service.http_post')
     def test_400_with_non_json_body(self, mock_post):
         """HTTP 400 with non-JSON body raises RequestError with text."""
         mock_post.return_value = _make_mock_response(400, text_body='Bad Request')
@@ -159,7 +169,7 @@ class TestGetTtsAudioBasePostRequest(unittest.TestCase):
         self.assertNotIsInstance(ctx.exception, cloudlanguagetools.errors.RateLimitError)
         self.assertIn('Bad Request', str(ctx.exception))
 
-    @patch('requests.post')
+    @patch('cloudlanguagetools.service.Service.http_post')
     def test_500_raises_request_error(self, mock_post):
         """HTTP 500 raises RequestError."""
         mock_post.return_value = _make_mock_response(500, json_body={'error': 'internal server error'})
@@ -170,7 +180,7 @@ class TestGetTtsAudioBasePostRequest(unittest.TestCase):
 
         self.assertIn('internal server error', str(ctx.exception))
 
-    @patch('requests.post')
+    @patch('cloudlanguagetools.service.Service.http_post')
     def test_429_is_not_caught_by_request_error_handler(self, mock_post):
         """RateLimitError from 429 must not be swallowed by the generic exception handler."""
         mock_post.return_value = _make_mock_response(429, json_body={'message': 'slow down'})
@@ -178,3 +188,359 @@ class TestGetTtsAudioBasePostRequest(unittest.TestCase):
         service = ConcreteService()
         with self.assertRaises(cloudlanguagetools.errors.RateLimitError):
             service.get_tts_audio_base_post_request('https://example.com/tts', json={})
+
+
+class TestTranslationBatchRequests(unittest.TestCase):
+    """Tests for the native batch translation requests."""
+
+    @patch('cloudlanguagetools.service.Service.http_post')
+    def test_deepl_batch(self, mock_post):
+        import cloudlanguagetools.deepl
+        mock_post.return_value = _make_mock_response(200, json_body={'translations': [{'text': 'one'}, {'text': 'two'}]})
+
+        service = cloudlanguagetools.deepl.DeepLService()
+        service.configure({'key': 'abcd'})
+        result = service.get_translation_batch(['un', 'deux'], 'PT-BR', 'EN-US')
+
+        self.assertEqual(result, ['one', 'two'])
+        params = mock_post.call_args.kwargs['data']
+        self.assertEqual([value for key, value in params if key == 'text'], ['un', 'deux'])
+        self.assertIn(('source_lang', 'PT'), params)
+
+    @patch('cloudlanguagetools.service.Service.http_post')
+    def test_azure_batch(self, mock_post):
+        import cloudlanguagetools.azure
+        mock_post.return_value = _make_mock_response(200, json_body=[
+            {'translations': [{'text': 'one', 'to': 'en'}]},
+            {'translations': [{'text': 'two', 'to': 'en'}]}])
+
+        service = cloudlanguagetools.azure.AzureService()
+        service.configure({'key': 'abcd', 'region': 'eastus'})
+        result = service.get_translation_batch(['un', 'deux'], 'fr', 'en')
+
+        self.assertEqual(result, ['one', 'two'])
+        self.assertEqual(mock_post.call_args.kwargs['json'], [{'text': 'un'}, {'text': 'deux'}])
+
+    @patch('cloudlanguagetools.service.Service.http_post')
+    def test_azure_batch_error(self, mock_post):
+        import cloudlanguagetools.azure
+        service = cloudlanguagetools.azure.AzureService()
+        service.configure({'key': 'abcd', 'region': 'eastus'})
+
+        # rejected texts
+        mock_post.return_value = _make_mock_response(400, json_body={'error': {'code': 400000, 'message': 'invalid'}})
+        with self.assertRaises(cloudlanguagetools.errors.InputError):
+            service.get_translation_batch(['un', 'deux'], 'fr', 'en')
+        with self.assertRaises(cloudlanguagetools.errors.InputError):
+            service.get_transliteration_batch(['un', 'deux'], {'language_id': 'ja', 'from_script': 'Jpan', 'to_script': 'Latn'})
+
+        mock_post.return_value = _make_mock_response(401, json_body={'error': {'code': 401000, 'message': 'invalid key'}})
+        with self.assertRaises(cloudlanguagetools.errors.RequestError):
+            service.get_translation_batch(['un', 'deux'], 'fr', 'en')
+
+    @patch('cloudlanguagetools.service.Service.http_post')
+    def test_deepl_batch_error(self, mock_post):
+        import cloudlanguagetools.deepl
+        service = cloudlanguagetools.deepl.DeepLService()
+        service.configure({'key': 'abcd'})
+
+        mock_post.return_value = _make_mock_response(400, json_body={'message': 'bad request'})
+        with self.assertRaises(cloudlanguagetools.errors.InputError):
+            service.get_translation_batch(['un', 'deux'], 'FR', 'EN-US')
+
+        mock_post.return_value = _make_mock_response(503, text_body='service unavailable')
+        with self.assertRaises(cloudlanguagetools.errors.RequestError):
+            service.get_translation_batch(['un', 'deux'], 'FR', 'EN-US')
+
+    @patch('cloudlanguagetools.servicemanager.LOAD_TEST_SERVICES_ONLY', False)
+    @patch('cloudlanguagetools.service.Service.http_post')
+    def test_azure_batch_per_item_errors(self, mock_post):
+        import cloudlanguagetools.servicemanager
+        def post(url, json=None, **kwargs):
+            # the whole batch is rejected because of one text
+            if any(entry['text'] == 'bad' for entry in json):
+                return _make_mock_response(400, json_body={'error': {'code': 400050, 'message': 'invalid text'}})
+            return _make_mock_response(200, json_body=[{'translations': [{'text': entry['text'].upper(), 'to': 'en'}]} for entry in json])
+        mock_post.side_effect = post
+
+        manager = cloudlanguagetools.servicemanager.ServiceManager(enabled_services=['Azure'])
+        manager.configure_services({'Azure': {'key': 'abcd', 'region': 'eastus'}})
+        result = manager.get_translation_batch(['un', 'bad', 'deux'], 'Azure', 'fr', 'en')
+
+        self.assertEqual(result[0], 'UN')
+        self.assertIsInstance(result[1], cloudlanguagetools.errors.InputError)
+        self.assertEqual(result[2], 'DEUX')
+        # one batch request, then one request per text
+        self.assertEqual(mock_post.call_count, 4)
+
+    @patch('cloudlanguagetools.service.Service.http_post')
+    def test_azure_transliteration_batch(self, mock_post):
+        import cloudlanguagetools.azure
+        mock_post.return_value = _make_mock_response(200, json_body=[
+            {'text': 'konnichiwa', 'script': 'Latn'},
+            {'text': 'sayounara', 'script': 'Latn'}])
+
+        service = cloudlanguagetools.azure.AzureService()
+        service.configure({'key': 'abcd', 'region': 'eastus'})
+        transliteration_key = {'language_id': 'ja', 'from_script': 'Jpan', 'to_script': 'Latn'}
+        result = service.get_transliteration_batch(['こんにちは', 'さようなら'], transliteration_key)
+
+        self.assertEqual(result, ['konnichiwa', 'sayounara'])
+        self.assertEqual(mock_post.call_args.kwargs['json'], [{'text': 'こんにちは'}, {'text': 'さようなら'}])
+        self.assertIn('language=ja&fromScript=Jpan&toScript=Latn', mock_post.call_args.args[0])
+
+
+class TestHttpTransport(unittest.TestCase):
+    """Tests for the pooled HTTP transport shared by the services."""
+
+    def setUp(self):
+        self.transport = cloudlanguagetools.httptransport.HttpTransport(pool_size=4)
+
+    def tearDown(self):
+        self.transport.close()
+
+    def test_session_per_host(self):
+        session_1 = self.transport.get_session('https://api.example.com/v1/tts')
+        session_2 = self.transport.get_session('https://api.example.com/v2/voices?key=abcd')
+        session_3 = self.transport.get_session('https://other.example.com/v1/tts')
+        session_4 = self.transport.get_session('http://api.example.com/v1/tts')
+        self.assertIs(session_1, session_2)
+        self.assertEqual(len(set([id(session_1), id(session_3), id(session_4)])), 3)
+        self.assertEqual(session_1.get_adapter('https://api.example.com')._pool_maxsize, 4)
+
+    @patch('requests.Session.request')
+    def test_default_timeout(self, mock_request):
+        mock_request.return_value = _make_mock_response(200, json_body={})
+        self.transport.post('https://api.example.com/v1/tts', json={'text': 'hello'})
+        self.assertEqual(mock_request.call_args.args, ('POST', 'https://api.example.com/v1/tts'))
+        self.assertEqual(mock_request.call_args.kwargs['timeout'], cloudlanguagetools.constants.RequestTimeout)
+        self.transport.get('https://api.example.com/v1/voices', timeout=(3, 10))
+        self.assertEqual(mock_request.call_args.kwargs['timeout'], (3, 10))
+
+    @patch('requests.Session.request')
+    def test_service_uses_shared_transport(self, mock_request):
+        mock_request.return_value = _make_mock_response(200, text_body='audio')
+        service = ConcreteService()
+        audio_file = service.get_tts_audio_base_post_request('https://example.com/tts', json={})
+        with open(audio_file.name, 'rb') as f:
+            self.assertEqual(f.read(), b'audio')
+        self.assertIs(service.http_transport, cloudlanguagetools.httptransport.default_transport)
+        self.assertIn(('https', 'example.com'), service.http_transport.sessions)
+
+    def test_cookies_not_kept(self):
+        session = self.transport.get_session('https://api.example.com')
+        headers = http.client.HTTPMessage()
+        headers['Set-Cookie'] = 'session=abcd; Path=/'
+        request = requests.Request('GET', 'https://api.example.com/').prepare()
+        session.cookies.extract_cookies(requests.cookies.MockResponse(headers), requests.cookies.MockRequest(request))
+        self.assertEqual(len(session.cookies), 0)
+
+
+class MockAsyncHttpTransport(cloudlanguagetools.asynchttptransport.AsyncHttpTransport):
+    """sends the requests to handler instead of the network"""
+
+    def __init__(self, handler):
+        super().__init__()
+        self.handler = handler
+        self.requests = []
+
+    def create_client(self, verify):
+        def handle(request):
+            self.requests.append(request)
+            return self.handler(request)
+        return httpx.AsyncClient(transport=httpx.MockTransport(handle))
+
+
+class TestAsyncHttpTransport(unittest.TestCase):
+    """Tests for the async HTTP transport used by the async API of the REST services."""
+
+    def run_request(self, transport, function):
+        async def run():
+            try:
+                return await function()
+            finally:
+                await transport.close()
+        return asyncio.run(run())
+
+    def test_requests_compatible(self):
+        transport = MockAsyncHttpTransport(lambda request: httpx.Response(404, json={'message': 'not found'}))
+        response = self.run_request(transport, lambda: transport.post('https://api.example.com/v1/translate',
+            data=[('text', 'un'), ('text', 'deux'), ('target_lang', 'EN')]))
+        self.assertEqual(transport.requests[0].content, b'text=un&text=deux&target_lang=EN')
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.ok)
+        self.assertEqual(response.json(), {'message': 'not found'})
+        with self.assertRaises(requests.exceptions.HTTPError):
+            response.raise_for_status()
+
+    def test_timeout(self):
+        def handler(request):
+            raise httpx.ReadTimeout('timed out', request=request)
+        transport = MockAsyncHttpTransport(handler)
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            self.run_request(transport, lambda: transport.get('https://api.example.com/v1/voices'))
+
+    def test_tts_audio_errors(self):
+        transport = MockAsyncHttpTransport(lambda request: httpx.Response(429, json={'detail': 'too many requests'}))
+        service = ConcreteService()
+        service.async_http_transport = transport
+        with self.assertRaises(cloudlanguagetools.errors.RateLimitError):
+            self.run_request(transport, lambda: service.get_tts_audio_base_post_request_async('https://example.com/tts', json={}))
+
+        transport = MockAsyncHttpTransport(lambda request: httpx.Response(200, content=b'audio'))
+        service.async_http_transport = transport
+        audio = self.run_request(transport, lambda: service.get_tts_audio_base_post_request_async('https://example.com/tts', json={}))
+        self.assertEqual(audio.bytes, b'audio')
+
+    def test_deepl_batch(self):
+        import cloudlanguagetools.deepl
+        transport = MockAsyncHttpTransport(lambda request: httpx.Response(200, json={'translations': [{'text': 'one'}, {'text': 'two'}]}))
+        service = cloudlanguagetools.deepl.DeepLService()
+        service.configure({'key': 'abcd'})
+        service.async_http_transport = transport
+        result = self.run_request(transport, lambda: service.get_translation_batch_async(['un', 'deux'], 'PT-BR', 'EN-US'))
+        self.assertEqual(result, ['one', 'two'])
+        self.assertEqual(transport.requests[0].content, b'text=un&text=deux&source_lang=PT&target_lang=EN-US')
+        self.assertEqual(transport.requests[0].headers['Authorization'], 'DeepL-Auth-Key abcd')
+
+
+class TestStreamTtsAudioRequests(unittest.TestCase):
+    """Tests for the native streaming TTS requests."""
+
+    def make_stream_response(self, status_code, chunks, json_body=None):
+        mock_response = _make_mock_response(status_code, json_body=json_body)
+        mock_response.__enter__.return_value = mock_response
+        mock_response.iter_content.return_value = iter(chunks)
+        return mock_response
+
+    def make_service(self):
+        import cloudlanguagetools.elevenlabs
+        service = cloudlanguagetools.elevenlabs.ElevenLabsService()
+        service.configure({'api_key': 'abcd'})
+        return service
+
+    @patch('cloudlanguagetools.service.Service.http_post')
+    def test_elevenlabs_stream(self, mock_post):
+        mock_post.return_value = self.make_stream_response(200, [b'chunk1', b'', b'chunk2'])
+        service = self.make_service()
+        chunks = list(service.stream_tts_audio('hello', {'voice_id': 'abcd', 'model_id': 'eleven_multilingual_v2'}, {}))
+        self.assertEqual(chunks, [b'chunk1', b'chunk2'])
+        self.assertIn('/v1/text-to-speech/abcd/stream?', mock_post.call_args.args[0])
+        self.assertTrue(mock_post.call_args.kwargs['stream'])
+
+    @patch('cloudlanguagetools.service.Service.http_post')
+    def test_elevenlabs_stream_rate_limited(self, mock_post):
+        mock_post.return_value = self.make_stream_response(429, [], json_body={'detail': {'message': 'heavy traffic'}})
+        service = self.make_service()
+        with self.assertRaises(cloudlanguagetools.errors.RateLimitError):
+            list(service.stream_tts_audio('hello', {'voice_id': 'abcd', 'model_id': 'eleven_multilingual_v2'}, {}))
+
+    @patch('cloudlanguagetools.service.Service.http_post')
+    def test_elevenlabs_stream_body_timeout(self, mock_post):
+        mock_response = self.make_stream_response(200, [])
+        mock_response.iter_content.side_effect = requests.exceptions.ConnectionError(
+            urllib3.exceptions.ReadTimeoutError(None, None, 'Read timed out.'))
+        mock_post.return_value = mock_response
+        service = self.make_service()
+        with self.assertRaises(cloudlanguagetools.errors.TimeoutError):
+            list(service.stream_tts_audio('hello', {'voice_id': 'abcd', 'model_id': 'eleven_multilingual_v2'}, {}))
+
+
+class TestTokenManager(unittest.TestCase):
+    """Tests for the shared expiring auth token manager."""
+
+    def make_token_manager(self, lifetimes):
+        self.fetch_count = 0
+        def fetch():
+            lifetime = lifetimes[min(self.fetch_count, len(lifetimes) - 1)]
+            self.fetch_count += 1
+            return f'token_{self.fetch_count}', time.time() + lifetime
+        return cloudlanguagetools.service.TokenManager(fetch, expiry_margin=30, refresh_margin=120)
+
+    def test_token_cached(self):
+        token_manager = self.make_token_manager([600])
+        self.assertEqual(token_manager.get_token(), 'token_1')
+        self.assertEqual(token_manager.get_token(), 'token_1')
+        self.assertEqual(self.fetch_count, 1)
+
+    def test_expired_token_refreshed(self):
+        # expires within the expiry margin: can't be used
+        token_manager = self.make_token_manager([10, 600])
+        self.assertEqual(token_manager.get_token(), 'token_1')
+        self.assertEqual(token_manager.get_token(), 'token_2')
+        self.assertEqual(token_manager.get_token(), 'token_2')
+        self.assertEqual(self.fetch_count, 2)
+
+    def test_background_refresh(self):
+        # within the refresh margin: the current token is returned, a new one gets fetched in the background
+        token_manager = self.make_token_manager([60, 600])
+        self.assertEqual(token_manager.get_token(), 'token_1')
+        self.assertEqual(token_manager.get_token(), 'token_1')
+        deadline = time.time() + 5
+        while token_manager.get_token() != 'token_2' and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(token_manager.get_token(), 'token_2')
+        self.assertEqual(self.fetch_count, 2)
+
+    def test_background_refresh_failure(self):
+        fetch_results = [('token_1', time.time() + 60)]
+        def fetch():
+            if len(fetch_results) == 0:
+                raise cloudlanguagetools.errors.RequestError('auth service unavailable')
+            return fetch_results.pop(0)
+        token_manager = cloudlanguagetools.service.TokenManager(fetch, expiry_margin=30, refresh_margin=120)
+        self.assertEqual(token_manager.get_token(), 'token_1')
+        deadline = time.time() + 5
+        while token_manager.background_refresh and time.time() < deadline:
+            time.sleep(0.01)
+        # the current token remains in use
+        self.assertEqual(token_manager.get_token(), 'token_1')
+
+    def test_single_concurrent_refresh(self):
+        fetch_started = threading.Event()
+        release_fetch = threading.Event()
+        fetch_count = []
+        def fetch():
+            fetch_count.append(1)
+            fetch_started.set()
+            release_fetch.wait(5)
+            return 'token', time.time() + 600
+        token_manager = cloudlanguagetools.service.TokenManager(fetch)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(token_manager.get_token())) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        fetch_started.wait(5)
+        time.sleep(0.05)
+        release_fetch.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ['token'] * 8)
+        self.assertEqual(len(fetch_count), 1)
+
+    def test_get_jwt_expiration(self):
+        payload = base64.urlsafe_b64encode(json.dumps({'exp': 1700000000}).encode()).decode().rstrip('=')
+        self.assertEqual(cloudlanguagetools.service.get_jwt_expiration(f'header.{payload}.signature'), 1700000000)
+        self.assertIsNone(cloudlanguagetools.service.get_jwt_expiration('opaque_token'))
+
+    @patch('cloudlanguagetools.service.Service.http_get')
+    def test_cereproc_authenticates_once(self, mock_get):
+        import cloudlanguagetools.cereproc
+        mock_get.return_value = _make_mock_response(200, json_body={'access_token': 'abcd'})
+        service = cloudlanguagetools.cereproc.CereProcService()
+        service.configure({'username': 'user', 'password': 'password'})
+        self.assertEqual(service.get_auth_headers(), {'Authorization': 'Bearer abcd'})
+        self.assertEqual(service.get_auth_headers(), {'Authorization': 'Bearer abcd'})
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch('cloudlanguagetools.service.Service.http_get')
+    def test_alibaba_token_expiry(self, mock_get):
+        import cloudlanguagetools.alibaba
+        expire_time = int(time.time()) + 3600
+        mock_get.return_value = _make_mock_response(200, json_body={'Token': {'Id': 'abcd', 'ExpireTime': expire_time}})
+        service = cloudlanguagetools.alibaba.AlibabaService()
+        service.configure({'access_key_id': 'id', 'access_key_secret': 'secret', 'app_key': 'app'})
+        self.assertEqual(service.token_manager.get_token(), 'abcd')
+        self.assertEqual(service.token_manager.get_token(), 'abcd')
+        self.assertEqual(service.token_manager.expires_at, expire_time)
+        self.assertEqual(mock_get.call_count, 1)
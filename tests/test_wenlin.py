@@ -0,0 +1,209 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import clt_wenlin
+import cloudlanguagetools.wenlin
+import cloudlanguagetools.servicemanager
+import cloudlanguagetools.errors
+from cloudlanguagetools.languages import Language
+from cloudlanguagetools.constants import DictionaryLookupType
+
+# a few entries in the cidian.u8 format
+CIDIAN_SAMPLE = """.py   cāngkù
+char   仓库[倉庫]
+ser   1000100001
+ps   p.w.
+df   warehouse; storehouse
+mw   ⁴zuò [座]
+.py   xuésheng
+char   学生[學-]
+ser   1000100002
+ps   n.
+1df   student; pupil
+1mw   ge/míng/²wèi [个/名/位]
+2df   disciple; follower
+3df   boy; lad
+.py   āizhe
+char   挨着[-著]
+ser   1000039833
+1ps   v.
+1df   be next to; get close to
+2ps   adv.
+2df@   one by one
+.py   xíng
+char   行
+ser   1000200001
+df   row; line
+.py   xíng
+char   行
+ser   1000200002
+ps   v.
+df   walk
+"""
+
+def lookup_key(language, lookup_type):
+    return {'language': language.name, 'lookup_type': lookup_type.name}
+
+
+class TestWenlinService(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        dict_filepath = os.path.join(cls.temp_dir.name, 'cidian.u8')
+        with open(dict_filepath, 'w') as f:
+            f.write(CIDIAN_SAMPLE)
+        cls.db_filepath = os.path.join(cls.temp_dir.name, 'wenlin.db')
+        clt_wenlin.create_sqlite_file(dict_filepath, cls.db_filepath)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def setUp(self):
+        patcher = patch('clt_wenlin.get_wenlin_db_path', return_value=self.db_filepath)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = cloudlanguagetools.wenlin.WenlinService()
+
+    def test_lookup_types(self):
+        self.assertEqual(self.service.get_dictionary_lookup('仓库', lookup_key(Language.zh_cn, DictionaryLookupType.Definitions)),
+            ['warehouse; storehouse'])
+        self.assertEqual(self.service.get_dictionary_lookup('學生', lookup_key(Language.zh_tw, DictionaryLookupType.MeasureWord)),
+            ['ge/míng/²wèi [个/名/位]'])
+        self.assertEqual(self.service.get_dictionary_lookup('挨着', lookup_key(Language.zh_cn, DictionaryLookupType.PartOfSpeech)),
+            ['adv.', 'v.'])
+        self.assertEqual(self.service.get_dictionary_lookup('学生', lookup_key(Language.zh_cn, DictionaryLookupType.PartOfSpeechDefinitions)),
+            {'n.': ['student; pupil', 'disciple; follower', 'boy; lad']})
+
+    def test_no_part_of_speech(self):
+        # one of the entries has a definition without a ps band
+        self.assertEqual(self.service.get_dictionary_lookup('行', lookup_key(Language.zh_cn, DictionaryLookupType.Definitions)),
+            ['row; line', 'walk'])
+        self.assertEqual(self.service.get_dictionary_lookup('行', lookup_key(Language.zh_cn, DictionaryLookupType.PartOfSpeech)),
+            ['v.', None])
+        self.assertEqual(self.service.get_dictionary_lookup('行', lookup_key(Language.zh_cn, DictionaryLookupType.PartOfSpeechDefinitions)),
+            {None: ['row; line'], 'v.': ['walk']})
+        results = self.service.get_dictionary_lookup_batch(['行', '仓库'], lookup_key(Language.zh_cn, DictionaryLookupType.MeasureWord))
+        self.assertIsInstance(results[0], cloudlanguagetools.errors.NotFoundError)
+        self.assertEqual(results[1], ['⁴zuò [座]'])
+
+    def test_not_found(self):
+        with self.assertRaises(cloudlanguagetools.errors.NotFoundError):
+            self.service.get_dictionary_lookup('仓库仓库', lookup_key(Language.zh_cn, DictionaryLookupType.Definitions))
+
+    def test_quotes_in_input(self):
+        # the input is a query parameter, not part of the SQL
+        for text in ["仓'库", "' OR '1'='1", '"']:
+            with self.assertRaises(cloudlanguagetools.errors.NotFoundError):
+                self.service.get_dictionary_lookup(text, lookup_key(Language.zh_cn, DictionaryLookupType.Definitions))
+
+    def test_all_types(self):
+        result = self.service.get_dictionary_lookup_all_types('仓库')
+        self.assertEqual(result, {
+            DictionaryLookupType.Definitions: ['warehouse; storehouse'],
+            DictionaryLookupType.PartOfSpeech: ['p.w.'],
+            DictionaryLookupType.MeasureWord: ['⁴zuò [座]'],
+            DictionaryLookupType.PartOfSpeechDefinitions: {'p.w.': ['warehouse; storehouse']},
+        })
+        result = self.service.get_dictionary_lookup_all_types('挨著', Language.zh_tw)
+        self.assertEqual(result[DictionaryLookupType.MeasureWord], [])
+        with self.assertRaises(cloudlanguagetools.errors.NotFoundError):
+            self.service.get_dictionary_lookup_all_types('仓库仓库')
+
+    def test_single_query_per_headword(self):
+        with patch.object(self.service, 'query_entries', wraps=self.service.query_entries) as mock_query_entries:
+            for lookup_type in DictionaryLookupType:
+                self.service.get_dictionary_lookup('学生', lookup_key(Language.zh_cn, lookup_type))
+            self.service.get_dictionary_lookup_all_types('学生')
+            # zh_tw and yue share the traditional column
+            self.service.get_dictionary_lookup('學生', lookup_key(Language.zh_tw, DictionaryLookupType.Definitions))
+            self.service.get_dictionary_lookup('學生', lookup_key(Language.yue, DictionaryLookupType.Definitions))
+        self.assertEqual(mock_query_entries.call_count, 2)
+
+    def test_cached_results_not_shared(self):
+        key = lookup_key(Language.zh_cn, DictionaryLookupType.PartOfSpeechDefinitions)
+        result = self.service.get_dictionary_lookup('学生', key)
+        result['n.'].append('modified')
+        self.assertEqual(self.service.get_dictionary_lookup('学生', key), {'n.': ['student; pupil', 'disciple; follower', 'boy; lad']})
+
+    def test_batch(self):
+        texts = ['仓库', '仓库仓库', '学生', '挨着', '仓库']
+        with patch.object(self.service, 'query_entries', side_effect=Exception('should not be called')):
+            results = self.service.get_dictionary_lookup_batch(texts, lookup_key(Language.zh_cn, DictionaryLookupType.Definitions))
+        self.assertEqual(results[0], ['warehouse; storehouse'])
+        self.assertIsInstance(results[1], cloudlanguagetools.errors.NotFoundError)
+        self.assertEqual(results[2], ['student; pupil', 'disciple; follower', 'boy; lad'])
+        self.assertEqual(results[3], ['be next to; get close to', 'one by one'])
+        self.assertEqual(results[4], results[0])
+
+    def test_batch_chunked(self):
+        texts = ['學生'] + [f'词{i}' for i in range(1200)] + ['挨著']
+        with patch('cloudlanguagetools.wenlin.BATCH_QUERY_MAX_ITEMS', 100):
+            results = self.service.get_dictionary_lookup_batch(texts, lookup_key(Language.zh_tw, DictionaryLookupType.PartOfSpeech))
+        self.assertEqual(results[0], ['n.'])
+        self.assertEqual(results[-1], ['adv.', 'v.'])
+        self.assertTrue(all([isinstance(result, cloudlanguagetools.errors.NotFoundError) for result in results[1:-1]]))
+
+    def test_batch_uses_cache(self):
+        self.service.get_dictionary_lookup('仓库', lookup_key(Language.zh_cn, DictionaryLookupType.Definitions))
+        with patch.object(self.service, 'query_entries_batch', wraps=self.service.query_entries_batch) as mock_query_entries_batch:
+            self.service.get_dictionary_lookup_batch(['仓库', '学生'], lookup_key(Language.zh_cn, DictionaryLookupType.MeasureWord))
+        self.assertEqual(mock_query_entries_batch.call_args.args[0], ['学生'])
+
+    def test_manager_batch(self):
+        with patch('cloudlanguagetools.servicemanager.LOAD_TEST_SERVICES_ONLY', False):
+            manager = cloudlanguagetools.servicemanager.ServiceManager(enabled_services=['Wenlin'])
+        results = manager.get_dictionary_lookup_batch(['仓库', '学生', '仓库仓库', '仓库'], 'Wenlin',
+            lookup_key(Language.zh_cn, DictionaryLookupType.MeasureWord))
+        self.assertEqual(list(results.keys()), ['仓库', '学生', '仓库仓库'])
+        self.assertEqual(results['仓库'], ['⁴zuò [座]'])
+        self.assertEqual(results['学生'], ['ge/míng/²wèi [个/名/位]'])
+        self.assertIsInstance(results['仓库仓库'], cloudlanguagetools.errors.NotFoundError)
+
+    def test_reverse_lookup(self):
+        reverse_key = {'language': Language.en.name, 'lookup_type': DictionaryLookupType.Definitions.name, 'target_language': Language.zh_cn.name}
+        self.assertEqual(self.service.get_dictionary_lookup('warehouse', reverse_key), ['仓库'])
+        # the last word is matched as a prefix
+        self.assertEqual(self.service.get_dictionary_lookup('Stude', reverse_key), ['学生'])
+        self.assertEqual(self.service.get_dictionary_lookup('next to', reverse_key), ['挨着'])
+        reverse_key['target_language'] = Language.zh_tw.name
+        self.assertEqual(self.service.get_dictionary_lookup('pupil', reverse_key), ['學生'])
+        # FTS5 syntax in the input is matched as plain words
+        self.assertEqual(self.service.get_dictionary_lookup('"pupil"', reverse_key), ['學生'])
+        for text in ['elephant', '?!', 'definition : warehouse OR student']:
+            with self.assertRaises(cloudlanguagetools.errors.NotFoundError):
+                self.service.get_dictionary_lookup(text, reverse_key)
+        results = self.service.get_dictionary_lookup_batch(['lad', 'elephant'], reverse_key)
+        self.assertEqual(results[0], ['學生'])
+        self.assertIsInstance(results[1], cloudlanguagetools.errors.NotFoundError)
+
+    def test_reverse_lookup_option(self):
+        lookup_keys = [option.get_lookup_key() for option in self.service.get_dictionary_lookup_list()]
+        self.assertIn({'language': 'en', 'lookup_type': 'Definitions', 'target_language': 'zh_cn'}, lookup_keys)
+        self.assertIn({'language': 'zh_cn', 'lookup_type': 'Definitions'}, lookup_keys)
+
+    def test_connection_reused_per_thread(self):
+        connection = self.service.get_connection()
+        self.assertIs(self.service.get_connection(), connection)
+        other_thread_connections = []
+        thread = threading.Thread(target=lambda: other_thread_connections.append(self.service.get_connection()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other_thread_connections[0], connection)
+
+    def test_connection_read_only(self):
+        connection = self.service.get_connection()
+        with self.assertRaises(Exception):
+            connection.execute("DELETE FROM words")
+        self.assertGreater(connection.execute('PRAGMA mmap_size').fetchone()[0], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
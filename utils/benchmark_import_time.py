@@ -0,0 +1,68 @@
+import sys
+import os
+import json
+import argparse
+import subprocess
+
+# measure cold start: time to import the service manager, and time to import + instantiate each service.
+# every measurement runs in a fresh python process so that modules imported by a previous
+# measurement don't make the next one look faster.
+# usage: python utils/benchmark_import_time.py [--services Azure,Wenlin] [--max-import-time 1.0]
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+sys.path.insert(0, ROOT_DIR)
+
+import cloudlanguagetools.serviceregistry
+
+MEASURE_MANAGER_IMPORT = """
+import sys, timeit, json
+sys.path.insert(0, {root_dir!r})
+start_time = timeit.default_timer()
+import cloudlanguagetools.servicemanager
+print(json.dumps({{'import_time': timeit.default_timer() - start_time}}))
+"""
+
+MEASURE_SERVICE_LOAD = """
+import sys, json
+sys.path.insert(0, {root_dir!r})
+import cloudlanguagetools.servicemanager
+manager = cloudlanguagetools.servicemanager.ServiceManager(enabled_services=[{service_name!r}])
+manager.services.load({service_name!r})
+print(json.dumps({{'load_time': manager.services.load_times[manager.get_enabled_services()[0]]}}))
+"""
+
+def run_measurement(code):
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description='measure cloudlanguagetools cold start time')
+    parser.add_argument('--services', default=None, help='comma-separated list of services, defaults to all')
+    parser.add_argument('--max-import-time', type=float, default=None, help='exit with an error if importing the service manager takes longer (seconds)')
+    args = parser.parse_args()
+
+    if args.services is not None:
+        service_names = [service_name.strip() for service_name in args.services.split(',')]
+    else:
+        service_names = [service.name for service in cloudlanguagetools.serviceregistry.SERVICE_MODULES.keys()]
+
+    import_time = run_measurement(MEASURE_MANAGER_IMPORT.format(root_dir=ROOT_DIR))['import_time']
+    print(f'{"servicemanager import":<30} {import_time:8.3f}s')
+
+    total_time = 0
+    for service_name in service_names:
+        try:
+            load_time = run_measurement(MEASURE_SERVICE_LOAD.format(root_dir=ROOT_DIR, service_name=service_name))['load_time']
+            total_time += load_time
+            print(f'{service_name:<30} {load_time:8.3f}s')
+        except subprocess.CalledProcessError as e:
+            print(f'{service_name:<30} {"error":>9} {e.stderr.strip().splitlines()[-1]}')
+    print(f'{"total (all services)":<30} {total_time:8.3f}s')
+
+    if args.max_import_time is not None and import_time > args.max_import_time:
+        print(f'servicemanager import time {import_time:.3f}s exceeds {args.max_import_time:.3f}s')
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+import sys
+import os
+import json
+import random
+import sqlite3
+import timeit
+import argparse
+import concurrent.futures
+
+# measure Wenlin dictionary lookups per second, with the headwords sampled from the database itself.
+# "connect per lookup" reproduces the previous behavior (new connection for every lookup), as a baseline.
+# usage: python utils/benchmark_wenlin_lookup.py [--db /clt_data/wenlin_revA.db] [--lookups 20000] [--threads 1,8]
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+sys.path.insert(0, ROOT_DIR)
+
+import clt_wenlin
+import cloudlanguagetools.wenlin
+import cloudlanguagetools.errors
+from cloudlanguagetools.languages import Language
+from cloudlanguagetools.constants import DictionaryLookupType
+
+LOOKUP_KEY = {'language': Language.zh_cn.name, 'lookup_type': DictionaryLookupType.Definitions.name}
+
+def sample_headwords(db_filepath, count):
+    connection = sqlite3.connect(db_filepath)
+    headwords = [row[0] for row in connection.execute('SELECT simplified FROM words')]
+    connection.close()
+    random.seed(42)
+    return [random.choice(headwords) for i in range(count)]
+
+def lookup_connect_per_lookup(db_filepath, text):
+    connection = sqlite3.connect(db_filepath)
+    results = [json.loads(row[0]) for row in connection.execute('SELECT entry FROM words WHERE simplified = ?', (text,))]
+    connection.close()
+    return results
+
+def run_lookups(lookup_function, headwords, threads):
+    def lookup(text):
+        try:
+            lookup_function(text)
+        except cloudlanguagetools.errors.NotFoundError:
+            pass
+    start_time = timeit.default_timer()
+    if threads == 1:
+        for text in headwords:
+            lookup(text)
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(lookup, headwords))
+    return len(headwords) / (timeit.default_timer() - start_time)
+
+def main():
+    parser = argparse.ArgumentParser(description='measure wenlin dictionary lookups per second')
+    parser.add_argument('--db', default=None, help='path of the wenlin database, defaults to clt_wenlin.get_wenlin_db_path()')
+    parser.add_argument('--lookups', type=int, default=20000, help='number of lookups per measurement')
+    parser.add_argument('--threads', default='1,8', help='comma-separated list of thread counts')
+    args = parser.parse_args()
+
+    db_filepath = args.db if args.db is not None else clt_wenlin.get_wenlin_db_path()
+    clt_wenlin.get_wenlin_db_path = lambda: db_filepath
+    headwords = sample_headwords(db_filepath, args.lookups)
+    service = cloudlanguagetools.wenlin.WenlinService()
+
+    benchmarks = {
+        'connect per lookup': lambda text: lookup_connect_per_lookup(db_filepath, text),
+        'wenlin service': lambda text: service.get_dictionary_lookup(text, LOOKUP_KEY),
+    }
+    for threads in [int(x) for x in args.threads.split(',')]:
+        for name, lookup_function in benchmarks.items():
+            lookups_per_second = run_lookups(lookup_function, headwords, threads)
+            print(f'{name:<30} {threads:>3} threads {lookups_per_second:12.0f} lookups/s')
+
+if __name__ == '__main__':
+    main()